@@ -0,0 +1,143 @@
+
+from __future__ import annotations
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Tuple, List, Dict, Set, Optional, Callable
+from .grid import Grid, Coord
+from .astar import reconstruct
+from app.utils.metrics import SearchResult
+
+
+@dataclass
+class ARASolution:
+    """Rozwiązanie pośrednie ARA*: koszt jest co najwyżej `bound` razy większy od optymalnego."""
+    epsilon: float
+    bound: float
+    cost: float
+    path: List[Coord]
+    time_s: float        # czas od startu wyszukiwania do znalezienia tego rozwiązania
+    expanded: int        # łączna liczba rozwinięć do tej chwili
+
+
+@dataclass
+class ARAResult:
+    solutions: List[ARASolution] = field(default_factory=list)
+    final: Optional[SearchResult] = None
+
+    @property
+    def best(self) -> Optional[ARASolution]:
+        return self.solutions[-1] if self.solutions else None
+
+
+def ara_star(grid: Grid, h: Callable[[Coord, Coord], float],
+             eps0: float = 3.0, eps_step: float = 0.5,
+             time_limit: Optional[float] = None) -> ARAResult:
+    """Anytime Repairing A* (Likhachev i in., 2003).
+
+    Zaczyna od ważonego A* z eps0 i szybko zwraca pierwsze rozwiązanie, potem zmniejsza
+    epsilon o eps_step aż do 1 (rozwiązanie optymalne) lub do upływu time_limit [s].
+    Wartości g i rodzice są zachowywane między iteracjami; do kolejki wracają tylko węzły
+    niespójne (INCONS), więc kolejne iteracje nie zaczynają od zera.
+    """
+    if grid.start is None or grid.goal is None:
+        raise ValueError("Brak punktów start/cel")
+    if eps0 < 1.0:
+        raise ValueError("eps0 musi być >= 1")
+    s, t = grid.start, grid.goal
+    t0 = time.perf_counter()
+    deadline = None if time_limit is None else t0 + time_limit
+
+    g: Dict[Coord, float] = {s: 0.0}
+    came_from: Dict[Coord, Optional[Coord]] = {s: None}
+    open_key: Dict[Coord, float] = {}
+    pq: List[Tuple[float, Coord]] = []
+    closed: Set[Coord] = set()
+    incons: Set[Coord] = set()
+    ever_expanded: Set[Coord] = set()
+    explored_order: List[Coord] = []
+    expanded = 0
+    frontier_peak = 1
+
+    def push(u: Coord, eps: float):
+        key = g[u] + eps * h(u, t)
+        open_key[u] = key
+        heapq.heappush(pq, (key, u))
+
+    def improve_path(eps: float) -> bool:
+        """Rozwija węzły, dopóki klucz celu nie jest minimalny. False = przekroczony czas."""
+        nonlocal expanded, frontier_peak
+        while pq:
+            key, u = pq[0]
+            if open_key.get(u) != key:
+                heapq.heappop(pq)  # nieaktualny wpis
+                continue
+            if g.get(t, float('inf')) <= key:
+                return True
+            if deadline is not None and (expanded & 255) == 0 and time.perf_counter() >= deadline:
+                return False
+            heapq.heappop(pq)
+            del open_key[u]
+            closed.add(u)
+            ever_expanded.add(u)
+            explored_order.append(u)
+            expanded += 1
+            for v in grid.neighbors(u):
+                tentative = g[u] + grid.cost(u, v)
+                if tentative < g.get(v, float('inf')):
+                    g[v] = tentative
+                    came_from[v] = u
+                    if v in closed:
+                        incons.add(v)
+                    else:
+                        push(v, eps)
+                        frontier_peak = max(frontier_peak, len(open_key))
+        return True
+
+    result = ARAResult()
+    eps = eps0
+    push(s, eps)
+    while True:
+        finished = improve_path(eps)
+        cost = g.get(t, float('inf'))
+        if not finished or cost == float('inf'):
+            break
+        # ograniczenie suboptymalności: min(eps, g(cel) / min(g + h) po OPEN ∪ INCONS)
+        lower = min((g[u] + h(u, t) for u in list(open_key) + list(incons)), default=cost)
+        bound = min(eps, cost / lower) if lower > 0 else eps
+        result.solutions.append(ARASolution(
+            epsilon=eps, bound=max(1.0, bound), cost=cost,
+            path=reconstruct(came_from, s, t),
+            time_s=time.perf_counter() - t0, expanded=expanded,
+        ))
+        if bound <= 1.0 or eps <= 1.0:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        # kolejna iteracja: OPEN ∪ INCONS z nowymi kluczami, CLOSED od nowa
+        eps = max(1.0, min(eps - eps_step, bound))
+        pending = set(open_key) | incons
+        open_key.clear()
+        pq.clear()
+        for u in pending:
+            open_key[u] = g[u] + eps * h(u, t)
+        pq.extend((k, u) for u, k in open_key.items())
+        heapq.heapify(pq)
+        closed.clear()
+        incons.clear()
+
+    # bez żadnego rozwiązania (np. limit czasu przed pierwszym) nie ma ścieżki o znanym koszcie –
+    # częściowe came_from mogłoby już łączyć start z celem, ale bez ograniczenia kosztu
+    best = result.best
+    result.final = SearchResult(
+        path=best.path if best else [],
+        found=best is not None,
+        visited_count=len(ever_expanded),
+        expanded_count=expanded,
+        frontier_peak=frontier_peak,
+        time_s=time.perf_counter() - t0,
+        total_cost=best.cost if best else float('inf'),
+        explored_order=explored_order,
+        came_from=came_from
+    )
+    return result
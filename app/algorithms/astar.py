@@ -2,7 +2,9 @@
 from __future__ import annotations
 import heapq
 from typing import Tuple, List, Dict, Set, Optional, Callable
+from .deadends import corridor_neighbors
 from .grid import Grid, Coord
+from .incremental import IncrementalSearch, SearchSteps
 from app.utils.metrics import SearchResult
 from app.utils.timer import Timer
 
@@ -17,26 +19,54 @@ def reconstruct(came_from: Dict[Coord, Optional[Coord]], start: Coord, goal: Coo
     path.reverse()
     return path
 
-def astar(grid: Grid, h: Callable[[Coord, Coord], float]) -> SearchResult:
+# Rozstrzyganie remisów f w kolejce (drugi element wpisu (f, remis, pole)):
+#   coord  – porównanie współrzędnych (dotychczasowe zachowanie, domyślne),
+#   high_g – większe g najpierw (bliżej celu), dalej LIFO,
+#   lifo   – ostatnio dodany najpierw,   fifo – najwcześniej dodany najpierw,
+#   cross  – mniejszy iloczyn wektorowy (pole bliżej prostej start–cel), dalej większe g.
+# Remis zmienia tylko kolejność węzłów o równym f, więc koszt pozostaje optymalny.
+TIE_BREAKS = ("coord", "high_g", "lifo", "fifo", "cross")
+
+def astar(grid: Grid, h: Callable[[Coord, Coord], float], weight: float = 1.0,
+          tie_break: str = "coord", prune: bool = False) -> SearchResult:
+    """A* (weight=1) lub ważone A* (f = g + weight*h); dla dopuszczalnej h koszt wyniku
+    jest co najwyżej weight razy większy od optymalnego. `tie_break` – patrz TIE_BREAKS,
+    `prune` – pomijanie ślepych zaułków (patrz deadends)."""
+    return IncrementalSearch(astar_steps(grid, h, weight, tie_break, prune)).finish()
+
+def astar_steps(grid: Grid, h: Callable[[Coord, Coord], float], weight: float = 1.0,
+                tie_break: str = "coord", prune: bool = False) -> SearchSteps:
+    """Generator kroków A* (patrz IncrementalSearch)."""
     if grid.start is None or grid.goal is None:
         raise ValueError("Brak punktów start/cel")
+    if weight < 1.0:
+        raise ValueError("Waga heurystyki musi być >= 1")
+    if tie_break not in TIE_BREAKS:
+        raise ValueError(f"Nieznana reguła remisów: {tie_break}")
     s, t = grid.start, grid.goal
+    budget = yield []
+    neighbors = corridor_neighbors(grid, s, t) if prune else grid.neighbors
+
+    policy = TIE_BREAKS.index(tie_break)
+    counter = 0
+    sx, sy = s[0] - t[0], s[1] - t[1]
 
     g: Dict[Coord, float] = {s: 0.0}
-    f: Dict[Coord, float] = {s: h(s, t)}
+    f: Dict[Coord, float] = {s: weight * h(s, t)}
     came_from: Dict[Coord, Optional[Coord]] = {s: None}
     closed: Set[Coord] = set()
-    pq: List[Tuple[float, Coord]] = [(f[s], s)]
+    pq: List[Tuple] = [(f[s], 0, s)]
     open_set: Set[Coord] = {s}
 
 
     expanded = 0
     explored_order = []
     frontier_peak = 1
+    mark = 0
 
     with Timer() as tm:
         while pq:
-            fu, u = heapq.heappop(pq)
+            fu, _, u = heapq.heappop(pq)
             if u in closed:
                 continue
             closed.add(u)
@@ -47,18 +77,36 @@ def astar(grid: Grid, h: Callable[[Coord, Coord], float]) -> SearchResult:
             expanded += 1
             if u == t:
                 break
-            for v in grid.neighbors(u):
+            for v in neighbors(u):
                 tentative = g[u] + grid.cost(u, v)
                 if v in closed:
                     continue
                 if tentative < g.get(v, float('inf')):
                     g[v] = tentative
-                    f[v] = tentative + h(v, t)
+                    f[v] = tentative + weight * h(v, t)
                     came_from[v] = u
-                    heapq.heappush(pq, (f[v], v))
+                    if policy == 0:
+                        tie = 0
+                    else:
+                        counter += 1
+                        if policy == 1:
+                            tie = (-tentative, -counter)
+                        elif policy == 2:
+                            tie = -counter
+                        elif policy == 3:
+                            tie = counter
+                        else:
+                            tie = (abs((v[0] - t[0]) * sy - sx * (v[1] - t[1])), -tentative)
+                    heapq.heappush(pq, (f[v], tie, v))
                     if v not in open_set:
                         open_set.add(v)
                     frontier_peak = max(frontier_peak, len(open_set))
+            budget -= 1
+            if budget <= 0:
+                tm.pause()
+                budget = yield explored_order[mark:]
+                mark = len(explored_order)
+                tm.resume()
 
     path = reconstruct(came_from, s, t)
     found = (path[-1] == t) if path else False
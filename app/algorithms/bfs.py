@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections import deque
 from typing import Tuple, List, Dict, Set, Optional
 from .grid import Grid, Coord
+from .incremental import IncrementalSearch, SearchSteps
 from app.utils.metrics import SearchResult
 from app.utils.timer import Timer
 
@@ -18,13 +19,18 @@ def reconstruct(came_from: Dict[Coord, Optional[Coord]], start: Coord, goal: Coo
     return path
 
 def bfs(grid: Grid) -> SearchResult:
+    return IncrementalSearch(bfs_steps(grid)).finish()
+
+def bfs_steps(grid: Grid) -> SearchSteps:
+    """Generator kroków BFS (patrz IncrementalSearch)."""
     if grid.start is None or grid.goal is None:
         raise ValueError("Brak punktów start/cel")
     s, t = grid.start, grid.goal
     # BFS jest poprawny (optymalny kosztowo) tylko dla grafów o równych kosztach krawędzi.
-    # W naszej siatce koszty różnią się przy ruchach po skosie i/lub przy wagach pól.
-    if grid.weighted or grid.diag:
-        raise ValueError("BFS działa tylko dla grafów o równych kosztach krawędzi (bez wag i bez ruchów po skosie).")
+    # W naszej siatce koszty różnią się przy ruchach po skosie i/lub przy wagach i terenach pól.
+    if grid.weighted or grid.terrain or grid.diag:
+        raise ValueError("BFS działa tylko dla grafów o równych kosztach krawędzi (bez wag, terenów i ruchów po skosie).")
+    budget = yield []
 
     visited: Set[Coord] = set([s])
     came_from: Dict[Coord, Optional[Coord]] = {s: None}
@@ -33,6 +39,7 @@ def bfs(grid: Grid) -> SearchResult:
     expanded = 0
     explored_order = []
     frontier_peak = 1
+    mark = 0
 
     with Timer() as tm:
         while q:
@@ -47,6 +54,12 @@ def bfs(grid: Grid) -> SearchResult:
                     came_from[v] = u
                     q.append(v)
                     frontier_peak = max(frontier_peak, len(q))
+            budget -= 1
+            if budget <= 0:
+                tm.pause()
+                budget = yield explored_order[mark:]
+                mark = len(explored_order)
+                tm.resume()
 
     path = reconstruct(came_from, s, t)
     found = (path[-1] == t) if path else False
@@ -0,0 +1,107 @@
+
+from __future__ import annotations
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional, Tuple
+from .grid import Grid
+from app.utils.metrics import SearchResult
+
+# przybliżony koszt jednego elementu: krotka (x, y) ~64 B, wpis słownika came_from ~2 krotki + slot
+_COORD_BYTES = 64
+_ENTRY_OVERHEAD = 256
+
+
+def result_nbytes(r: SearchResult) -> int:
+    """Szacunkowy rozmiar wyniku w pamięci (listy/słownik + przechowywane współrzędne)."""
+    return (_ENTRY_OVERHEAD
+            + sys.getsizeof(r.path) + _COORD_BYTES * len(r.path)
+            + sys.getsizeof(r.explored_order) + _COORD_BYTES * len(r.explored_order)
+            + sys.getsizeof(r.came_from) + 2 * _COORD_BYTES * len(r.came_from))
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    nbytes: int = 0
+    max_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResultCache:
+    """Pamięć podręczna LRU wyników wyszukiwań z limitem rozmiaru w bajtach.
+
+    Klucz: (grid.version, algorytm, start, cel, diag, dodatkowe parametry). Wersja planszy
+    zmienia się przy każdej edycji ścian/wag, a numery wersji nie powtarzają się, więc po
+    edycji stary wynik nie może zostać zwrócony (po prostu wypada z LRU).
+    Zwracane obiekty SearchResult są współdzielone – należy je traktować jako tylko do odczytu.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, Tuple[SearchResult, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(grid: Grid, algo: str, *params: Hashable) -> Tuple:
+        return (grid.version, algo, grid.start, grid.goal, grid.diag, params)
+
+    def get(self, key: Hashable) -> Optional[SearchResult]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, result: SearchResult) -> None:
+        size = result_nbytes(result)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            if size > self.max_bytes:
+                return  # pojedynczy wynik większy niż cały limit – nie zapamiętuj
+            self._data[key] = (result, size)
+            self._nbytes += size
+            while self._nbytes > self.max_bytes:
+                _, (_, n) = self._data.popitem(last=False)
+                self._nbytes -= n
+                self.evictions += 1
+
+    def solve(self, grid: Grid, solver: Callable[[Grid], SearchResult],
+              algo: str, *params: Hashable) -> SearchResult:
+        """Zwraca wynik z pamięci albo liczy `solver(grid)` i go zapamiętuje."""
+        key = self.key(grid, algo, *params)
+        r = self.get(key)
+        if r is None:
+            r = solver(grid)
+            self.put(key, r)
+        return r
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions,
+                              len(self._data), self._nbytes, self.max_bytes)
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,190 @@
+"""Przycinanie ślepych zaułków: dekompozycja planszy na bloki dwuspójne.
+
+Graf planszy (ruchy są symetryczne) dzielony jest na bloki dwuspójne połączone punktami
+artykulacji – razem tworzą drzewo bloków i punktów artykulacji (block-cut tree). Każda
+prosta ścieżka start -> cel, a więc i każda najkrótsza, przechodzi wyłącznie przez bloki
+leżące na ścieżce w tym drzewie między blokiem startu i blokiem celu. Pozostałe bloki
+(kieszenie za punktem artykulacji, odgałęzienia korytarzy, „bagna” dołączone jednym
+przejściem) można pominąć bez utraty optymalności; pola w innej spójnej składowej niż
+start są odcinane w całości.
+
+Dekompozycja liczona jest raz na wersję planszy (`decomposition(grid)`, pamięć podręczna
+po `grid.version`), a zapytanie to tylko przejście po drzewie: `corridor_neighbors(grid, s, t)`
+zwraca funkcję sąsiadów, której używają `dijkstra(..., prune=True)` i `astar(..., prune=True)`.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .grid import Coord, Grid
+
+# liczba dekompozycji trzymanych w pamięci (klucz: wersja planszy)
+CACHE_SIZE = 8
+
+
+@dataclass
+class Decomposition:
+    version: int
+    blocks: List[List[Coord]]                 # pola każdego bloku
+    block_of: Dict[Coord, int]                # pole -> blok (pola niebędące artykulacjami)
+    cut_blocks: Dict[Coord, Tuple[int, ...]]  # punkt artykulacji -> jego bloki
+    # drzewo bloków: węzły 0..B-1 to bloki, B.. to punkty artykulacji (kolejność cut_index)
+    parent: List[int] = field(default_factory=list)
+    depth: List[int] = field(default_factory=list)
+    cut_index: Dict[Coord, int] = field(default_factory=dict)
+
+    def node(self, c: Coord) -> Optional[int]:
+        if c in self.cut_index:
+            return self.cut_index[c]
+        return self.block_of.get(c)
+
+    def corridor(self, s: Coord, t: Coord) -> Set[int]:
+        """Bloki na ścieżce drzewa między s i t (pusty zbiór, gdy są w różnych składowych)."""
+        a, b = self.node(s), self.node(t)
+        if a is None or b is None:
+            return set()
+        parent, depth = self.parent, self.depth
+        nodes = []
+        while depth[a] > depth[b]:
+            nodes.append(a)
+            a = parent[a]
+        while depth[b] > depth[a]:
+            nodes.append(b)
+            b = parent[b]
+        while a != b:
+            nodes.extend((a, b))
+            a, b = parent[a], parent[b]
+            if a < 0:  # różne korzenie – różne składowe spójności
+                return set()
+        nodes.append(a)
+        nb = len(self.blocks)
+        return {n for n in nodes if n < nb}
+
+    @property
+    def articulation_points(self) -> List[Coord]:
+        return list(self.cut_blocks)
+
+
+def _decompose(grid: Grid) -> Decomposition:
+    """Iteracyjny Tarjan (bez rekurencji – duże plansze) ze stosem wierzchołków."""
+    neighbors = grid.neighbors
+    disc: Dict[Coord, int] = {}
+    low: Dict[Coord, int] = {}
+    blocks: List[List[Coord]] = []
+    counter = 0
+    for y in range(grid.rows):
+        for x in range(grid.cols):
+            r = (x, y)
+            if r in disc or r in grid.walls:
+                continue
+            disc[r] = low[r] = counter
+            counter += 1
+            stack = [(r, None, iter(neighbors(r)))]
+            vstack = [r]
+            isolated = True
+            while stack:
+                v, pv, it = stack[-1]
+                for w in it:
+                    isolated = False
+                    if w not in disc:
+                        disc[w] = low[w] = counter
+                        counter += 1
+                        vstack.append(w)
+                        stack.append((w, v, iter(neighbors(w))))
+                        break
+                    if w != pv and disc[w] < low[v]:
+                        low[v] = disc[w]
+                else:
+                    stack.pop()
+                    if not stack:
+                        continue
+                    u = stack[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                    if low[v] >= disc[u]:
+                        # u oddziela poddrzewo v: zdejmij blok aż do v włącznie, plus u
+                        block = []
+                        while True:
+                            c = vstack.pop()
+                            block.append(c)
+                            if c == v:
+                                break
+                        block.append(u)
+                        blocks.append(block)
+            if isolated:
+                blocks.append([r])
+
+    membership: Dict[Coord, List[int]] = {}
+    for i, block in enumerate(blocks):
+        for c in block:
+            membership.setdefault(c, []).append(i)
+    block_of = {c: bs[0] for c, bs in membership.items() if len(bs) == 1}
+    cut_blocks = {c: tuple(bs) for c, bs in membership.items() if len(bs) > 1}
+    nb = len(blocks)
+    cut_index = {c: nb + i for i, c in enumerate(cut_blocks)}
+
+    # drzewo bloków: krawędzie blok – punkt artykulacji; ukorzenienie BFS w każdej składowej
+    adj: List[List[int]] = [[] for _ in range(nb + len(cut_blocks))]
+    for c, bs in cut_blocks.items():
+        k = cut_index[c]
+        for b in bs:
+            adj[k].append(b)
+            adj[b].append(k)
+    parent = [-2] * len(adj)
+    depth = [0] * len(adj)
+    for root in range(len(adj)):
+        if parent[root] != -2:
+            continue
+        parent[root] = -1
+        queue = [root]
+        for n in queue:
+            for m in adj[n]:
+                if parent[m] == -2:
+                    parent[m] = n
+                    depth[m] = depth[n] + 1
+                    queue.append(m)
+    return Decomposition(grid.version, blocks, block_of, cut_blocks, parent, depth, cut_index)
+
+
+_CACHE: "OrderedDict[int, Decomposition]" = OrderedDict()
+
+
+def decomposition(grid: Grid) -> Decomposition:
+    """Dekompozycja planszy z pamięci podręcznej (przeliczana po każdej zmianie wersji)."""
+    dec = _CACHE.get(grid.version)
+    if dec is not None:
+        _CACHE.move_to_end(grid.version)
+        return dec
+    dec = _decompose(grid)
+    _CACHE[grid.version] = dec
+    if len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return dec
+
+
+def corridor_neighbors(grid: Grid, s: Coord, t: Coord) -> Callable[[Coord], Iterable[Coord]]:
+    """Funkcja sąsiadów ograniczona do bloków na ścieżce s–t w drzewie bloków."""
+    dec = decomposition(grid)
+    keep = dec.corridor(s, t)
+    block_of, cut_blocks, neighbors = dec.block_of, dec.cut_blocks, grid.neighbors
+
+    def allowed(v: Coord) -> bool:
+        b = block_of.get(v)
+        if b is not None:
+            return b in keep
+        return any(b in keep for b in cut_blocks.get(v, ()))
+
+    def pruned(u: Coord) -> Iterable[Coord]:
+        return [v for v in neighbors(u) if allowed(v)]
+    return pruned
+
+
+def pruned_cells(grid: Grid, s: Coord, t: Coord) -> int:
+    """Liczba wolnych pól wykluczonych z wyszukiwania dla zapytania s–t (do raportów)."""
+    dec = decomposition(grid)
+    keep = dec.corridor(s, t)
+    kept = set()
+    for b in keep:
+        kept.update(dec.blocks[b])
+    return len(dec.block_of) + len(dec.cut_blocks) - len(kept)
@@ -2,7 +2,9 @@
 from __future__ import annotations
 import heapq
 from typing import Tuple, List, Dict, Set, Optional
+from .deadends import corridor_neighbors
 from .grid import Grid, Coord
+from .incremental import IncrementalSearch, SearchSteps
 from app.utils.metrics import SearchResult
 from app.utils.timer import Timer
 
@@ -17,10 +19,17 @@ def reconstruct(came_from: Dict[Coord, Optional[Coord]], start: Coord, goal: Coo
     path.reverse()
     return path
 
-def dijkstra(grid: Grid) -> SearchResult:
+def dijkstra(grid: Grid, prune: bool = False) -> SearchResult:
+    """`prune=True` pomija ślepe zaułki i inne składowe (patrz deadends) – koszt bez zmian."""
+    return IncrementalSearch(dijkstra_steps(grid, prune)).finish()
+
+def dijkstra_steps(grid: Grid, prune: bool = False) -> SearchSteps:
+    """Generator kroków Dijkstry (patrz IncrementalSearch)."""
     if grid.start is None or grid.goal is None:
         raise ValueError("Brak punktów start/cel")
     s, t = grid.start, grid.goal
+    budget = yield []
+    neighbors = corridor_neighbors(grid, s, t) if prune else grid.neighbors
 
     dist: Dict[Coord, float] = {s: 0.0}
     came_from: Dict[Coord, Optional[Coord]] = {s: None}
@@ -31,6 +40,7 @@ def dijkstra(grid: Grid) -> SearchResult:
     expanded = 0
     explored_order = []
     frontier_peak = 1
+    mark = 0
 
     with Timer() as tm:
         while pq:
@@ -45,7 +55,7 @@ def dijkstra(grid: Grid) -> SearchResult:
             expanded += 1
             if u == t:
                 break
-            for v in grid.neighbors(u):
+            for v in neighbors(u):
                 if v in visited:
                     continue
                 alt = dist[u] + grid.cost(u, v)
@@ -56,6 +66,12 @@ def dijkstra(grid: Grid) -> SearchResult:
                     if v not in open_set:
                         open_set.add(v)
                     frontier_peak = max(frontier_peak, len(open_set))
+            budget -= 1
+            if budget <= 0:
+                tm.pause()
+                budget = yield explored_order[mark:]
+                mark = len(explored_order)
+                tm.resume()
 
     path = reconstruct(came_from, s, t)
     found = (path[-1] == t) if path else False
@@ -0,0 +1,134 @@
+"""Pełne pola odległości dla całej planszy, liczone wektorowo w NumPy.
+
+`distance_field(grid, source)` zwraca tablicę rows x cols z kosztem najkrótszej ścieżki
+source -> pole (albo pole -> source przy reverse=True, tj. koszt dojścia do celu), inf dla
+ścian i pól nieosiągalnych. Model ruchu jest ten sam co w Grid: 4/8 sąsiadów, koszt
+wejścia na pole z tablicy lut[kierunek][teren] (1 lub sqrt(2) razy mnożnik terenu) plus
+waga pola, bez przecinania narożnika między dwiema ścianami.
+
+Algorytm to relaksacja kubełkowa (delta-stepping): w każdej rundzie brane są naraz
+wszystkie pola frontu o odległości < min + delta, a ich krawędzie relaksowane są dla całej
+paczki jednocześnie (indeksy płaskie); pola poprawione poniżej progu wracają do paczki.
+Końcowa wartość pola to minimum tych samych sum dist[u] + koszt co w dijkstra(), więc
+wynik jest identyczny bitowo dla każdej delta. Przy delta <= min. koszcie kroku każde
+pole relaksowane jest raz, ale rund jest dużo; domyślne 4 x min. koszt kroku to
+kompromis między liczbą rund a ponownymi relaksacjami w obrębie kubełka.
+
+NumPy importowany jest dopiero przy wywołaniu (por. scripts/import_time.py).
+"""
+from __future__ import annotations
+from typing import Optional, Tuple
+
+from .grid import Coord, Grid
+from .terrain import edge_lut
+
+_STRAIGHT = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def _np():
+    import numpy as np
+    return np
+
+
+def grid_arrays(grid: Grid):
+    """(walls, weights, terrain): tablice rows x cols – bool ścian, float wag pól (0 = brak
+    wagi) i uint8 identyfikatorów terenu (0 = teren otwarty)."""
+    np = _np()
+    walls = np.zeros((grid.rows, grid.cols), dtype=bool)
+    weights = np.zeros((grid.rows, grid.cols), dtype=float)
+    terrain = np.zeros((grid.rows, grid.cols), dtype=np.uint8)
+    if grid.walls:
+        xs, ys = zip(*grid.walls)
+        walls[list(ys), list(xs)] = True
+    if grid.weighted:
+        (xs, ys), ws = zip(*grid.weighted), list(grid.weighted.values())
+        weights[list(ys), list(xs)] = ws
+    if grid.terrain:
+        (xs, ys), ts = zip(*grid.terrain), list(grid.terrain.values())
+        terrain[list(ys), list(xs)] = ts
+    return walls, weights, terrain
+
+
+def _moves(grid: Grid, walls, weights, terrain):
+    """Plansza z ramką ścian (indeksy płaskie bez sprawdzania granic) oraz lista ruchów
+    (przesunięcie, koszt wejścia na każde pole tym ruchem, maska pól, z których ruch jest
+    dozwolony). Koszty wejścia liczone są raz na kierunek: lut[kierunek][teren] + waga."""
+    np = _np()
+    W = grid.cols + 2
+    blocked = np.ones((grid.rows + 2, W), dtype=bool)
+    blocked[1:-1, 1:-1] = walls
+    t = np.zeros(blocked.shape, dtype=np.uint8)
+    t[1:-1, 1:-1] = terrain
+    w = np.zeros(blocked.shape)
+    w[1:-1, 1:-1] = weights
+    blocked, t, w = blocked.ravel(), t.ravel(), w.ravel()
+    enter = [np.asarray(lut)[t] + w for lut in edge_lut(grid.terrain_costs)]
+    N = blocked.size
+    idx = np.arange(N)
+    moves = []
+    for dx, dy in _STRAIGHT + (_DIAGONAL if grid.diag else ()):
+        off = dy * W + dx
+        ok = ~blocked & ~blocked[(idx + off) % N]
+        if dx and dy:
+            # jak w Grid.neighbors: nie przecinaj narożnika, gdy oba boki są ścianami
+            ok &= ~(blocked[(idx + dx) % N] & blocked[(idx + dy * W) % N])
+        moves.append((off, enter[1] if dx and dy else enter[0], ok))
+    return W, blocked, moves
+
+
+def distance_field(grid: Grid, source: Optional[Coord] = None, reverse: bool = False,
+                   delta: Optional[float] = None):
+    """Pole odległości od `source` (domyślnie grid.start; przy reverse=True – koszt dojścia
+    do `source`, domyślnie grid.goal). Zwraca ndarray float rows x cols (inf = nieosiągalne)."""
+    np = _np()
+    if source is None:
+        source = grid.goal if reverse else grid.start
+    if source is None or not grid.in_bounds(source) or not grid.passable(source):
+        raise ValueError(f"Pole źródłowe {source} poza mapą lub na ścianie")
+    delta = 4.0 * grid.min_step_cost() if delta is None else delta
+    if delta <= 0:
+        raise ValueError("delta musi być > 0")
+
+    W, blocked, moves = _moves(grid, *grid_arrays(grid))
+    dist = np.full(blocked.size, np.inf)
+    s = (source[1] + 1) * W + source[0] + 1
+    dist[s] = 0.0
+    front = np.array([s])
+
+    while front.size:
+        front = np.unique(front)
+        lo = dist[front].min()
+        thr = lo + delta
+        inside = dist[front] < thr
+        batch, rest = front[inside], [front[~inside]]
+        while batch.size:
+            improved = []
+            for off, enter, ok in moves:
+                u = batch[ok[batch]]
+                v = u + off
+                # koszt jak Grid.cost: koszt wejścia na pole docelowe (v; przy reverse – u)
+                cand = dist[u] + enter[u if reverse else v]
+                old = dist[v]
+                better = cand < old
+                if better.any():
+                    # w obrębie jednego kierunku pola v są różne – wystarczy przypisanie
+                    v = v[better]
+                    dist[v] = cand[better]
+                    improved.append(v)
+            if not improved:
+                break
+            improved = np.unique(np.concatenate(improved))
+            below = dist[improved] < thr
+            rest.append(improved[~below])
+            batch = improved[below]
+        front = np.concatenate(rest)
+        front = front[dist[front] >= thr]
+    return dist.reshape(grid.rows + 2, W)[1:-1, 1:-1].copy()
+
+
+def field_extent(dist) -> Tuple[int, float]:
+    """(liczba pól osiągalnych, największy skończony koszt) – do raportów."""
+    np = _np()
+    finite = np.isfinite(dist)
+    return int(finite.sum()), float(dist[finite].max()) if finite.any() else 0.0
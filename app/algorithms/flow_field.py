@@ -0,0 +1,87 @@
+"""Pola przepływu (flow fields) dla wielu agentów zmierzających do wspólnego celu.
+
+Zamiast A* dla każdego agenta liczone jest raz pole integracji – koszt dojścia do celu
+z każdego pola (distance_field(reverse=True)) – a z niego pole kierunków: dla każdego pola
+następne pole na najkrótszej ścieżce (sąsiad minimalizujący koszt ruchu + koszt dojścia).
+Ruch agenta to potem jeden odczyt tablicy na krok, niezależnie od liczby agentów.
+
+Koszt dojścia maleje ściśle wzdłuż kierunków (każdy krok kosztuje > 0), więc podążanie
+za polem zawsze kończy się w celu, a koszt ścieżki jest optymalny.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from .distance_field import _moves, distance_field, grid_arrays
+from .grid import Coord, Grid
+
+
+@dataclass
+class FlowField:
+    goal: Coord
+    cols: int
+    rows: int
+    version: int
+    cost: Any   # ndarray rows x cols: koszt dojścia do celu (inf = nieosiągalne/ściana)
+    nxt: Any    # ndarray rows x cols (int): indeks y*cols+x następnego pola, -1 = brak (cel, ściana)
+
+    def stale(self, grid: Grid) -> bool:
+        return grid.version != self.version
+
+    def step(self, c: Coord) -> Optional[Coord]:
+        """Następne pole dla agenta stojącego na c (None w celu i na polach nieosiągalnych)."""
+        i = int(self.nxt[c[1], c[0]])
+        return None if i < 0 else (i % self.cols, i // self.cols)
+
+    def direction(self, c: Coord) -> Optional[Tuple[int, int]]:
+        n = self.step(c)
+        return None if n is None else (n[0] - c[0], n[1] - c[1])
+
+    def path(self, start: Coord) -> List[Coord]:
+        """Ścieżka start -> cel wzdłuż pola (pusta, gdy cel jest nieosiągalny)."""
+        if start != self.goal and self.nxt[start[1], start[0]] < 0:
+            return []
+        out = [start]
+        while out[-1] != self.goal:
+            out.append(self.step(out[-1]))
+        return out
+
+    def advance(self, positions):
+        """Jeden krok wszystkich agentów naraz: positions – tablica indeksów y*cols+x
+        (agenci w celu lub bez drogi zostają w miejscu). Zwraca nową tablicę."""
+        import numpy as np
+        nxt = self.nxt.ravel()[positions]
+        return np.where(nxt >= 0, nxt, positions)
+
+    def nbytes(self) -> int:
+        return int(self.cost.nbytes + self.nxt.nbytes)
+
+
+def flow_field(grid: Grid, goal: Optional[Coord] = None) -> FlowField:
+    """Pole integracji i pole kierunków do celu (domyślnie grid.goal)."""
+    import numpy as np
+    goal = grid.goal if goal is None else goal
+    cost = distance_field(grid, goal, reverse=True)
+
+    W, blocked, moves = _moves(grid, *grid_arrays(grid))
+    dist = np.full(blocked.size, np.inf)
+    dist.reshape(grid.rows + 2, W)[1:-1, 1:-1] = cost
+    idx = np.arange(dist.size)
+    best = np.full(dist.size, np.inf)
+    nxt = np.full(dist.size, -1, dtype=np.int64)
+    for off, enter, ok in moves:
+        v = (idx + off) % dist.size
+        # koszt ruchu u -> v (wejście na pole v) plus koszt dojścia z v; pierwszy kierunek wygrywa remis
+        cand = np.where(ok, enter[v] + dist[v], np.inf)
+        better = cand < best
+        best[better] = cand[better]
+        nxt[better] = v[better]
+    goal_p = (goal[1] + 1) * W + goal[0] + 1
+    nxt[goal_p] = -1
+    nxt[~np.isfinite(dist)] = -1
+    # indeksy planszy z ramką -> indeksy y*cols+x
+    has = nxt >= 0
+    py, px = np.divmod(nxt[has], W)
+    nxt[has] = (py - 1) * grid.cols + (px - 1)
+    return FlowField(goal, grid.cols, grid.rows, grid.version, cost,
+                     nxt.reshape(grid.rows + 2, W)[1:-1, 1:-1].copy())
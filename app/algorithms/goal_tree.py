@@ -0,0 +1,153 @@
+
+from __future__ import annotations
+import heapq
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Tuple, List, Dict, Optional
+from .grid import Grid, Coord
+from app.utils.metrics import SearchResult
+
+
+class GoalTree:
+    """Odwrotne drzewo najkrótszych ścieżek zakorzenione w celu (Dijkstra od celu).
+
+    `dist[u]` to koszt najkrótszej ścieżki u -> cel, `succ[u]` – następne pole na tej ścieżce.
+    Drzewo jest rozbudowywane leniwie: zapytanie dla startu spoza obszaru już ustalonego
+    wznawia Dijkstrę (kopiec jest zachowywany) tylko do momentu ustalenia tego startu.
+    Kolejne zapytania do tego samego celu to już tylko przejście po `succ`.
+
+    Ruch po planszy jest symetryczny (te same pola narożne blokują ruch w obie strony),
+    więc poprzednicy pola u to `grid.neighbors(u)`, a koszt krawędzi p -> u to `grid.cost(p, u)`.
+    """
+
+    def __init__(self, grid: Grid, goal: Coord):
+        if not grid.in_bounds(goal) or not grid.passable(goal):
+            raise ValueError(f"Cel {goal} poza mapą lub na ścianie")
+        self.grid = grid
+        self.goal = goal
+        self.version = grid.version
+        self.dist: Dict[Coord, float] = {goal: 0.0}
+        self.succ: Dict[Coord, Optional[Coord]] = {goal: None}
+        self.settled: set[Coord] = set()
+        self._pq: List[Tuple[float, Coord]] = [(0.0, goal)]
+        self.expanded = 0
+
+    @property
+    def stale(self) -> bool:
+        return self.grid.version != self.version
+
+    @property
+    def complete(self) -> bool:
+        return not self._pq
+
+    def settle_until(self, start: Optional[Coord] = None) -> List[Coord]:
+        """Wznawia Dijkstrę, aż `start` zostanie ustalony (None = całe drzewo).
+        Zwraca pola ustalone w tym wywołaniu."""
+        if self.stale:
+            raise RuntimeError("Plansza zmieniła się od zbudowania drzewa")
+        grid, dist, succ, settled, pq = self.grid, self.dist, self.succ, self.settled, self._pq
+        newly: List[Coord] = []
+        while pq and start not in settled:
+            du, u = heapq.heappop(pq)
+            if u in settled:
+                continue
+            settled.add(u)
+            newly.append(u)
+            for p in grid.neighbors(u):
+                if p in settled:
+                    continue
+                alt = du + grid.cost(p, u)
+                if alt < dist.get(p, float('inf')):
+                    dist[p] = alt
+                    succ[p] = u
+                    heapq.heappush(pq, (alt, p))
+        self.expanded += len(newly)
+        return newly
+
+    def path_from(self, start: Coord) -> List[Coord]:
+        if start not in self.settled:
+            return []
+        path = [start]
+        while path[-1] != self.goal:
+            path.append(self.succ[path[-1]])
+        return path
+
+    def query(self, start: Coord) -> SearchResult:
+        """Najkrótsza ścieżka start -> cel; `expanded_count` to liczba pól ustalonych
+        przez to zapytanie (0, gdy wystarczył sam odczyt tablic)."""
+        t0 = time.perf_counter()
+        newly = self.settle_until(start)
+        path = self.path_from(start)
+        came_from: Dict[Coord, Optional[Coord]] = {c: p for c, p in zip(path, [None] + path[:-1])}
+        return SearchResult(
+            path=path,
+            found=bool(path),
+            visited_count=len(self.settled),
+            expanded_count=len(newly),
+            frontier_peak=len(self._pq),
+            time_s=time.perf_counter() - t0,
+            total_cost=self.dist[start] if path else float('inf'),
+            explored_order=newly,
+            came_from=came_from
+        )
+
+    def nbytes(self) -> int:
+        # przybliżenie: wpis dist + wpis succ + element settled + krotka (x, y) na pole
+        return 220 * len(self.dist) + 40 * len(self._pq)
+
+
+@dataclass
+class GoalTreeStats:
+    lookups: int = 0      # zapytania obsłużone samym odczytem tablic
+    resumes: int = 0      # zapytania, które musiały rozbudować drzewo
+    builds: int = 0       # nowe drzewa (nowy cel lub zmieniona plansza)
+    evictions: int = 0
+
+
+class GoalTreeCache:
+    """Drzewa GoalTree dla najczęściej używanych celów (LRU, co najwyżej `max_trees`).
+    Drzewo zbudowane dla starej wersji planszy jest odrzucane i budowane od nowa."""
+
+    def __init__(self, max_trees: int = 8):
+        self.max_trees = max_trees
+        self._trees: "OrderedDict[Coord, GoalTree]" = OrderedDict()
+        self.stats = GoalTreeStats()
+
+    def tree(self, grid: Grid, goal: Coord) -> GoalTree:
+        t = self._trees.get(goal)
+        if t is None or t.grid is not grid or t.stale:
+            t = GoalTree(grid, goal)
+            self._trees[goal] = t
+            self.stats.builds += 1
+            while len(self._trees) > self.max_trees:
+                self._trees.popitem(last=False)
+                self.stats.evictions += 1
+        self._trees.move_to_end(goal)
+        return t
+
+    def query(self, grid: Grid, start: Coord, goal: Coord) -> SearchResult:
+        r = self.tree(grid, goal).query(start)
+        if r.expanded_count:
+            self.stats.resumes += 1
+        else:
+            self.stats.lookups += 1
+        return r
+
+    def solve(self, grid: Grid) -> SearchResult:
+        """Interfejs jak bfs/dijkstra/astar: zapytanie grid.start -> grid.goal."""
+        if grid.start is None or grid.goal is None:
+            raise ValueError("Brak punktów start/cel")
+        return self.query(grid, grid.start, grid.goal)
+
+    def evict(self, goal: Coord) -> bool:
+        return self._trees.pop(goal, None) is not None
+
+    def clear(self) -> None:
+        self._trees.clear()
+
+    def nbytes(self) -> int:
+        return sum(t.nbytes() for t in self._trees.values())
+
+    def __len__(self) -> int:
+        return len(self._trees)
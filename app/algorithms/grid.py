@@ -1,12 +1,142 @@
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Tuple, Iterable, Optional
-import math
+from typing import Any, Callable, List, Tuple, Iterable, Optional
+import itertools
 import random
 
+from .terrain import DEFAULT_COSTS, SQRT2, edge_lut, random_terrain
+
 Coord = Tuple[int, int]
 
+# Globalny, rosnący licznik wersji: każda zmiana dowolnej planszy dostaje nowy numer,
+# więc para (wersja, zapytanie) nigdy się nie powtarza – także między różnymi obiektami Grid.
+_VERSIONS = itertools.count(1)
+
+
+class _TrackedSet(set):
+    """Zbiór, który przy każdej zmianie woła `_on_change` (odczyty bez narzutu)."""
+    __slots__ = ("_on_change",)
+
+    def __init__(self, items: Iterable = (), on_change: Optional[Callable[[], None]] = None):
+        super().__init__(items)
+        self._on_change = on_change
+
+    def _changed(self):
+        if self._on_change is not None:
+            self._on_change()
+
+    def add(self, item):
+        if item not in self:
+            super().add(item)
+            self._changed()
+
+    def discard(self, item):
+        if item in self:
+            super().discard(item)
+            self._changed()
+
+    def remove(self, item):
+        super().remove(item)
+        self._changed()
+
+    def pop(self):
+        item = super().pop()
+        self._changed()
+        return item
+
+    def clear(self):
+        if self:
+            super().clear()
+            self._changed()
+
+    def _inplace(name):
+        base = getattr(set, name)
+
+        def method(self, *others):
+            result = base(self, *others)
+            self._changed()
+            return self if name.startswith("__i") else result
+        method.__name__ = name
+        return method
+
+    update = _inplace("update")
+    difference_update = _inplace("difference_update")
+    intersection_update = _inplace("intersection_update")
+    symmetric_difference_update = _inplace("symmetric_difference_update")
+    __ior__ = _inplace("__ior__")
+    __iand__ = _inplace("__iand__")
+    __isub__ = _inplace("__isub__")
+    __ixor__ = _inplace("__ixor__")
+    del _inplace
+
+    def __reduce__(self):
+        return (set, (list(self),))
+
+    def __repr__(self):
+        return repr(set(self))
+
+
+class _TrackedDict(dict):
+    """Słownik, który przy każdej zmianie woła `_on_change` (odczyty bez narzutu)."""
+    __slots__ = ("_on_change",)
+
+    def __init__(self, items: Any = (), on_change: Optional[Callable[[], None]] = None):
+        super().__init__(items)
+        self._on_change = on_change
+
+    def _changed(self):
+        if self._on_change is not None:
+            self._on_change()
+
+    def __setitem__(self, key, value):
+        if key not in self or dict.__getitem__(self, key) != value:
+            super().__setitem__(key, value)
+            self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def pop(self, key, *default):
+        if key in self:
+            value = super().pop(key)
+            self._changed()
+            return value
+        return super().pop(key, *default)
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def clear(self):
+        if self:
+            super().clear()
+            self._changed()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+# pola, których zmiana unieważnia wyniki wyszukiwań (start/cel są częścią klucza zapytania)
+_VERSIONED_FIELDS = ("cols", "rows", "diag", "walls", "weighted", "terrain", "terrain_costs")
+# pamięć podręczna kosztów (przebudowywana leniwie po każdej zmianie wersji), nie jest stanem planszy
+_CACHE_FIELDS = ("_cells", "_base", "_min_step")
+
 @dataclass
 class Grid:
     cols: int
@@ -16,6 +146,50 @@ class Grid:
     weighted: dict[Coord, int] = field(default_factory=dict)  # koszt wejścia na pole
     start: Optional[Coord] = None
     goal: Optional[Coord] = None
+    extra_goals: List[Coord] = field(default_factory=list)  # dodatkowe cele (wyszukiwanie wielocelowe)
+    terrain: dict[Coord, int] = field(default_factory=dict)  # teren pola (brak wpisu = 0), zob. terrain.py
+    terrain_costs: Tuple[float, ...] = DEFAULT_COSTS         # mnożnik kosztu ruchu dla każdego terenu
+
+    # `version` zmienia się przy każdej edycji ścian/wag/terenu/rozmiaru/sąsiedztwa – także
+    # przy bezpośrednich operacjach na `walls`, `weighted` i `terrain` (śledzone kontenery).
+    # Wyniki wyszukiwań zapamiętane dla starej wersji nie mogą więc zostać zwrócone po edycji.
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "walls" and not (isinstance(value, _TrackedSet) and value._on_change == self._bump):
+            value = _TrackedSet(value, self._bump)
+        elif name in ("weighted", "terrain") and not (isinstance(value, _TrackedDict)
+                                                      and value._on_change == self._bump):
+            value = _TrackedDict(value, self._bump)
+        elif name == "terrain_costs":
+            value = tuple(value)
+            edge_lut(value)   # walidacja
+        object.__setattr__(self, name, value)
+        if name in _VERSIONED_FIELDS:
+            self._bump()
+
+    def __getstate__(self) -> dict:
+        return {k: v for k, v in self.__dict__.items() if k not in _CACHE_FIELDS}
+
+    def __setstate__(self, state: dict) -> None:
+        # po odtworzeniu z pickle (np. w innym procesie) kontenery są zwykłe – opakuj na nowo
+        for name, value in state.items():
+            if name != "version" and name not in _CACHE_FIELDS:
+                setattr(self, name, value)
+        self._bump()
+
+    def _bump(self) -> None:
+        object.__setattr__(self, "version", next(_VERSIONS))
+        object.__setattr__(self, "_cells", None)
+
+    def copy(self) -> "Grid":
+        """Niezależna kopia planszy (np. do wyszukiwania w wątku roboczym)."""
+        return Grid(self.cols, self.rows, self.diag, set(self.walls), dict(self.weighted),
+                    self.start, self.goal, list(self.extra_goals), dict(self.terrain),
+                    self.terrain_costs)
+
+    def all_goals(self) -> List[Coord]:
+        """Cel główny i dodatkowe cele, bez powtórzeń."""
+        goals = ([self.goal] if self.goal is not None else []) + self.extra_goals
+        return list(dict.fromkeys(goals))
 
     def in_bounds(self, c: Coord) -> bool:
         x, y = c
@@ -24,11 +198,42 @@ class Grid:
     def passable(self, c: Coord) -> bool:
         return c not in self.walls
 
+    def _build_costs(self) -> dict:
+        """Koszty wejścia (prosto, po skosie) z tablicy lut[kierunek][teren] plus waga pola –
+        tylko dla pól z terenem lub wagą; pozostałe pola mają koszt terenu 0 (`_base`)."""
+        straight, diagonal = edge_lut(self.terrain_costs)
+        terrain, weighted, walls = self.terrain, self.weighted, self.walls
+        cells = {}
+        for c in terrain.keys() | weighted.keys():
+            t = terrain.get(c, 0)
+            w = weighted.get(c, 0)
+            cells[c] = (straight[t] + w, diagonal[t] + w)
+        base = (straight[0], diagonal[0])
+        # minimalny koszt kroku po polach przejezdnych: skalowanie heurystyki (manhattan/octile)
+        # przez tę wartość musi zaniżać koszt każdego ruchu, także skośnego (sqrt(2) * krok)
+        pairs = [p for c, p in cells.items() if c not in walls]
+        if len(pairs) < self.cols * self.rows - len(walls):
+            pairs.append(base)
+        if not pairs:
+            min_step = base[0]
+        elif self.diag:
+            min_step = min(min(p[0] for p in pairs), min(p[1] for p in pairs) / SQRT2)
+        else:
+            min_step = min(p[0] for p in pairs)
+        object.__setattr__(self, "_base", base)
+        object.__setattr__(self, "_min_step", min_step)
+        object.__setattr__(self, "_cells", cells)
+        return cells
+
     def cost(self, c_from: Coord, c_to: Coord) -> float:
-        """Koszt ruchu z c_from -> c_to. Podstawowo 1 (lub sqrt(2) po skosie), plus waga pola docelowego."""
+        """Koszt ruchu z c_from -> c_to: koszt wejścia na pole docelowe z tablicy
+        lut[kierunek][teren] (1 lub sqrt(2) razy mnożnik terenu) plus waga pola."""
         (x1, y1), (x2, y2) = c_from, c_to
-        base = math.sqrt(2.0) if (x1 != x2 and y1 != y2) else 1.0
-        return base + float(self.weighted.get(c_to, 0))
+        cells = self._cells
+        if cells is None:
+            cells = self._build_costs()
+        pair = cells.get(c_to)
+        return (self._base if pair is None else pair)[x1 != x2 and y1 != y2]
 
     def neighbors(self, c: Coord) -> Iterable[Coord]:
         (x, y) = c
@@ -71,6 +276,20 @@ class Grid:
         if self.start: self.weighted.pop(self.start, None)
         if self.goal: self.weighted.pop(self.goal, None)
 
+    def clear_terrain(self):
+        self.terrain.clear()
+
+    def randomize_terrain(self, mix: Iterable[float], seed: int | None = None):
+        """Losowe tereny 1..len(mix) z udziałami `mix` (reszta to teren otwarty)."""
+        terrain = random_terrain(self.cols, self.rows, tuple(mix), seed)
+        for c in (self.start, self.goal, *self.walls):
+            terrain.pop(c, None)
+        self.terrain = terrain
+
     def min_step_cost(self) -> float:
-        # minimalny koszt ruchu: 1 po prostych (albo sqrt(2) po skosie, ale minimum to 1)
-        return 1.0
+        """Najmniejszy koszt kroku (w jednostkach ruchu prostego) po polach przejezdnych:
+        bez terenów i wag to 1; droga obniża go, a plansza w całości np. leśna podnosi –
+        scaled(h, min_step_cost()) pozostaje dopuszczalna i jest możliwie ciasna."""
+        if self._cells is None:
+            self._build_costs()
+        return self._min_step
@@ -0,0 +1,68 @@
+
+from __future__ import annotations
+import time
+from typing import Generator, List, Optional
+from .grid import Coord
+from app.utils.metrics import SearchResult
+
+# Generator kroków algorytmu: po wysłaniu budżetu n rozwija co najwyżej n węzłów,
+# oddaje listę nowo rozwiniętych węzłów, a na końcu zwraca SearchResult (StopIteration.value).
+SearchSteps = Generator[List[Coord], float, SearchResult]
+
+
+class IncrementalSearch:
+    """Wznawialne wyszukiwanie zbudowane na generatorze kroków (bfs/dijkstra/astar `*_steps`).
+
+    `step(n)` rozwija do n węzłów, `run(deadline=..., max_expansions=...)` pracuje do
+    wyczerpania budżetu czasu/rozwinięć, `finish()` kończy wyszukiwanie. Wynik końcowy
+    (`result`) jest identyczny z wynikiem odpowiedniej funkcji wsadowej; `time_s` liczy
+    tylko czas obliczeń, bez przerw między krokami.
+    """
+
+    def __init__(self, steps: SearchSteps):
+        self._gen = steps
+        next(self._gen)  # walidacja wejścia i przygotowanie stanu
+        self.result: Optional[SearchResult] = None
+        self.expanded = 0
+        self.cancelled = False
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None or self.cancelled
+
+    def step(self, n: float = 1) -> List[Coord]:
+        """Rozwija co najwyżej n węzłów i zwraca je w kolejności rozwinięcia."""
+        if self.done:
+            return []
+        try:
+            batch = self._gen.send(n)
+        except StopIteration as stop:
+            self.result = stop.value
+            batch = self.result.explored_order[self.expanded:]
+        self.expanded += len(batch)
+        return batch
+
+    def run(self, deadline: Optional[float] = None, max_expansions: Optional[int] = None,
+            batch: int = 256) -> List[Coord]:
+        """Rozwija węzły partiami aż do końca wyszukiwania, chwili `deadline`
+        (wg time.perf_counter) albo wyczerpania `max_expansions`."""
+        out: List[Coord] = []
+        while not self.done:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            n = batch
+            if max_expansions is not None:
+                n = min(n, max_expansions - len(out))
+                if n <= 0:
+                    break
+            out.extend(self.step(n))
+        return out
+
+    def finish(self) -> SearchResult:
+        if self.result is None:
+            self.step(float("inf"))
+        return self.result
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        self._gen.close()
@@ -0,0 +1,180 @@
+
+from __future__ import annotations
+import heapq
+from dataclasses import dataclass, field
+from typing import Tuple, List, Dict, Set, Optional, Callable, Sequence
+from .grid import Grid, Coord
+from .astar import reconstruct
+from .incremental import IncrementalSearch, SearchSteps
+from app.utils.metrics import SearchResult
+from app.utils.timer import Timer
+
+Box = Tuple[int, int, int, int]  # (x0, y0, x1, y1) włącznie
+
+
+@dataclass
+class GoalHit:
+    goal: Coord
+    cost: float
+    path: List[Coord]
+
+
+@dataclass
+class MultiGoalResult(SearchResult):
+    """SearchResult dla najbliższego celu (path/total_cost) oraz lista osiągniętych celów
+    w kolejności rosnącego kosztu (co najwyżej k)."""
+    hits: List[GoalHit] = field(default_factory=list)
+
+    @property
+    def nearest(self) -> Optional[Coord]:
+        return self.hits[0].goal if self.hits else None
+
+
+def cluster_boxes(goals: Sequence[Coord], max_terms: int) -> List[Box]:
+    """Dzieli cele na co najwyżej max_terms grup (podział największej grupy medianą
+    wzdłuż dłuższego boku) i zwraca prostokąty otaczające grupy."""
+    groups: List[List[Coord]] = [list(goals)]
+    while len(groups) < max_terms:
+        i = max(range(len(groups)), key=lambda j: len(groups[j]))
+        grp = groups[i]
+        if len(grp) < 2:
+            break
+        xs = [c[0] for c in grp]
+        ys = [c[1] for c in grp]
+        axis = 0 if max(xs) - min(xs) >= max(ys) - min(ys) else 1
+        grp.sort(key=lambda c: c[axis])
+        mid = len(grp) // 2
+        groups[i:i + 1] = [grp[:mid], grp[mid:]]
+    boxes = []
+    for grp in groups:
+        xs = [c[0] for c in grp]
+        ys = [c[1] for c in grp]
+        boxes.append((min(xs), min(ys), max(xs), max(ys)))
+    return boxes
+
+
+def goal_heuristic(goals: Sequence[Coord], h: Callable[[Coord, Coord], float],
+                   max_terms: int = 16) -> Callable[[Coord], float]:
+    """Heurystyka do najbliższego z wielu celów: min po celach z h(v, cel).
+
+    Przy K > max_terms cele są grupowane (cluster_boxes), a h liczone do najbliższego punktu
+    prostokąta grupy – koszt O(max_terms) zamiast O(K) na wywołanie. Dla h będących normą
+    zależną od |dx|, |dy| (Manhattan, octile, Euklides) odległość do prostokąta nie przekracza
+    odległości do żadnego celu w nim, a minimum heurystyk spójnych jest spójne – A* pozostaje
+    optymalne, a cele są osiągane w kolejności rosnącego kosztu.
+    """
+    goals = list(dict.fromkeys(goals))
+    if len(goals) <= max_terms:
+        def h_exact(v: Coord) -> float:
+            return min(h(v, t) for t in goals)
+        return h_exact
+    boxes = cluster_boxes(goals, max_terms)
+
+    def h_boxes(v: Coord) -> float:
+        x, y = v
+        best = float('inf')
+        for x0, y0, x1, y1 in boxes:
+            cx = x0 if x < x0 else (x1 if x > x1 else x)
+            cy = y0 if y < y0 else (y1 if y > y1 else y)
+            d = h(v, (cx, cy))
+            if d < best:
+                best = d
+        return best
+    return h_boxes
+
+
+def dijkstra_multi(grid: Grid, goals: Optional[Sequence[Coord]] = None, k: int = 1) -> MultiGoalResult:
+    """Dijkstra od grid.start do najbliższego z celów (domyślnie grid.all_goals());
+    przy k > 1 zbiera k najbliższych celów w jednym przebiegu."""
+    return IncrementalSearch(dijkstra_multi_steps(grid, goals, k)).finish()
+
+
+def astar_multi(grid: Grid, h: Callable[[Coord, Coord], float],
+                goals: Optional[Sequence[Coord]] = None, k: int = 1,
+                max_terms: int = 16) -> MultiGoalResult:
+    """A* do najbliższego z celów z heurystyką goal_heuristic (min po celach/grupach celów)."""
+    return IncrementalSearch(astar_multi_steps(grid, h, goals, k, max_terms)).finish()
+
+
+def dijkstra_multi_steps(grid: Grid, goals: Optional[Sequence[Coord]] = None, k: int = 1) -> SearchSteps:
+    return _multi_steps(grid, goals, k, None)
+
+
+def astar_multi_steps(grid: Grid, h: Callable[[Coord, Coord], float],
+                      goals: Optional[Sequence[Coord]] = None, k: int = 1,
+                      max_terms: int = 16) -> SearchSteps:
+    goals = grid.all_goals() if goals is None else list(goals)
+    return _multi_steps(grid, goals, k, goal_heuristic(goals, h, max_terms) if goals else None)
+
+
+def _multi_steps(grid: Grid, goals: Optional[Sequence[Coord]], k: int,
+                 h1: Optional[Callable[[Coord], float]]) -> SearchSteps:
+    """Generator kroków (patrz IncrementalSearch); h1=None oznacza Dijkstrę."""
+    goals = grid.all_goals() if goals is None else list(goals)
+    if grid.start is None or not goals:
+        raise ValueError("Brak punktów start/cel")
+    if k < 1:
+        raise ValueError("k musi być >= 1")
+    s = grid.start
+    goal_set: Set[Coord] = set(goals)
+    k = min(k, len(goal_set))
+    budget = yield []
+
+    g: Dict[Coord, float] = {s: 0.0}
+    came_from: Dict[Coord, Optional[Coord]] = {s: None}
+    closed: Set[Coord] = set()
+    pq: List[Tuple[float, Coord]] = [(h1(s) if h1 else 0.0, s)]
+    open_set: Set[Coord] = {s}
+    hits: List[GoalHit] = []
+
+    expanded = 0
+    explored_order = []
+    frontier_peak = 1
+    mark = 0
+
+    with Timer() as tm:
+        while pq:
+            fu, u = heapq.heappop(pq)
+            if u in closed:
+                continue
+            closed.add(u)
+            if u in open_set:
+                open_set.remove(u)
+
+            explored_order.append(u)
+            expanded += 1
+            if u in goal_set:
+                hits.append(GoalHit(u, g[u], reconstruct(came_from, s, u)))
+                if len(hits) >= k:
+                    break
+            for v in grid.neighbors(u):
+                if v in closed:
+                    continue
+                tentative = g[u] + grid.cost(u, v)
+                if tentative < g.get(v, float('inf')):
+                    g[v] = tentative
+                    came_from[v] = u
+                    heapq.heappush(pq, (tentative + h1(v) if h1 else tentative, v))
+                    if v not in open_set:
+                        open_set.add(v)
+                    frontier_peak = max(frontier_peak, len(open_set))
+            budget -= 1
+            if budget <= 0:
+                tm.pause()
+                budget = yield explored_order[mark:]
+                mark = len(explored_order)
+                tm.resume()
+
+    best = hits[0] if hits else None
+    return MultiGoalResult(
+        path=best.path if best else [],
+        found=best is not None,
+        visited_count=len(closed),
+        expanded_count=expanded,
+        frontier_peak=frontier_peak,
+        time_s=tm.elapsed,
+        total_cost=best.cost if best else float('inf'),
+        explored_order=explored_order,
+        came_from=came_from,
+        hits=hits
+    )
@@ -0,0 +1,77 @@
+"""Typy terenu: małe całkowite identyfikatory pól i tablica kosztów ruchu.
+
+Każde pole planszy ma teren (`Grid.terrain`, rzadki słownik – brak wpisu to teren 0,
+zwykłe pole). Teren mnoży koszt bazowy ruchu wchodzącego na pole: 1 po prostej,
+sqrt(2) po skosie. Zamiast liczyć to przy każdej relaksacji, `edge_lut(costs)` buduje
+raz tablicę lut[kierunek][teren] (kierunek 0 – prosto, 1 – po skosie), z której Grid
+składa koszty wejścia na pola – zob. Grid.cost i Grid.min_step_cost.
+
+Addytywne wagi pól (`Grid.weighted`) działają jak dotąd i sumują się z kosztem terenu:
+koszt = lut[kierunek][teren] + waga.
+"""
+from __future__ import annotations
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+SQRT2 = math.sqrt(2.0)
+
+
+@dataclass(frozen=True)
+class Terrain:
+    name: str
+    factor: float   # mnożnik kosztu bazowego ruchu na pole tego terenu
+    symbol: str     # znak w tekstowym formacie mapy (app/utils/mapio.py)
+
+
+PLAIN = 0
+ROAD = 1
+FOREST = 2
+SAND = 3
+SWAMP = 4
+
+TERRAINS: Tuple[Terrain, ...] = (
+    Terrain("teren otwarty", 1.0, "."),
+    Terrain("droga", 0.5, "="),
+    Terrain("las", 2.0, "f"),
+    Terrain("piasek", 3.0, "s"),
+    Terrain("bagno", 5.0, "~"),
+)
+
+# koszt terenu -> tablica mnożników indeksowana identyfikatorem terenu
+DEFAULT_COSTS: Tuple[float, ...] = tuple(t.factor for t in TERRAINS)
+SYMBOLS: Dict[str, int] = {t.symbol: i for i, t in enumerate(TERRAINS) if i != PLAIN}
+
+# przykładowa mieszanka dla scenariuszy benchmarku: udział pól drogi, lasu, piasku, bagna
+MIXED = (0.15, 0.15, 0.10, 0.05)
+
+
+def edge_lut(costs: Sequence[float]) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """lut[kierunek][teren]: koszt wejścia na pole terenu prosto (0) i po skosie (1)."""
+    if any(not c > 0 for c in costs):
+        raise ValueError("Koszty terenów muszą być dodatnie")
+    return tuple(1.0 * c for c in costs), tuple(SQRT2 * c for c in costs)
+
+
+def random_terrain(cols: int, rows: int, mix: Sequence[float],
+                   seed: int | None = None) -> Dict[Tuple[int, int], int]:
+    """Losowy podział pól na tereny: pole dostaje teren i (1..len(mix)) z prawd. mix[i-1],
+    a teren otwarty z pozostałym prawdopodobieństwem (jedno losowanie na pole)."""
+    if sum(mix) > 1.0 + 1e-9:
+        raise ValueError("Udziały terenów sumują się do więcej niż 1")
+    rng = random.Random(seed)
+    bounds = []
+    acc = 0.0
+    for p in mix:
+        acc += p
+        bounds.append(acc)
+    out: Dict[Tuple[int, int], int] = {}
+    for x in range(cols):
+        for y in range(rows):
+            r = rng.random()
+            for t, b in enumerate(bounds, 1):
+                if r < b:
+                    out[(x, y)] = t
+                    break
+    return out
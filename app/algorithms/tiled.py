@@ -0,0 +1,250 @@
+"""Plansza kafelkowa w pliku mapowanym w pamięci – dla map większych niż RAM.
+
+`Grid` trzyma ściany i wagi w zbiorach/słownikach Pythona (~100 B na pole), więc mapa
+100k x 100k nie mieści się w pamięci. `TiledGrid` przechowuje pola jako bajty (kodowanie
+jak w formacie .grid: 0 – wolne, 255 – ściana, 1..254 – waga) w pliku podzielonym na
+kafelki T x T. Plik jest mapowany (mmap), kafelek kopiowany jest do pamięci przy pierwszym
+dostępie (fault), a rezydentnych jest co najwyżej `max_tiles` kafelków (LRU); strony pliku
+po skopiowaniu są zwalniane (madvise), więc zajęta pamięć to ~max_tiles * T² bajtów
+plus struktury samego wyszukiwania.
+
+TiledGrid ma interfejs planszy używany przez algorytmy (start/goal, neighbors, cost,
+in_bounds, passable, min_step_cost, version), więc `astar`/`dijkstra` działają na niej
+bez zmian; `search(tg, solver)` zwraca wynik i statystyki kafelków dla danego zapytania.
+
+Format pliku (.tiles): b"TILE", wersja (u8), diag (u8), cols (u32), rows (u32),
+bok kafelka (u32), dopełnienie do rozmiaru strony; potem kafelki wierszami kafelków,
+każdy T*T bajtów wierszami (pola poza planszą w kafelkach brzegowych to ściany).
+"""
+from __future__ import annotations
+import mmap
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .grid import Coord, Grid, _VERSIONS
+
+MAGIC = b"TILE"
+_HEADER = struct.Struct("<4sBBIII")
+WALL_BYTE = 255
+_SQRT2 = 2.0 ** 0.5
+_DIRS4 = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_DIRS8 = _DIRS4 + ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+@dataclass
+class TileStats:
+    faults: int          # wczytania kafelka z pliku (brak w LRU)
+    hits: int            # trafienia w LRU przy zmianie kafelka
+    evictions: int
+    resident: int        # kafelki w pamięci
+    resident_bytes: int
+
+    def __sub__(self, other: "TileStats") -> "TileStats":
+        """Przyrost liczników względem wcześniejszej migawki (stan rezydentny – bieżący)."""
+        return TileStats(self.faults - other.faults, self.hits - other.hits,
+                         self.evictions - other.evictions, self.resident, self.resident_bytes)
+
+
+def _data_offset() -> int:
+    return -(-_HEADER.size // mmap.PAGESIZE) * mmap.PAGESIZE
+
+
+def create_tiled(path: Path, cols: int, rows: int, tile: int = 256, diag: bool = False,
+                 fill: Optional[Callable[[int, int, int], bytes]] = None) -> Path:
+    """Tworzy plik .tiles. `fill(tx, ty, tile)` zwraca T*T bajtów kafelka (wierszami);
+    bez `fill` plik jest rzadki (same wolne pola) – zapis tylko nagłówka."""
+    if cols <= 0 or rows <= 0 or tile <= 0:
+        raise ValueError("Rozmiar planszy i kafelka musi być dodatni")
+    path = Path(path)
+    tcols, trows = -(-cols // tile), -(-rows // tile)
+    tsize = tile * tile
+    base = _data_offset()
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, 1, int(diag), cols, rows, tile))
+        f.truncate(base + tcols * trows * tsize)
+        for ty in range(trows):
+            for tx in range(tcols):
+                data = fill(tx, ty, tile) if fill is not None else None
+                # pola poza planszą w kafelkach brzegowych oznacz jako ściany
+                w, h = min(tile, cols - tx * tile), min(tile, rows - ty * tile)
+                if (w < tile or h < tile) and data is None:
+                    data = bytes(tsize)
+                if data is None:
+                    continue
+                if len(data) != tsize:
+                    raise ValueError(f"Kafelek ({tx}, {ty}) ma {len(data)} B zamiast {tsize}")
+                if w < tile or h < tile:
+                    buf = bytearray(data)
+                    for y in range(tile):
+                        lo = 0 if y >= h else w
+                        buf[y * tile + lo:(y + 1) * tile] = bytes([WALL_BYTE]) * (tile - lo)
+                    data = bytes(buf)
+                f.seek(base + (ty * tcols + tx) * tsize)
+                f.write(data)
+    return path
+
+
+def save_tiled(g: Grid, path: Path, tile: int = 256) -> Path:
+    """Zapisuje zwykłą planszę w formacie kafelkowym (np. do testów i konwersji map).
+    Format .tiles ma jeden bajt na pole, bez warstwy terenów."""
+    if g.terrain:
+        raise ValueError("Format kafelkowy nie obsługuje terenów (Grid.terrain)")
+    def fill(tx: int, ty: int, t: int) -> bytes:
+        buf = bytearray(t * t)
+        x0, y0 = tx * t, ty * t
+        for (x, y), w in g.weighted.items():
+            if x0 <= x < x0 + t and y0 <= y < y0 + t:
+                buf[(y - y0) * t + x - x0] = min(254, w)
+        for (x, y) in g.walls:
+            if x0 <= x < x0 + t and y0 <= y < y0 + t:
+                buf[(y - y0) * t + x - x0] = WALL_BYTE
+        return bytes(buf)
+    return create_tiled(path, g.cols, g.rows, tile, g.diag, fill)
+
+
+class TiledGrid:
+    """Plansza tylko do odczytu oparta o plik .tiles (patrz opis modułu)."""
+
+    def __init__(self, path: Path, max_tiles: int = 256, diag: Optional[bool] = None):
+        if max_tiles < 1:
+            raise ValueError("max_tiles musi być >= 1")
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Pusty plik mapy: {path}")
+        magic, version, fdiag, cols, rows, tile = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != 1:
+            self.close()
+            raise ValueError(f"Nieobsługiwany plik mapy: {path}")
+        self.cols, self.rows, self.tile = cols, rows, tile
+        self.diag = bool(fdiag) if diag is None else diag
+        self.tile_cols = -(-cols // tile)
+        self._base = _data_offset()
+        if len(self._mm) < self._base + self.tile_cols * -(-rows // tile) * tile * tile:
+            self.close()
+            raise ValueError(f"Uszkodzony plik mapy: {path}")
+        self.max_tiles = max_tiles
+        self.start: Optional[Coord] = None
+        self.goal: Optional[Coord] = None
+        self.extra_goals: List[Coord] = []
+        # plansza jest niezmienna – jedna wersja na otwarcie (klucz ResultCache)
+        self.version = next(_VERSIONS)
+        self._lru: "OrderedDict[Tuple[int, int], bytes]" = OrderedDict()
+        self._last_key: Optional[Tuple[int, int]] = None
+        self._last_tile = b""
+        self.faults = self.hits = self.evictions = 0
+
+    # --- zarządzanie kafelkami ---
+
+    def _load(self, key: Tuple[int, int]) -> bytes:
+        tile = self._lru.get(key)
+        if tile is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return tile
+        size = self.tile * self.tile
+        off = self._base + (key[1] * self.tile_cols + key[0]) * size
+        tile = self._mm[off:off + size]
+        if hasattr(self._mm, "madvise"):
+            # kopia jest już w LRU – oddaj zmapowane strony pliku (zakres wyrównany do strony)
+            lo = off - off % mmap.PAGESIZE
+            self._mm.madvise(mmap.MADV_DONTNEED, lo, off + size - lo)
+        self.faults += 1
+        self._lru[key] = tile
+        if len(self._lru) > self.max_tiles:
+            self._lru.popitem(last=False)
+            self.evictions += 1
+        return tile
+
+    def cell(self, x: int, y: int) -> int:
+        """Bajt pola: 0 – wolne, 255 – ściana, inne – waga (bez sprawdzania granic)."""
+        t = self.tile
+        key = (x // t, y // t)
+        if key != self._last_key:
+            self._last_tile = self._load(key)
+            self._last_key = key
+        return self._last_tile[(y % t) * t + x % t]
+
+    @property
+    def stats(self) -> TileStats:
+        n = len(self._lru)
+        return TileStats(self.faults, self.hits, self.evictions, n, n * self.tile * self.tile)
+
+    def drop_tiles(self) -> None:
+        """Opróżnia LRU (np. między pomiarami zimnego startu)."""
+        self._lru.clear()
+        self._last_key, self._last_tile = None, b""
+
+    def close(self) -> None:
+        self.drop_tiles()
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "TiledGrid":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- interfejs planszy (jak Grid) ---
+
+    @property
+    def walls(self) -> "_TileWalls":
+        return _TileWalls(self)
+
+    def all_goals(self) -> List[Coord]:
+        goals = ([self.goal] if self.goal is not None else []) + self.extra_goals
+        return list(dict.fromkeys(goals))
+
+    def in_bounds(self, c: Coord) -> bool:
+        x, y = c
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def passable(self, c: Coord) -> bool:
+        return self.cell(c[0], c[1]) != WALL_BYTE
+
+    def cost(self, c_from: Coord, c_to: Coord) -> float:
+        (x1, y1), (x2, y2) = c_from, c_to
+        base = _SQRT2 if (x1 != x2 and y1 != y2) else 1.0
+        b = self.cell(x2, y2)
+        return base + (b if b != WALL_BYTE else 0)
+
+    def neighbors(self, c: Coord) -> Iterable[Coord]:
+        x, y = c
+        cols, rows, cell = self.cols, self.rows, self.cell
+        for dx, dy in (_DIRS8 if self.diag else _DIRS4):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < cols and 0 <= ny < rows and cell(nx, ny) != WALL_BYTE:
+                # jak w Grid: bez przecinania narożnika między dwiema ścianami
+                if dx and dy and cell(x + dx, y) == WALL_BYTE and cell(x, y + dy) == WALL_BYTE:
+                    continue
+                yield (nx, ny)
+
+    def min_step_cost(self) -> float:
+        return 1.0
+
+
+class _TileWalls:
+    """Widok `c in walls` dla kodu, który sprawdza ściany bezpośrednio (np. free_cells)."""
+    __slots__ = ("_tg",)
+
+    def __init__(self, tg: TiledGrid):
+        self._tg = tg
+
+    def __contains__(self, c: Coord) -> bool:
+        return not self._tg.passable(c)
+
+
+def search(tg: TiledGrid, solver: Callable[..., object], *args, **kwargs) -> Tuple[object, TileStats]:
+    """Uruchamia solver(tg, ...) i zwraca (wynik, statystyki kafelków tego zapytania)."""
+    before = tg.stats
+    result = solver(tg, *args, **kwargs)
+    return result, tg.stats - before
+
@@ -0,0 +1,203 @@
+"""Adaptacyjny przegląd gęstości przeszkód: próby tam, gdzie krzywa jest niepewna,
+nowe punkty tam, gdzie krzywa zmienia się najszybciej.
+
+Każdy punkt gęstości zbiera próby partiami (`batch`), aż 95% przedział ufności ilorazu
+rozwinięć A*/Dijkstra (względny, metoda delty dla ilorazu średnich) i średniego b* A*
+(bezwzględny) będą węższe niż cele – albo do `max_trials`. Część budżetu (`explore`,
+a także wszystko, czego punkty już nie potrzebują) idzie na nowe punkty: między sąsiednimi
+punktami o największej znormalizowanej zmianie ilorazu, b* i odsetka prób ze ścieżką
+wstawiany jest środek przedziału. Odsetek udanych prób spada gwałtownie przy progu
+perkolacji, więc tam krzywa zagęszcza się sama; `threshold()` szacuje gęstość, przy
+której ścieżka istnieje w połowie prób.
+
+Próby dostarcza funkcja `run_batch(gęstość, pierwsza, liczba)` zwracająca wyniki
+w formacie run_bench – zob. scripts/density_sweep.py --adaptive.
+"""
+from __future__ import annotations
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.benchmark.streaming import Z95
+
+RunBatch = Callable[[float, int, int], Dict[str, List[Dict[str, Any]]]]
+
+
+@dataclass
+class DensityPoint:
+    density: float
+    trials: int = 0
+    dijkstra: List[float] = field(default_factory=list)  # rozwinięcia udanych prób (pary z astar)
+    astar: List[float] = field(default_factory=list)
+    bstar: List[float] = field(default_factory=list)
+
+    def add(self, results: Dict[str, List[Dict[str, Any]]], count: int) -> None:
+        self.trials += count
+        for d, a in zip(results["Dijkstra"], results["A*"]):
+            if d.get("found") and a.get("found"):
+                self.dijkstra.append(d["expanded"])
+                self.astar.append(a["expanded"])
+                self.bstar.append(a["b_star"])
+
+    @property
+    def n_ok(self) -> int:
+        return len(self.astar)
+
+    @property
+    def success_rate(self) -> float:
+        return self.n_ok / self.trials if self.trials else math.nan
+
+    @property
+    def ratio(self) -> float:
+        return sum(self.astar) / sum(self.dijkstra) if self.n_ok else math.nan
+
+    @property
+    def ratio_ci(self) -> float:
+        """Względna połowa szerokości 95% CI ilorazu średnich (metoda delty)."""
+        n = self.n_ok
+        if n < 2:
+            return math.inf
+        r = self.ratio
+        mean_d = sum(self.dijkstra) / n
+        s2 = sum((a - r * d) ** 2 for a, d in zip(self.astar, self.dijkstra)) / (n - 1)
+        return Z95 * math.sqrt(s2 / n) / mean_d / r if r > 0 else math.inf
+
+    @property
+    def bstar_mean(self) -> float:
+        return sum(self.bstar) / self.n_ok if self.n_ok else math.nan
+
+    @property
+    def success_ci(self) -> float:
+        """Połowa szerokości 95% CI odsetka prób ze ścieżką (przybliżenie normalne)."""
+        if not self.trials:
+            return math.inf
+        r = self.success_rate
+        return Z95 * math.sqrt(r * (1 - r) / self.trials)
+
+    @property
+    def bstar_ci(self) -> float:
+        n = self.n_ok
+        if n < 2:
+            return math.inf
+        m = self.bstar_mean
+        return Z95 * math.sqrt(sum((b - m) ** 2 for b in self.bstar) / (n - 1) / n)
+
+
+@dataclass
+class AdaptiveSweep:
+    run_batch: RunBatch
+    lo: float = 0.10
+    hi: float = 0.45
+    initial: int = 5
+    budget: int = 210          # łączna liczba prób (jak 7 gęstości x 30 prób)
+    batch: int = 10
+    ratio_target: float = 0.25  # względna połowa szerokości CI ilorazu
+    bstar_target: float = 0.005  # bezwzględna połowa szerokości CI b*
+    min_trials: int = 15
+    max_trials: int = 60
+    explore: float = 0.4       # udział prób przeznaczonych na nowe punkty
+    min_gap: float = 0.01      # najwęższy przedział, w który wolno wstawić punkt
+    points: List[DensityPoint] = field(default_factory=list)
+    used: int = 0
+    inserted: int = 0          # próby wykonane w nowych punktach
+    log: List[str] = field(default_factory=list)
+
+    def excess(self, p: DensityPoint) -> float:
+        """> 1: punkt wymaga kolejnych prób (CI szersze niż cel albo za mało prób).
+        Punkt prawie bez udanych prób (za progiem perkolacji) nie jest dalej próbkowany –
+        jego iloraz i b* są nieosiągalne w rozsądnym budżecie, a odsetek udanych prób znany."""
+        if p.trials >= self.max_trials:
+            return 0.0
+        if p.trials < self.min_trials:
+            return math.inf
+        if p.n_ok < 2:
+            return 0.0
+        return max(p.ratio_ci / self.ratio_target, p.bstar_ci / self.bstar_target)
+
+    def priority(self, p: DensityPoint) -> float:
+        """Kolejność próbkowania: nadmiar CI razy odsetek udanych prób (udane próby na próbę)."""
+        e = self.excess(p)
+        return e if math.isinf(e) else e * p.success_rate
+
+    def _sample(self, p: DensityPoint, count: int) -> None:
+        count = min(count, self.budget - self.used)
+        if count <= 0:
+            return
+        p.add(self.run_batch(p.density, p.trials, count), count)
+        self.used += count
+
+    def _curves(self) -> List[List[Tuple[float, float]]]:
+        """Krzywe (wartość, połowa CI) w punktach: iloraz, b*, odsetek prób ze ścieżką."""
+        pts = self.points
+        return [[(p.ratio, p.ratio * p.ratio_ci) for p in pts],
+                [(p.bstar_mean, p.bstar_ci) for p in pts],
+                [(p.success_rate, p.success_ci) for p in pts]]
+
+    def _insert(self) -> Optional[float]:
+        """Środek przedziału o największej znormalizowanej zmianie krzywych. Zmiana mniejsza
+        niż szerokość przedziałów ufności końców nie liczy się (to szum, nie kształt krzywej)."""
+        best, best_i = 0.0, None
+        curves = self._curves()
+        spans = []
+        for c in curves:
+            ok = [v for v, h in c if math.isfinite(h)]
+            spans.append(max(ok) - min(ok) if len(ok) > 1 else 0.0)
+        for i in range(len(self.points) - 1):
+            if self.points[i + 1].density - self.points[i].density < 2 * self.min_gap:
+                continue
+            score = 0.0
+            for c, span in zip(curves, spans):
+                if span > 0:
+                    (a, ha), (b, hb) = c[i], c[i + 1]
+                    # za progiem perkolacji iloraz i b* nie są określone (brak lub pojedyncze
+                    # udane próby) – tam kształt krzywej wyznacza sam odsetek prób ze ścieżką
+                    if math.isfinite(ha + hb):
+                        score += max(0.0, abs(b - a) - 0.5 * (ha + hb)) / span
+            if score > best:
+                best, best_i = score, i
+        if best_i is None:
+            return None
+        d = round(0.5 * (self.points[best_i].density + self.points[best_i + 1].density), 4)
+        self.points.insert(best_i + 1, DensityPoint(d))
+        return d
+
+    def step(self) -> bool:
+        """Jedna decyzja: partia prób dla najbardziej niepewnego punktu albo nowy punkt.
+        Zwraca False, gdy budżet się wyczerpał lub nie ma już nic do zrobienia."""
+        if self.used >= self.budget:
+            return False
+        if not self.points:
+            k = max(2, self.initial)
+            self.points = [DensityPoint(round(self.lo + i * (self.hi - self.lo) / (k - 1), 4))
+                           for i in range(k)]
+        worst = max(self.points, key=self.priority)
+        refine = self.excess(worst) > 1.0
+        ready = all(p.trials >= self.min_trials for p in self.points)
+        if ready and (not refine or self.inserted < self.explore * self.used):
+            d = self._insert()
+            if d is not None:
+                self.log.append(f"nowy punkt {d:.4f} po {self.used} próbach")
+                before = self.used
+                self._sample(self.points[[p.density for p in self.points].index(d)], self.min_trials)
+                self.inserted += self.used - before
+                return True
+        if not refine:
+            return False
+        self._sample(worst, self.batch)
+        return True
+
+    def run(self, on_step: Optional[Callable[["AdaptiveSweep"], None]] = None) -> List[DensityPoint]:
+        while self.step():
+            if on_step is not None:
+                on_step(self)
+        return self.points
+
+    def threshold(self, level: float = 0.5) -> Optional[float]:
+        """Gęstość, przy której odsetek prób ze ścieżką spada do `level` (interpolacja liniowa
+        między sąsiednimi punktami); None, gdy krzywa nie przecina poziomu."""
+        pts = [p for p in self.points if p.trials]
+        for a, b in zip(pts, pts[1:]):
+            ra, rb = a.success_rate, b.success_rate
+            if ra >= level > rb:
+                return a.density + (ra - level) / (ra - rb) * (b.density - a.density)
+        return None
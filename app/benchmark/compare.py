@@ -0,0 +1,187 @@
+from __future__ import annotations
+import csv
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple, Any, Optional
+
+# Kolumny liczbowe z results.csv (patrz scripts/bench_all.py: CSV_COLUMNS)
+NUMERIC_COLUMNS = ["time_s", "expanded", "visited", "frontier_peak", "path_len", "total_cost", "b_star"]
+
+
+@dataclass
+class Tolerances:
+    """Progi bramki regresji.
+
+    time_rel    – dopuszczalny względny wzrost mediany czasu (0.10 = +10%)
+    alpha       – poziom istotności testu Manna–Whitneya dla czasu
+    count_rel   – dopuszczalny względny wzrost średniej liczby rozwinięć/odwiedzin/frontu
+    cost_abs    – dopuszczalna bezwzględna różnica kosztu ścieżki w tej samej próbie
+    """
+    time_rel: float = 0.10
+    alpha: float = 0.05
+    count_rel: float = 0.0
+    cost_abs: float = 1e-9
+
+
+@dataclass
+class Check:
+    scenario: str
+    algorithm: str
+    metric: str
+    baseline: float
+    current: float
+    passed: bool
+    detail: str = ""
+
+
+@dataclass
+class Report:
+    checks: List[Check] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return all(c.passed for c in self.checks)
+
+    def failures(self) -> List[Check]:
+        return [c for c in self.checks if not c.passed]
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """Wczytuje results.csv → {scenariusz: {algorytm: [wiersze]}} (tylko udane próby)."""
+    out: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("found") != "True":
+                continue
+            rec: Dict[str, Any] = {"trial": int(row["trial"])}
+            for col in NUMERIC_COLUMNS:
+                if row.get(col) not in (None, ""):
+                    rec[col] = float(row[col])
+            out.setdefault(row["scenario"], {}).setdefault(row["algorithm"], []).append(rec)
+    return out
+
+
+def find_result_files(root: Path) -> Dict[str, Path]:
+    """Zwraca {nazwa: ścieżka} dla pliku CSV albo katalogu z bench_*/results.csv."""
+    if root.is_file():
+        return {root.parent.name: root}
+    if (root / "results.csv").is_file():
+        return {root.name: root / "results.csv"}
+    return {p.parent.name: p for p in sorted(root.glob("bench_*/results.csv"))}
+
+
+def mann_whitney_greater(x: List[float], y: List[float]) -> Tuple[float, float]:
+    """Jednostronny test Manna–Whitneya H1: rozkład y jest przesunięty w górę względem x.
+
+    Przybliżenie normalne z poprawką na remisy i ciągłość. Zwraca (U_y, p).
+    """
+    n1, n2 = len(x), len(y)
+    if n1 == 0 or n2 == 0:
+        return float("nan"), 1.0
+    pooled = sorted([(v, 0) for v in x] + [(v, 1) for v in y])
+    ranks = [0.0] * len(pooled)
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        avg = (i + j) / 2.0 + 1.0
+        for k in range(i, j + 1):
+            ranks[k] = avg
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+    r_y = sum(r for r, (_, grp) in zip(ranks, pooled) if grp == 1)
+    u_y = r_y - n2 * (n2 + 1) / 2.0
+    n = n1 + n2
+    mu = n1 * n2 / 2.0
+    var = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0.0
+    if var <= 0:
+        return u_y, 1.0
+    z = (u_y - mu - 0.5) / math.sqrt(var)
+    p = 0.5 * math.erfc(z / math.sqrt(2.0))
+    return u_y, p
+
+
+def _median(values: List[float]) -> float:
+    s = sorted(values)
+    n = len(s)
+    if n == 0:
+        return float("nan")
+    return s[n // 2] if n % 2 == 1 else 0.5 * (s[n // 2 - 1] + s[n // 2])
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else float("nan")
+
+
+def compare_algorithm(scenario: str, algo: str,
+                      base: List[Dict[str, Any]], cur: List[Dict[str, Any]],
+                      tol: Tolerances) -> List[Check]:
+    checks: List[Check] = []
+
+    # Czas: regresja tylko gdy wzrost mediany przekracza tolerancję I jest istotny statystycznie
+    bt = [r["time_s"] for r in base]
+    ct = [r["time_s"] for r in cur]
+    mb, mc = _median(bt), _median(ct)
+    _, p = mann_whitney_greater(bt, ct)
+    slower = mb > 0 and (mc - mb) / mb > tol.time_rel
+    checks.append(Check(scenario, algo, "time_s (mediana)", mb, mc,
+                        passed=not (slower and p < tol.alpha),
+                        detail=f"p={p:.4f}, zmiana={(mc - mb) / mb * 100 if mb else float('nan'):+.1f}%"))
+
+    # Liczniki: porównanie średnich z tolerancją względną
+    for metric in ("expanded", "visited", "frontier_peak"):
+        vb = _mean([r[metric] for r in base])
+        vc = _mean([r[metric] for r in cur])
+        limit = vb * (1.0 + tol.count_rel)
+        checks.append(Check(scenario, algo, f"{metric} (średnia)", vb, vc,
+                            passed=vc <= limit + 1e-9,
+                            detail=f"limit={limit:.1f}"))
+
+    # Koszt: dokładna zgodność próba-do-próby (te same ziarna → te same mapy)
+    base_cost = {r["trial"]: r["total_cost"] for r in base}
+    cur_cost = {r["trial"]: r["total_cost"] for r in cur}
+    common = sorted(set(base_cost) & set(cur_cost))
+    mismatched = [t for t in common if abs(base_cost[t] - cur_cost[t]) > tol.cost_abs]
+    missing = sorted(set(base_cost) - set(cur_cost))
+    detail = f"porównano {len(common)} prób"
+    if mismatched:
+        detail += f", różne w próbach {mismatched[:5]}"
+    if missing:
+        detail += f", brak prób {missing[:5]}"
+    checks.append(Check(scenario, algo, "total_cost (próby)",
+                        _mean(list(base_cost.values())), _mean(list(cur_cost.values())),
+                        passed=not mismatched and not missing, detail=detail))
+    return checks
+
+
+def compare_results(baseline: Dict[str, Dict[str, List[Dict[str, Any]]]],
+                    current: Dict[str, Dict[str, List[Dict[str, Any]]]],
+                    tol: Optional[Tolerances] = None) -> Report:
+    tol = tol or Tolerances()
+    report = Report()
+    for scenario, algos in baseline.items():
+        for algo, base_rows in algos.items():
+            cur_rows = current.get(scenario, {}).get(algo)
+            if not cur_rows:
+                report.checks.append(Check(scenario, algo, "obecność wyników",
+                                           len(base_rows), 0, passed=False,
+                                           detail="brak wyników w nowym przebiegu"))
+                continue
+            report.checks.extend(compare_algorithm(scenario, algo, base_rows, cur_rows, tol))
+    return report
+
+
+def format_report(report: Report) -> str:
+    lines = [f"{'scen.':6s} {'algorytm':10s} {'metryka':22s} {'baseline':>12s} {'nowy':>12s} {'wynik':>6s}  szczegóły",
+             "-" * 96]
+    for c in report.checks:
+        lines.append(f"{c.scenario:6s} {c.algorithm:10s} {c.metric:22s} {c.baseline:12.6g} "
+                     f"{c.current:12.6g} {'OK' if c.passed else 'FAIL':>6s}  {c.detail}")
+    lines.append("-" * 96)
+    n_fail = len(report.failures())
+    lines.append("WYNIK: " + ("PASS" if report.passed else f"FAIL ({n_fail} regresji)"))
+    return "\n".join(lines)
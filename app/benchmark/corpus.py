@@ -0,0 +1,246 @@
+"""Korpus plansz benchmarku: wygenerowane próby współdzielone między algorytmami,
+scenariuszami i procesami.
+
+Mapy prób zależą tylko od (cols, rows, wall_density, weight_density, weight_value, seed,
+terrain_mix) i numeru próby – nie od sąsiedztwa ani algorytmu – więc np. S1 i S2 (ten sam seed, bez
+wag) dostają identyczne plansze. `GridCorpus.series(key, trials)` zwraca serię prób
+w zwartej postaci (1 B na pole, kodowanie jak .grid: 0 – wolne, 255 – ściana, 1..254 – waga
++ start/cel, a przy mieszance terenów druga tablica 1 B na pole z identyfikatorem terenu), szukając kolejno: w pamięci procesu, na dysku (`.corpus/*.npz`), a w ostateczności
+generując ją dokładnie tak jak dotąd robił run_bench (te same losowania → te same próby).
+
+`GridCorpus.share(key, trials)` umieszcza serię w `multiprocessing.shared_memory` i zwraca
+mały, serializowalny uchwyt; procesy robocze wywołują `handle.attach()` i czytają tablice
+bezpośrednio ze wspólnego bloku – bez kopiowania i ponownego generowania.
+"""
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.algorithms.grid import Grid
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent.parent / ".corpus"
+WALL_BYTE = 255
+
+
+def _np():
+    import numpy as np
+    return np
+
+
+@dataclass(frozen=True)
+class CorpusKey:
+    cols: int
+    rows: int
+    wall_density: float
+    weight_density: float
+    weight_value: int
+    seed: int
+    terrain_mix: Tuple[float, ...] = ()   # udziały terenów 1..k (terrain.random_terrain)
+
+    @classmethod
+    def from_config(cls, cfg: Any) -> "CorpusKey":
+        """Klucz z TrialConfig (diag, trials i reguły remisów nie wpływają na mapy)."""
+        value = cfg.weight_value if cfg.weight_density > 0 else 0
+        return cls(cfg.cols, cfg.rows, cfg.wall_density, cfg.weight_density, value, cfg.seed,
+                   tuple(cfg.terrain_mix))
+
+    @property
+    def name(self) -> str:
+        name = (f"{self.cols}x{self.rows}_w{self.wall_density:g}_m{self.weight_density:g}"
+                f"x{self.weight_value}_s{self.seed}")
+        if self.terrain_mix:
+            name += "_t" + "-".join(f"{p:g}" for p in self.terrain_mix)
+        return name
+
+
+class Series:
+    """Seria prób: `cells` (próby x rows x cols, uint8), `ends` (próby x 4: sx, sy, gx, gy)
+    i – dla klucza z mieszanką terenów – `terrain` (próby x rows x cols, uint8)."""
+
+    def __init__(self, key: CorpusKey, cells, ends, owner: Any = None, terrain: Any = None):
+        self.key = key
+        self.cells = cells
+        self.ends = ends
+        self.terrain = terrain
+        self._owner = owner  # blok pamięci współdzielonej – musi żyć tak długo jak widoki
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def slice(self, start: int, stop: int) -> "Series":
+        """Próby start..stop-1 jako widok (bez kopiowania tablic)."""
+        terrain = self.terrain[start:stop] if self.terrain is not None else None
+        return Series(self.key, self.cells[start:stop], self.ends[start:stop], self._owner, terrain)
+
+    def grid(self, i: int, diag: bool = False) -> Grid:
+        """Próba i jako Grid (nowy obiekt – wolno go modyfikować)."""
+        np = _np()
+        a = self.cells[i]
+        g = Grid(self.key.cols, self.key.rows, diag=diag)
+        ys, xs = np.nonzero(a == WALL_BYTE)
+        g.walls = set(zip(xs.tolist(), ys.tolist()))
+        ys, xs = np.nonzero((a > 0) & (a < WALL_BYTE))
+        g.weighted = dict(zip(zip(xs.tolist(), ys.tolist()), a[ys, xs].tolist()))
+        if self.terrain is not None:
+            t = self.terrain[i]
+            ys, xs = np.nonzero(t)
+            g.terrain = dict(zip(zip(xs.tolist(), ys.tolist()), t[ys, xs].tolist()))
+        sx, sy, gx, gy = self.ends[i].tolist()
+        g.start, g.goal = (sx, sy), (gx, gy)
+        return g
+
+    def grids(self, diag: bool = False) -> Iterator[Grid]:
+        for i in range(len(self)):
+            yield self.grid(i, diag)
+
+    @property
+    def nbytes(self) -> int:
+        extra = self.terrain.nbytes if self.terrain is not None else 0
+        return int(self.cells.nbytes + self.ends.nbytes + extra)
+
+
+def generate(key: CorpusKey, trials: int) -> Series:
+    """Generuje serię tak jak dotychczas run_bench: start/cel, ziarno ścian, ziarno wag
+    (i ziarno terenów) – kolejno z jednego generatora, więc próba i zależy od wszystkich
+    wcześniejszych."""
+    np = _np()
+    rng = random.Random(key.seed)
+    cells = np.zeros((trials, key.rows, key.cols), dtype=np.uint8)
+    ends = np.zeros((trials, 4), dtype=np.int32)
+    terrain = np.zeros_like(cells) if key.terrain_mix else None
+    for i in range(trials):
+        g = Grid(key.cols, key.rows)
+        s = (rng.randrange(key.cols), rng.randrange(key.rows))
+        t = (rng.randrange(key.cols), rng.randrange(key.rows))
+        while t == s:
+            t = (rng.randrange(key.cols), rng.randrange(key.rows))
+        g.start, g.goal = s, t
+        g.randomize_walls(key.wall_density, seed=rng.randrange(1_000_000))
+        if key.weight_density > 0:
+            g.randomize_weights(key.weight_density, key.weight_value, seed=rng.randrange(1_000_000))
+        if key.terrain_mix:
+            g.randomize_terrain(key.terrain_mix, seed=rng.randrange(1_000_000))
+            for (x, y), tid in g.terrain.items():
+                terrain[i, y, x] = tid
+        _encode(g, cells[i])
+        ends[i] = (*s, *t)
+    return Series(key, cells, ends, terrain=terrain)
+
+
+def _encode(g: Grid, out) -> None:
+    for (x, y), w in g.weighted.items():
+        out[y, x] = min(254, w)
+    if g.walls:
+        xs, ys = zip(*g.walls)
+        out[list(ys), list(xs)] = WALL_BYTE
+
+
+@dataclass(frozen=True)
+class SharedSeries:
+    """Serializowalny uchwyt serii w pamięci współdzielonej (przekazywany do procesów)."""
+    key: CorpusKey
+    shm_name: str
+    stored: int   # liczba prób w bloku (układ tablic)
+    trials: int   # liczba prób udostępnianych przez uchwyt (prefiks)
+
+    def attach(self) -> Series:
+        np = _np()
+        # procesy z puli dzielą resource_tracker właściciela, więc podłączenie nie zmienia
+        # odpowiedzialności za blok – usuwa go GridCorpus.close() w procesie głównym
+        shm = shared_memory.SharedMemory(name=self.shm_name)
+        return _view(self.key, self.stored, shm, np).slice(0, self.trials)
+
+
+def _view(key: CorpusKey, trials: int, shm: shared_memory.SharedMemory, np) -> Series:
+    ends = np.ndarray((trials, 4), dtype=np.int32, buffer=shm.buf)
+    shape = (trials, key.rows, key.cols)
+    cells = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=ends.nbytes)
+    terrain = None
+    if key.terrain_mix:
+        terrain = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=ends.nbytes + cells.nbytes)
+    return Series(key, cells, ends, owner=shm, terrain=terrain)
+
+
+@dataclass
+class CorpusStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    generated: int = 0
+
+
+class GridCorpus:
+    """Pamięć podręczna serii prób: pamięć procesu → dysk (root) → generowanie.
+    `root=None` wyłącza zapis na dysku."""
+
+    def __init__(self, root: Optional[Path] = CORPUS_DIR):
+        self.root = Path(root) if root is not None else None
+        self._series: Dict[CorpusKey, Series] = {}
+        self._shared: Dict[CorpusKey, SharedSeries] = {}
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.stats = CorpusStats()
+
+    def _path(self, key: CorpusKey) -> Optional[Path]:
+        return self.root / f"{key.name}.npz" if self.root is not None else None
+
+    def series(self, key: CorpusKey, trials: int) -> Series:
+        """Pierwsze `trials` prób serii (dłuższa seria zawiera krótszą jako prefiks)."""
+        np = _np()
+        s = self._series.get(key)
+        if s is not None and len(s) >= trials:
+            self.stats.memory_hits += 1
+            return s if len(s) == trials else s.slice(0, trials)
+        path = self._path(key)
+        if path is not None and path.exists():
+            with np.load(path) as data:
+                if len(data["ends"]) >= trials:
+                    terrain = data["terrain"] if "terrain" in data.files else None
+                    s = Series(key, data["cells"], data["ends"], terrain=terrain)
+                    self.stats.disk_hits += 1
+        if s is None or len(s) < trials:
+            s = generate(key, trials)
+            self.stats.generated += 1
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(path.stem + ".tmp.npz")
+                arrays = {"cells": s.cells, "ends": s.ends}
+                if s.terrain is not None:
+                    arrays["terrain"] = s.terrain
+                np.savez(tmp, **arrays)
+                tmp.replace(path)
+        self._series[key] = s
+        return s if len(s) == trials else s.slice(0, trials)
+
+    def share(self, key: CorpusKey, trials: int) -> SharedSeries:
+        """Umieszcza serię w pamięci współdzielonej (raz na klucz) i zwraca uchwyt."""
+        handle = self._shared.get(key)
+        if handle is not None and handle.stored >= trials:
+            return SharedSeries(key, handle.shm_name, handle.stored, trials)
+        np = _np()
+        s = self.series(key, trials)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, s.nbytes))
+        self._blocks.append(shm)
+        view = _view(key, trials, shm, np)
+        view.ends[:] = s.ends
+        view.cells[:] = s.cells
+        if s.terrain is not None:
+            view.terrain[:] = s.terrain
+        handle = SharedSeries(key, shm.name, trials, trials)
+        self._shared[key] = handle
+        return handle
+
+    def close(self) -> None:
+        """Zwalnia bloki pamięci współdzielonej (procesy robocze muszą być już zakończone)."""
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
+        self._shared.clear()
+
+    def __enter__(self) -> "GridCorpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,87 @@
+"""Tabela na żywo w terminalu dla run_bench: statystyki strumieniowe po każdej próbie.
+
+    dash = LiveDashboard(total=cfg.trials, stop_rel_ci=0.02)
+    results = run_bench(cfg, on_trial=dash.on_trial, should_stop=dash.should_stop)
+    dash.close()
+
+W terminalu tabela jest przerysowywana w miejscu (sekwencje ANSI), a poza nim (np. w pliku
+logu) drukowana co `every_s` sekund. Kolumna „±CI” to względna połowa szerokości 95%
+przedziału ufności średniej rozwinięć – gdy wszystkie spadną poniżej `stop_rel_ci`
+(po co najmniej `min_trials` próbach), `should_stop()` kończy serię przed czasem.
+"""
+from __future__ import annotations
+import sys
+import time
+from typing import Any, Dict, Optional, TextIO
+
+from app.benchmark.streaming import LiveAggregator
+
+
+class LiveDashboard:
+    def __init__(self, total: int, stop_rel_ci: Optional[float] = None, min_trials: int = 10,
+                 every_s: float = 0.25, out: TextIO = sys.stdout, title: str = ""):
+        self.total = total
+        self.stop_rel_ci = stop_rel_ci
+        self.min_trials = min_trials
+        self.every_s = every_s
+        self.out = out
+        self.title = title
+        self.agg = LiveAggregator()
+        self.stopped_early = False
+        self._tty = hasattr(out, "isatty") and out.isatty()
+        self._drawn = 0
+        self._last = 0.0
+        self._shown = -1
+        self._t0 = time.perf_counter()
+
+    def on_trial(self, i: int, rows: Dict[str, Dict[str, Any]]) -> None:
+        self.agg.update(rows)
+        now = time.perf_counter()
+        if now - self._last >= self.every_s or self.agg.trials == self.total:
+            self._last = now
+            self.draw()
+
+    def should_stop(self) -> bool:
+        if self.stop_rel_ci is None or self.stopped_early:
+            return self.stopped_early
+        if self.agg.converged(self.stop_rel_ci, self.min_trials, columns=("expanded",)):
+            self.stopped_early = True
+            self.draw()
+            print(f"Zbieżność: ±CI rozwinięć <= {self.stop_rel_ci:.1%} po {self.agg.trials} próbach.",
+                  file=self.out)
+            self._drawn = 0
+        return self.stopped_early
+
+    def lines(self) -> list:
+        agg = self.agg
+        head = (f"{self.title} próby {agg.trials}/{self.total}, "
+                f"{time.perf_counter() - self._t0:.1f} s").strip()
+        out = [head,
+               f"  {'algorytm':16s} {'n':>4s} {'rozw. śr.':>10s} {'±CI':>7s} {'mediana':>9s} "
+               f"{'p90':>9s} {'czas med. [ms]':>15s} {'koszt śr.':>10s}"]
+        for algo in agg.series:
+            e = agg.stats(algo, "expanded")
+            t = agg.stats(algo, "time_s")
+            c = agg.stats(algo, "total_cost")
+            ci = agg.rel_ci(algo, "expanded")
+            ci_s = f"{ci:6.1%}" if ci < 10 else "     –"
+            out.append(f"  {algo:16s} {e['n']:4d} {e['mean']:10.1f} {ci_s:>7s} {e['median']:9.1f} "
+                       f"{e['p90']:9.1f} {1000 * t['median']:15.3f} {c['mean']:10.2f}")
+        return out
+
+    def draw(self) -> None:
+        lines = self.lines()
+        if self._tty and self._drawn:
+            # kursor na początek poprzedniej tabeli i wyczyszczenie do końca ekranu
+            self.out.write(f"\x1b[{self._drawn}F\x1b[J")
+        self.out.write("\n".join(lines) + "\n")
+        self.out.flush()
+        self._drawn = len(lines) if self._tty else 0
+        self._shown = self.agg.trials
+
+    def close(self) -> None:
+        """Dorysowuje tabelę, jeśli od ostatniego rysowania doszły próby; kolejne wydruki
+        nie będą już nadpisywane."""
+        if self._shown != self.agg.trials:
+            self.draw()
+        self._drawn = 0
@@ -1,72 +1,59 @@
 from __future__ import annotations
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-from typing import Dict, List, Any
-import statistics as stats
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
-import numpy as np
-
-
-def _aggregate(series: List[float]) -> Dict[str, float]:
-    """Oblicza szczegółowe statystyki dla serii danych."""
-    if not series:
-        return {
-            "mean": float("nan"),
-            "median": float("nan"),
-            "std": float("nan"),
-            "min": float("nan"),
-            "max": float("nan"),
-            "p25": float("nan"),
-            "p75": float("nan"),
-            "p90": float("nan")
-        }
-
-    series_sorted = sorted(series)
-    n = len(series_sorted)
-
-    # Oblicz statystyki
-    mean_val = sum(series_sorted) / n
-    median_val = series_sorted[n // 2] if n % 2 == 1 else 0.5 * (series_sorted[n // 2 - 1] + series_sorted[n // 2])
-
-    # Odchylenie standardowe
-    if n > 1:
-        variance = sum((x - mean_val) ** 2 for x in series_sorted) / (n - 1)
-        std_val = variance ** 0.5
-    else:
-        std_val = 0.0
-
-    return {
-        "mean": mean_val,
-        "median": median_val,
-        "std": std_val,
-        "min": series_sorted[0],
-        "max": series_sorted[-1],
-        "p25": series_sorted[int(0.25 * (n - 1))],
-        "p75": series_sorted[int(0.75 * (n - 1))],
-        "p90": series_sorted[int(0.9 * (n - 1))],
-        "n": n
-    }
-
-
-def _save_single_bar(metric: str, data: Dict[str, List[float]], out_dir: Path) -> Path:
-    """Tworzy szczegółowy wykres słupkowy z error bars i statystykami."""
-    fig, ax = plt.subplots(figsize=(10, 6))
-
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+from app.benchmark.stats import columns, describe, describe_groups
+
+# Zmiana wyglądu wykresów → podbij wersję, aby unieważnić cache
+_PLOT_VERSION = 1
+_CACHE_FILE = ".plot_cache.json"
+COLORS = {'BFS': '#3498db', 'Dijkstra': '#e74c3c', 'A*': '#2ecc71'}
+
+
+def _pyplot():
+    """Importuje matplotlib (backend Agg) dopiero przy pierwszym rysowaniu –
+    sam import modułu plots nie kosztuje czasu startu matplotlib/numpy."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+# etykieta metryki na wykresach -> kolumna w wynikach run_bench
+METRIC_COLUMNS = {
+    "Czas [s]": "time_s",
+    "Rozwinięcia [#]": "expanded",
+    "Odwiedzone [#]": "visited",
+    "Szczyt frontu [#]": "frontier_peak",
+    "Długość ścieżki [kroki]": "path_len",
+    "Koszt całkowity": "total_cost",
+}
+
+
+def _file_stem(metric: str) -> str:
+    return metric.replace(' ', '_').lower()
+
+
+def _draw_bar(ax, metric: str, data: Dict[str, List[float]],
+              aggs: Optional[Dict[str, Dict[str, float]]] = None, compact: bool = False) -> bool:
+    """Rysuje wykres słupkowy (średnia ± std, mediana) na podanej osi. Zwraca False gdy brak danych.
+    `aggs` – gotowe statystyki per algorytm (metric_stats); bez nich liczone z `data`."""
+    import numpy as np
+    if aggs is None:
+        aggs = describe_groups(data)
     labels = []
     means = []
     stds = []
     medians = []
     n_samples = []
 
-    # Kolory dla każdego algorytmu
-    colors = {'BFS': '#3498db', 'Dijkstra': '#e74c3c', 'A*': '#2ecc71'}
-
     for algo, values_list in data.items():
         if not values_list:
             continue
-        agg = _aggregate(values_list)
+        agg = aggs[algo]
         labels.append(algo)
         means.append(agg["mean"])
         stds.append(agg["std"])
@@ -74,12 +61,10 @@ def _save_single_bar(metric: str, data: Dict[str, List[float]], out_dir: Path) -
         n_samples.append(agg["n"])
 
     if not labels:
-        # Brak danych do wykresu
         ax.text(0.5, 0.5, 'Brak danych', ha='center', va='center', transform=ax.transAxes)
-        out = out_dir / f"{metric.replace(' ', '_').lower()}.png"
-        fig.savefig(out, bbox_inches="tight", dpi=160)
-        plt.close(fig)
-        return out
+        if compact:
+            ax.set_title(metric, fontsize=11, fontweight='bold')
+        return False
 
     x_pos = np.arange(len(labels))
 
@@ -87,19 +72,22 @@ def _save_single_bar(metric: str, data: Dict[str, List[float]], out_dir: Path) -
     bars = ax.bar(x_pos, means,
                   yerr=stds,
                   capsize=5,
-                  color=[colors.get(lbl, '#95a5a6') for lbl in labels],
+                  color=[COLORS.get(lbl, '#95a5a6') for lbl in labels],
                   alpha=0.8,
                   edgecolor='black',
                   linewidth=1.2)
 
     # Dodaj punkty mediany
-    ax.scatter(x_pos, medians, color='red', s=100, zorder=5,
+    ax.scatter(x_pos, medians, color='red', s=60 if compact else 100, zorder=5,
                marker='D', label='Mediana', edgecolors='darkred', linewidths=1.5)
 
     # Formatowanie
-    ax.set_ylabel(metric, fontsize=12, fontweight='bold')
-    ax.set_title(f"{metric}\n(słupki: średnia ± odch. std., romby: mediana)",
-                 fontsize=13, fontweight='bold', pad=15)
+    if compact:
+        ax.set_title(metric, fontsize=11, fontweight='bold')
+    else:
+        ax.set_ylabel(metric, fontsize=12, fontweight='bold')
+        ax.set_title(f"{metric}\n(słupki: średnia ± odch. std., romby: mediana)",
+                     fontsize=13, fontweight='bold', pad=15)
     ax.set_xticks(x_pos)
     ax.set_xticklabels(labels, fontsize=11)
 
@@ -114,20 +102,70 @@ def _save_single_bar(metric: str, data: Dict[str, List[float]], out_dir: Path) -
                 f'n={n}',
                 ha='center', va='bottom', fontsize=9, color='dimgray')
 
-    # Legenda
-    ax.legend(loc='upper right', fontsize=10)
+    if not compact:
+        ax.legend(loc='upper right', fontsize=10)
+    return True
+
+
+def _save_single_bar(metric: str, data: Dict[str, List[float]], out_dir: Path,
+                     aggs: Optional[Dict[str, Dict[str, float]]] = None) -> Path:
+    """Tworzy szczegółowy wykres słupkowy z error bars i statystykami."""
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    out = out_dir / f"{_file_stem(metric)}.png"
+
+    if not _draw_bar(ax, metric, data, aggs):
+        # Brak danych do wykresu
+        fig.savefig(out, bbox_inches="tight", dpi=160)
+        plt.close(fig)
+        return out
 
     # Dostosuj marginesy
     plt.tight_layout()
 
-    out = out_dir / f"{metric.replace(' ', '_').lower()}.png"
     fig.savefig(out, bbox_inches="tight", dpi=180)
     plt.close(fig)
     return out
 
 
-def _save_comparison_table(data: Dict[str, List[float]], out_dir: Path, metric_name: str) -> Path:
+def _save_box_plot(metric: str, data: Dict[str, List[float]], out_dir: Path) -> Path:
+    """Tworzy wykres pudełkowy rozkładu metryki dla każdego algorytmu."""
+    plt = _pyplot()
+    import numpy as np
+    fig, ax = plt.subplots(figsize=(10, 6))
+    labels = [algo for algo, v in data.items() if v]
+    out = out_dir / f"{_file_stem(metric)}_box.png"
+
+    if not labels:
+        ax.text(0.5, 0.5, 'Brak danych', ha='center', va='center', transform=ax.transAxes)
+        fig.savefig(out, bbox_inches="tight", dpi=160)
+        plt.close(fig)
+        return out
+
+    bp = ax.boxplot([data[lbl] for lbl in labels], patch_artist=True, showmeans=True)
+    for patch, lbl in zip(bp['boxes'], labels):
+        patch.set_facecolor(COLORS.get(lbl, '#95a5a6'))
+        patch.set_alpha(0.6)
+    ax.set_xticks(np.arange(1, len(labels) + 1))
+    ax.set_xticklabels(labels, fontsize=11)
+    ax.set_ylabel(metric, fontsize=12, fontweight='bold')
+    ax.set_title(f"{metric}\n(rozkład wyników, trójkąt: średnia)",
+                 fontsize=13, fontweight='bold', pad=15)
+    ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.7)
+    ax.set_axisbelow(True)
+    plt.tight_layout()
+
+    fig.savefig(out, bbox_inches="tight", dpi=160)
+    plt.close(fig)
+    return out
+
+
+def _save_comparison_table(data: Dict[str, List[float]], out_dir: Path, metric_name: str,
+                           aggs: Optional[Dict[str, Dict[str, float]]] = None) -> Path:
     """Tworzy tabelę ze szczegółowymi statystykami."""
+    plt = _pyplot()
+    if aggs is None:
+        aggs = describe_groups(data)
     fig, ax = plt.subplots(figsize=(12, 3 + len(data) * 0.5))
     ax.axis('tight')
     ax.axis('off')
@@ -139,7 +177,7 @@ def _save_comparison_table(data: Dict[str, List[float]], out_dir: Path, metric_n
     for algo, values_list in data.items():
         if not values_list:
             continue
-        agg = _aggregate(values_list)
+        agg = aggs[algo]
         row = [
             algo,
             f"{agg['mean']:.4f}",
@@ -178,40 +216,245 @@ def _save_comparison_table(data: Dict[str, List[float]], out_dir: Path, metric_n
     plt.title(f"Szczegółowe statystyki: {metric_name}",
               fontsize=13, fontweight='bold', pad=20)
 
-    out = out_dir / f"{metric_name.replace(' ', '_').lower()}_tabela.png"
+    out = out_dir / f"{_file_stem(metric_name)}_tabela.png"
     fig.savefig(out, bbox_inches="tight", dpi=180)
     plt.close(fig)
     return out
 
 
-def save_all_plots(results: Dict[str, List[Dict[str, Any]]], out_dir: str) -> Dict[str, str]:
-    """Generuje wszystkie wykresy i tabele ze statystykami."""
+def _save_summary(metrics: Dict[str, Dict[str, List[float]]], out_dir: Path, fmt: str,
+                  aggs: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None) -> Path:
+    """Jeden rysunek wielopanelowy ze wszystkimi metrykami (fmt: png/svg/pdf)."""
+    plt = _pyplot()
+    n = len(metrics)
+    ncols = 3
+    nrows = (n + ncols - 1) // ncols
+    fig, axes = plt.subplots(nrows, ncols, figsize=(6 * ncols, 4.5 * nrows), squeeze=False)
+    for ax, (metric, data) in zip(axes.flat, metrics.items()):
+        _draw_bar(ax, metric, data, aggs.get(metric) if aggs else None, compact=True)
+    for ax in list(axes.flat)[n:]:
+        ax.axis('off')
+    fig.suptitle("Podsumowanie (słupki: średnia ± odch. std., romby: mediana)",
+                 fontsize=14, fontweight='bold')
+    fig.tight_layout()
+
+    out = out_dir / f"podsumowanie.{fmt}"
+    fig.savefig(out, bbox_inches="tight", dpi=160)
+    plt.close(fig)
+    return out
+
+
+_RENDERERS = {
+    "wykres": lambda metric, data, aggs, out_dir: _save_single_bar(metric, data, out_dir, aggs),
+    "pudełkowy": lambda metric, data, aggs, out_dir: _save_box_plot(metric, data, out_dir),
+    "tabela": lambda metric, data, aggs, out_dir: _save_comparison_table(data, out_dir, metric, aggs),
+}
+
+
+def _render_job(kind: str, metric: str, data: Any, aggs: Any, out_dir: str) -> str:
+    """Renderuje pojedynczy rysunek – funkcja modułowa, aby dało się ją wysłać do procesu.
+    `aggs` to statystyki policzone raz w procesie głównym (nie wchodzą do skrótu cache –
+    wynikają z `data`)."""
+    if kind == "podsumowanie":
+        return str(_save_summary(data, Path(out_dir), metric, aggs))
+    return str(_RENDERERS[kind](metric, data, aggs, Path(out_dir)))
+
+
+def _job_hash(kind: str, metric: str, data: Any) -> str:
+    payload = json.dumps([_PLOT_VERSION, kind, metric, data], sort_keys=True, default=float)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _load_cache(out_path: Path) -> Dict[str, str]:
+    try:
+        return json.loads((out_path / _CACHE_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def collect_metrics(results: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, List[float]]]:
+    """Wyciąga serie wartości metryk (tylko udane próby) dla każdego algorytmu."""
+    return {
+        metric: {algo: [r[col] for r in res if r.get("found")] for algo, res in results.items()}
+        for metric, col in METRIC_COLUMNS.items()
+    }
+
+
+def metric_stats(results: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Statystyki wszystkich metryk: {metryka: {algorytm: statystyki}}.
+    Dla każdego algorytmu jedna tabela kolumnowa i jedno sortowanie (stats.describe)."""
+    per_algo = {algo: describe(columns(res, list(METRIC_COLUMNS.values())))
+                for algo, res in results.items()}
+    return {metric: {algo: per_algo[algo][col] for algo in results}
+            for metric, col in METRIC_COLUMNS.items()}
+
+
+def save_all_plots(results: Dict[str, List[Dict[str, Any]]], out_dir: str,
+                   mode: str = "separate", summary_format: str = "svg",
+                   workers: Optional[int] = None, use_cache: bool = True) -> Dict[str, str]:
+    """Generuje wszystkie wykresy i tabele ze statystykami.
+
+    mode: "separate" – osobne PNG (słupki, pudełka, tabele), "summary" – jeden rysunek
+    wielopanelowy w formacie summary_format (png/svg/pdf), "both" – jedno i drugie.
+    Rysunki renderowane są równolegle w puli procesów (workers=1 → sekwencyjnie);
+    rysunek, którego dane wejściowe się nie zmieniły (skrót treści), nie jest generowany ponownie.
+    """
+    if mode not in ("separate", "summary", "both"):
+        raise ValueError(f"Nieznany tryb wykresów: {mode}")
     out_path = Path(out_dir)
     out_path.mkdir(parents=True, exist_ok=True)
 
-    metrics = {
-        "Czas [s]": {algo: [r["time_s"] for r in res if r.get("found")]
-                     for algo, res in results.items()},
-        "Rozwinięcia [#]": {algo: [r["expanded"] for r in res if r.get("found")]
-                            for algo, res in results.items()},
-        "Odwiedzone [#]": {algo: [r["visited"] for r in res if r.get("found")]
-                           for algo, res in results.items()},
-        "Szczyt frontu [#]": {algo: [r["frontier_peak"] for r in res if r.get("found")]
-                              for algo, res in results.items()},
-        "Długość ścieżki [kroki]": {algo: [r["path_len"] for r in res if r.get("found")]
-                                    for algo, res in results.items()},
-        "Koszt całkowity": {algo: [r["total_cost"] for r in res if r.get("found")]
-                            for algo, res in results.items()},
-    }
+    metrics = collect_metrics(results)
+    aggs = metric_stats(results)
+
+    # (klucz wyniku, rodzaj, metryka, dane, statystyki)
+    jobs: List[Tuple[str, str, str, Any, Any]] = []
+    if mode in ("separate", "both"):
+        for kind in ("wykres", "pudełkowy", "tabela"):
+            for metric, data in metrics.items():
+                jobs.append((f"{metric} ({kind})", kind, metric, data, aggs[metric]))
+    if mode in ("summary", "both"):
+        jobs.append(("Podsumowanie", "podsumowanie", summary_format, metrics, aggs))
+
+    cache = _load_cache(out_path) if use_cache else {}
+    files: Dict[str, str] = {}
+    pending: List[Tuple[str, str, str, Any, Any, str]] = []
+    for key, kind, metric, data, st in jobs:
+        h = _job_hash(kind, metric, data)
+        cached = cache.get(key)
+        if cached and cached.get("hash") == h and Path(cached.get("file", "")).is_file():
+            files[key] = cached["file"]
+        else:
+            pending.append((key, kind, metric, data, st, h))
+
+    if workers is None:
+        workers = min(len(pending), os.cpu_count() or 1)
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_render_job, kind, metric, data, st, str(out_path))
+                       for _, kind, metric, data, st, _ in pending]
+            rendered = [f.result() for f in futures]
+    else:
+        rendered = [_render_job(kind, metric, data, st, str(out_path))
+                    for _, kind, metric, data, st, _ in pending]
+
+    for (key, _, _, _, _, h), path in zip(pending, rendered):
+        files[key] = path
+        cache[key] = {"hash": h, "file": path}
+
+    if use_cache:
+        (out_path / _CACHE_FILE).write_text(json.dumps(cache, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    # zachowaj kolejność zadań
+    return {key: files[key] for key, *_ in jobs}
+
+
+def save_epsilon_tradeoff(rows: List[Dict[str, Any]], out_dir: str) -> str:
+    """Wykres kompromisu epsilon/czas dla ARA* (wiersze z runner.run_ara_bench)."""
+    plt = _pyplot()
+    import numpy as np
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5.5))
+    out = out_path / "ara_epsilon_czas.png"
 
-    files = {}
+    if not rows:
+        ax1.text(0.5, 0.5, 'Brak danych', ha='center', va='center', transform=ax1.transAxes)
+        fig.savefig(out, bbox_inches="tight", dpi=160)
+        plt.close(fig)
+        return str(out)
+
+    eps = np.array([r["epsilon"] for r in rows])
+    t_ms = np.array([r["time_s"] for r in rows]) * 1000.0
+    ratio = np.array([r["cost_ratio"] for r in rows])
+    bound = np.array([r["bound"] for r in rows])
+    ref_ms = float(np.median([r["astar_time_s"] for r in rows])) * 1000.0
+
+    # Lewy: czas do rozwiązania vs jakość, kolor = epsilon
+    sc = ax1.scatter(t_ms, ratio, c=eps, cmap='viridis', s=25, alpha=0.8, edgecolors='none')
+    ax1.axvline(ref_ms, linestyle='--', color='gray', linewidth=1, label=f'A* optymalne (mediana {ref_ms:.2f} ms)')
+    ax1.axhline(1.0, linestyle=':', color='black', linewidth=0.8)
+    fig.colorbar(sc, ax=ax1, label='epsilon')
+    ax1.set_xlabel('Czas do rozwiązania [ms]', fontsize=11)
+    ax1.set_ylabel('Koszt / koszt optymalny', fontsize=11)
+    ax1.set_title('ARA*: jakość rozwiązania w czasie', fontsize=12, fontweight='bold')
+    ax1.grid(alpha=0.3, linestyle='--', linewidth=0.7)
+    ax1.legend(loc='upper right', fontsize=9)
+
+    # Prawy: epsilon vs gwarantowane ograniczenie i faktyczny stosunek kosztów
+    ax2.scatter(eps, bound, marker='^', color='#e74c3c', alpha=0.6, label='ograniczenie (bound)')
+    ax2.scatter(eps, ratio, marker='o', color='#2ecc71', alpha=0.6, label='faktyczny koszt / optymalny')
+    lim = [1.0, float(eps.max())]
+    ax2.plot(lim, lim, linestyle='--', color='gray', linewidth=1, label='y = epsilon')
+    ax2.set_xlabel('epsilon', fontsize=11)
+    ax2.set_ylabel('Suboptymalność', fontsize=11)
+    ax2.set_title('ARA*: epsilon a suboptymalność', fontsize=12, fontweight='bold')
+    ax2.grid(alpha=0.3, linestyle='--', linewidth=0.7)
+    ax2.legend(loc='upper left', fontsize=9)
+
+    fig.tight_layout()
+    fig.savefig(out, bbox_inches="tight", dpi=160)
+    plt.close(fig)
+    return str(out)
+
+
+def tie_break_summary(results: Dict[str, List[Dict[str, Any]]],
+                      baseline: str = "A*") -> Dict[str, Dict[str, float]]:
+    """Redukcja rozwinięć (średnia) i czasu (mediana) wariantów "A* (reguła)" względem A*
+    z domyślnym rozstrzyganiem remisów, w procentach (dodatnie = mniej), oraz liczba
+    prób z nieoptymalnym kosztem."""
+    keys = ["expanded", "time_s"]
+    base = describe(columns(results.get(baseline, []), keys))
+    out: Dict[str, Dict[str, float]] = {}
+    for algo, rows in results.items():
+        if not algo.startswith(f"{baseline} ("):
+            continue
+        st = describe(columns(rows, keys))
+        out[algo[len(baseline) + 2:-1]] = {
+            "expanded_mean": st["expanded"]["mean"],
+            "time_median_s": st["time_s"]["median"],
+            "expanded_reduction_pct": 100.0 * (1.0 - st["expanded"]["mean"] / base["expanded"]["mean"]),
+            "time_reduction_pct": 100.0 * (1.0 - st["time_s"]["median"] / base["time_s"]["median"]),
+            "non_optimal": sum(1 for r in rows if "error" not in r and not r.get("optimal", True)),
+        }
+    return out
 
-    # Generuj wykresy słupkowe
-    for metric, data in metrics.items():
-        files[f"{metric} (wykres)"] = str(_save_single_bar(metric, data, out_path))
 
-    # Generuj tabele ze statystykami
-    for metric, data in metrics.items():
-        files[f"{metric} (tabela)"] = str(_save_comparison_table(data, out_path, metric))
+def save_tie_break_report(results: Dict[str, List[Dict[str, Any]]], out_dir: str,
+                          title: str = "") -> Optional[str]:
+    """Wykres redukcji rozwinięć i czasu dla reguł remisów A* (None, gdy brak wariantów)."""
+    summary = tie_break_summary(results)
+    if not summary:
+        return None
+    plt = _pyplot()
+    import numpy as np
+    out = Path(out_dir) / "remisy_a_star.png"
+    labels = list(summary)
+    x = np.arange(len(labels))
+    exp_red = [summary[p]["expanded_reduction_pct"] for p in labels]
+    time_red = [summary[p]["time_reduction_pct"] for p in labels]
 
-    return files
\ No newline at end of file
+    fig, ax = plt.subplots(figsize=(10, 6))
+    w = 0.38
+    b1 = ax.bar(x - w / 2, exp_red, w, color='#2ecc71', edgecolor='black', label='rozwinięcia (średnia)')
+    b2 = ax.bar(x + w / 2, time_red, w, color='#3498db', edgecolor='black', label='czas (mediana)')
+    for bars in (b1, b2):
+        for bar in bars:
+            v = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width() / 2, v, f"{v:+.1f}%",
+                    ha='center', va='bottom' if v >= 0 else 'top', fontsize=9)
+    for i, p in enumerate(labels):
+        if summary[p]["non_optimal"]:
+            ax.text(x[i], 0, "koszt!", ha='center', va='top', color='red', fontweight='bold')
+    ax.axhline(0.0, color='black', linewidth=0.8)
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, fontsize=11)
+    ax.set_ylabel('Redukcja względem A* (coord) [%]', fontsize=12, fontweight='bold')
+    ax.set_title(f"Reguły rozstrzygania remisów A* {title}".strip(), fontsize=13, fontweight='bold')
+    ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.7)
+    ax.set_axisbelow(True)
+    ax.legend(fontsize=10)
+    fig.tight_layout()
+    fig.savefig(out, bbox_inches="tight", dpi=160)
+    plt.close(fig)
+    return str(out)
@@ -0,0 +1,227 @@
+"""Profilowanie benchmarku osobno dla każdego algorytmu.
+
+`AlgoProfiler(mode)` przekazany do run_bench(..., profiler=...) obejmuje każde wywołanie
+algorytmu (Dijkstra, A*, BFS, warianty) profilerem przypisanym do jego nazwy:
+
+- "cprofile" – deterministyczny cProfile; `save()` zapisuje `<algorytm>.prof` (pstats,
+  np. snakeviz / `python -m pstats`) i `<algorytm>.collapsed` – stosy odtworzone z grafu
+  wywołań (czas własny funkcji rozdzielany proporcjonalnie do czasu krawędzi wywołań),
+- "sample" – próbkowanie stosu sygnałem SIGPROF co `interval` s czasu CPU (niski narzut,
+  tylko Unix, wątek główny); `<algorytm>.collapsed` zawiera rzeczywiste stosy.
+
+Pliki .collapsed mają format „ramka;ramka;... liczba” (Brendan Gregg), gotowy dla
+flamegraph.pl, speedscope czy inferno; `all.collapsed` łączy algorytmy pod wspólnym
+korzeniem. `hotspots()` / `report()` podają funkcje o największym czasie własnym
+(np. Grid.neighbors, Grid.cost, heapq.heappop). Nazwy funkcji są kwalifikowane klasą
+(cProfile zna tylko nazwę, więc klasa odczytywana jest z AST pliku źródłowego).
+"""
+from __future__ import annotations
+import ast
+import cProfile
+import pstats
+import re
+import signal
+import sys
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MODES = ("cprofile", "sample")
+_MAX_DEPTH = 64
+_MIN_US = 0.1   # pomijane gałęzie stosów krótsze niż 0,1 µs
+
+
+@lru_cache(maxsize=None)
+def _qualnames(filename: str) -> Dict[Tuple[int, str], str]:
+    """(linia definicji, nazwa) -> nazwa kwalifikowana dla funkcji w pliku źródłowym."""
+    try:
+        tree = ast.parse(Path(filename).read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, ValueError):
+        return {}
+    out: Dict[Tuple[int, str], str] = {}
+
+    def walk(node: ast.AST, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                q = prefix + child.name
+                # cProfile podaje linię `def`, a przy dekoratorach – linię pierwszego dekoratora
+                for line in {child.lineno, *(d.lineno for d in child.decorator_list)}:
+                    out[(line, child.name)] = q
+                walk(child, q + ".")
+            elif isinstance(child, ast.ClassDef):
+                walk(child, prefix + child.name + ".")
+            else:
+                walk(child, prefix)
+    walk(tree, "")
+    return out
+
+
+_BUILTIN = re.compile(r"<built-in method (?:(\w+)\.)?(\w+)>")
+_METHOD = re.compile(r"<method '(\w+)' of '([\w.]+)' objects>")
+
+
+def label(func: Tuple[str, int, str]) -> str:
+    """Czytelna nazwa funkcji z klucza pstats (plik, linia, nazwa)."""
+    filename, line, name = func
+    if filename == "~":
+        m = _BUILTIN.fullmatch(name)
+        if m:
+            mod = (m.group(1) or "").lstrip("_")
+            return f"{mod}.{m.group(2)}" if mod and mod != "builtins" else m.group(2)
+        m = _METHOD.fullmatch(name)
+        if m:
+            return f"{m.group(2)}.{m.group(1)}"
+        return name
+    return _qualnames(filename).get((line, name), name)
+
+
+def _slug(name: str) -> str:
+    name = name.replace("A*", "astar")
+    return re.sub(r"[^0-9A-Za-z]+", "_", name).strip("_").lower() or "algo"
+
+
+class AlgoProfiler:
+    def __init__(self, mode: str = "cprofile", interval: float = 0.001):
+        if mode not in MODES:
+            raise ValueError(f"Nieznany tryb profilowania: {mode}")
+        if mode == "sample" and not hasattr(signal, "setitimer"):
+            raise ValueError("Profiler próbkujący wymaga signal.setitimer (Unix)")
+        self.mode = mode
+        self.interval = interval
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.samples: Dict[str, Counter] = {}
+        self.calls: Counter = Counter()
+        self._current: Optional[str] = None
+        self._entry = None   # ramka AlgoProfiler.call – granica ucinania stosów próbek
+
+    def call(self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Wywołuje fn(*args, **kwargs) pod profilerem algorytmu `name`."""
+        self.calls[name] += 1
+        if self.mode == "cprofile":
+            prof = self.profiles.setdefault(name, cProfile.Profile())
+            prof.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof.disable()
+        self.samples.setdefault(name, Counter())
+        self._current, self._entry = name, sys._getframe()
+        old = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, old)
+            self._current = self._entry = None
+
+    def _sample(self, signum: int, frame: Any) -> None:
+        if self._current is None:
+            return
+        stack = []
+        while frame is not None and frame is not self._entry:
+            code = frame.f_code
+            stack.append(getattr(code, "co_qualname", code.co_name))
+            frame = frame.f_back
+        if stack:   # próbka z samego AlgoProfiler.call (przed/po wywołaniu algorytmu)
+            self.samples[self._current][";".join(reversed(stack))] += 1
+
+    # --- wyniki -------------------------------------------------------------------------
+
+    def stats(self, name: str) -> Optional[pstats.Stats]:
+        prof = self.profiles.get(name)
+        return pstats.Stats(prof) if prof is not None else None
+
+    def collapsed(self, name: str) -> Counter:
+        """Stosy w formacie collapsed: {„a;b;c”: waga} (próbki albo mikrosekundy)."""
+        if self.mode == "sample":
+            return self.samples.get(name, Counter())
+        st = self.stats(name)
+        return _collapse(st.stats) if st is not None else Counter()
+
+    def hotspots(self, name: str, top: int = 5) -> List[Tuple[str, float, float]]:
+        """[(funkcja, czas własny [s] lub liczba próbek, udział %)] malejąco."""
+        if self.mode == "sample":
+            own: Counter = Counter()
+            for stack, n in self.samples.get(name, Counter()).items():
+                own[stack.rsplit(";", 1)[-1]] += n
+        else:
+            st = self.stats(name)
+            own = Counter()
+            if st is not None:
+                for func, (_, _, tt, _, _) in st.stats.items():
+                    own[label(func)] += tt
+        total = sum(own.values())
+        return [(f, v, 100.0 * v / total if total else 0.0) for f, v in own.most_common(top)]
+
+    def save(self, out_dir: Path) -> List[Path]:
+        """Zapisuje <algorytm>.prof (tylko cProfile), <algorytm>.collapsed i all.collapsed."""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        combined: Counter = Counter()
+        for name in self.calls:
+            slug = _slug(name)
+            if self.mode == "cprofile":
+                path = out_dir / f"{slug}.prof"
+                self.profiles[name].dump_stats(str(path))
+                written.append(path)
+            stacks = self.collapsed(name)
+            path = out_dir / f"{slug}.collapsed"
+            _write_collapsed(path, stacks)
+            written.append(path)
+            combined.update({f"{name};{s}": n for s, n in stacks.items()})
+        path = out_dir / "all.collapsed"
+        _write_collapsed(path, combined)
+        written.append(path)
+        return written
+
+    def report(self, top: int = 5) -> str:
+        unit = "próbki" if self.mode == "sample" else "czas własny [s]"
+        lines = [f"Najgorętsze funkcje ({self.mode}, {unit}):"]
+        for name in self.calls:
+            lines.append(f"  {name} ({self.calls[name]} wywołań):")
+            for func, value, pct in self.hotspots(name, top):
+                v = f"{int(value):8d}" if self.mode == "sample" else f"{value:8.3f}"
+                lines.append(f"    {pct:5.1f}%  {v}  {func}")
+        return "\n".join(lines)
+
+
+def _write_collapsed(path: Path, stacks: Counter) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, n in sorted(stacks.items()):
+            if round(n) > 0:
+                f.write(f"{stack} {round(n)}\n")
+
+
+def _collapse(raw: Dict[Any, Any]) -> Counter:
+    """Stosy z grafu wywołań cProfile. Dla ścieżki korzeń → ... → f udział f to iloczyn
+    udziałów krawędzi (czas krawędzi / czas łączny wywoływanej funkcji); czas własny f
+    jest rozdzielany według tych udziałów. Wagi w mikrosekundach."""
+    children: Dict[Any, List[Tuple[Any, float]]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            if caller in raw:
+                children.setdefault(caller, []).append((func, edge[3]))
+    # korzenie: wywołane algorytmy (bez wpisu Profiler.disable kończącego każdy pomiar)
+    roots = [f for f, v in raw.items()
+             if not any(c in raw for c in v[4]) and "_lsprof" not in f[2]]
+    out: Counter = Counter()
+
+    def emit(func: Any, path: Tuple[str, ...], on_path: frozenset, share: float) -> None:
+        tt = raw[func][2]
+        out[";".join(path)] += tt * share * 1e6
+        if len(path) >= _MAX_DEPTH:
+            return
+        for child, edge_ct in children.get(func, ()):
+            child_ct = raw[child][3]
+            if child in on_path or child_ct <= 0:
+                continue   # rekurencja: czas już policzony wyżej na ścieżce
+            s = share * edge_ct / child_ct
+            if s * child_ct * 1e6 >= _MIN_US:
+                emit(child, path + (label(child),), on_path | {child}, s)
+
+    for root in roots:
+        emit(root, (label(root),), frozenset((root,)), 1.0)
+    return out
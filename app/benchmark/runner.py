@@ -1,13 +1,19 @@
 
 from __future__ import annotations
-import random
+import time
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Callable, Optional
-from app.algorithms.grid import Grid
+from typing import TYPE_CHECKING, List, Dict, Any, Callable, Optional, Tuple
 from app.algorithms.bfs import bfs
 from app.algorithms.dijkstra import dijkstra
 from app.algorithms.astar import astar
+from app.algorithms.ara import ara_star
+from app.algorithms.deadends import decomposition, pruned_cells
 from app.utils.heuristics import manhattan, octile, scaled
+from app.benchmark.corpus import CorpusKey, Series, generate
+from app.benchmark.stats import effective_branching_factor
+
+if TYPE_CHECKING:  # cProfile/pstats ładowane tylko z --profile
+    from app.benchmark.profiling import AlgoProfiler
 
 @dataclass
 class TrialConfig:
@@ -17,33 +23,75 @@ class TrialConfig:
     wall_density: float = 0.25
     weight_density: float = 0.0
     weight_value: int = 5
+    # udziały terenów 1..k (terrain.TERRAINS, np. terrain.MIXED); reszta pól to teren otwarty
+    terrain_mix: Tuple[float, ...] = ()
     trials: int = 30
     seed: int = 123
+    # dodatkowe warianty A* z inną regułą remisów (astar.TIE_BREAKS), np. ("high_g", "cross");
+    # wyniki pod kluczami "A* (high_g)" itd., z kolumną "optimal" (koszt = koszt Dijkstry)
+    tie_breaks: Tuple[str, ...] = ()
+    # dodatkowo Dijkstra i A* z przycinaniem ślepych zaułków (deadends): klucze
+    # "Dijkstra+prune" i "A*+prune", kolumny "optimal" i "pruned_cells"; time_s tych wierszy
+    # to samo wyszukiwanie – jednorazowa dekompozycja planszy (wspólna dla obu) jest w "prep_s"
+    prune: bool = False
+
+def _call(profiler: Optional[AlgoProfiler], name: str, fn: Callable[..., Any],
+          *args: Any, **kwargs: Any) -> Any:
+    return fn(*args, **kwargs) if profiler is None else profiler.call(name, fn, *args, **kwargs)
+
+def _trial_grids(cfg: TrialConfig, grids: Optional[Series]) -> Series:
+    if grids is None:
+        return generate(CorpusKey.from_config(cfg), cfg.trials)
+    if grids.key != CorpusKey.from_config(cfg) or len(grids) < cfg.trials:
+        raise ValueError("Seria plansz nie pasuje do konfiguracji benchmarku")
+    return grids
 
-def run_bench(cfg: TrialConfig) -> Dict[str, List[Dict[str, Any]]]:
-    rng = random.Random(cfg.seed)
+def run_bench(cfg: TrialConfig,
+              progress: Optional[Callable[[int, int], None]] = None,
+              should_stop: Optional[Callable[[], bool]] = None,
+              grids: Optional[Series] = None,
+              on_trial: Optional[Callable[[int, Dict[str, Dict[str, Any]]], None]] = None,
+              verbose: bool = True,
+              profiler: Optional[AlgoProfiler] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Uruchamia serię losowych prób. `progress(i, n)` raportuje liczbę ukończonych prób,
+    a `should_stop()` pozwala przerwać serię (zwracane są wyniki dotychczasowych prób).
+    `grids` – plansze prób z korpusu (GridCorpus.series / SharedSeries.attach); bez niego
+    seria jest generowana na miejscu (te same plansze).
+    `on_trial(i, wiersze)` dostaje po każdej próbie jej wiersze {algorytm: wiersz}
+    (pusty słownik dla próby bez ścieżki) – np. streaming.LiveAggregator / LiveDashboard;
+    wiersze nie mają jeszcze b*, liczonego wsadowo na końcu serii.
+    `verbose=False` wyłącza podsumowanie na stdout (np. dla krótkich partii prób).
+    `profiler` (profiling.AlgoProfiler) profiluje każdy algorytm osobno – czasy time_s
+    są wtedy zawyżone narzutem profilera."""
+    grids = _trial_grids(cfg, grids)
     results: Dict[str, List[Dict[str, Any]]] = {"BFS": [], "Dijkstra": [], "A*": []}
+    for policy in cfg.tie_breaks:
+        results[f"A* ({policy})"] = []
+    if cfg.prune:
+        results["Dijkstra+prune"] = []
+        results["A*+prune"] = []
 
     successful_trials = 0
     failed_trials = 0
+    stopped = False
 
     for i in range(cfg.trials):
-        g = Grid(cfg.cols, cfg.rows, diag=cfg.diag)
-        # start/goal różne i wolne
-        s = (rng.randrange(cfg.cols), rng.randrange(cfg.rows))
-        t = (rng.randrange(cfg.cols), rng.randrange(cfg.rows))
-        while t == s:
-            t = (rng.randrange(cfg.cols), rng.randrange(cfg.rows))
-        g.start, g.goal = s, t
-        g.randomize_walls(cfg.wall_density, seed=rng.randrange(1_000_000))
-        if cfg.weight_density > 0:
-            g.randomize_weights(cfg.weight_density, cfg.weight_value, seed=rng.randrange(1_000_000))
-
+        if should_stop is not None and should_stop():
+            print(f"Przerwano po {i} próbach.")
+            stopped = True
+            break
+        if progress is not None:
+            progress(i, cfg.trials)
+        # start/goal różne i wolne (patrz corpus.generate)
+        g = grids.grid(i, diag=cfg.diag)
+        done = {algo: len(rows) for algo, rows in results.items()}
 
         # Dijkstra
-        rD = dijkstra(g)
+        rD = _call(profiler, "Dijkstra", dijkstra, g)
         if not rD.found:
             failed_trials += 1
+            if on_trial is not None:
+                on_trial(i, {})
             continue
         successful_trials += 1
         results["Dijkstra"].append({
@@ -54,15 +102,14 @@ def run_bench(cfg: TrialConfig) -> Dict[str, List[Dict[str, Any]]]:
             "frontier_peak": rD.frontier_peak,
             "path_len": rD.path_length(),
             "total_cost": rD.total_cost,
-            "b_star": rD.effective_branching_factor(),
         })
 
 
 
-        # BFS tylko gdy brak wag
-        if not g.weighted and not cfg.diag:
+        # BFS tylko gdy brak wag i terenów
+        if not g.weighted and not g.terrain and not cfg.diag:
             try:
-                r = bfs(g)
+                r = _call(profiler, "BFS", bfs, g)
                 results["BFS"].append({
                     "found": r.found,
                     "time_s": r.time_s,
@@ -71,7 +118,6 @@ def run_bench(cfg: TrialConfig) -> Dict[str, List[Dict[str, Any]]]:
                     "frontier_peak": r.frontier_peak,
                     "path_len": r.path_length(),
                     "total_cost": r.total_cost,
-                    "b_star": r.effective_branching_factor(),
                 })
             except Exception as e:
                 results["BFS"].append({"error": str(e)})
@@ -80,7 +126,7 @@ def run_bench(cfg: TrialConfig) -> Dict[str, List[Dict[str, Any]]]:
         # A* z heurystyką zależną od sąsiedztwa
         base_h = octile if cfg.diag else manhattan
         h = scaled(base_h, scale=g.min_step_cost())
-        rA = astar(g, h)
+        rA = _call(profiler, "A*", astar, g, h)
         results["A*"].append({
             "found": rA.found,
             "time_s": rA.time_s,
@@ -89,14 +135,106 @@ def run_bench(cfg: TrialConfig) -> Dict[str, List[Dict[str, Any]]]:
             "frontier_peak": rA.frontier_peak,
             "path_len": rA.path_length(),
             "total_cost": rA.total_cost,
-            "b_star": rA.effective_branching_factor(),
         })
 
+        for policy in cfg.tie_breaks:
+            rT = _call(profiler, f"A* ({policy})", astar, g, h, tie_break=policy)
+            results[f"A* ({policy})"].append({
+                "found": rT.found,
+                "time_s": rT.time_s,
+                "expanded": rT.expanded_count,
+                "visited": rT.visited_count,
+                "frontier_peak": rT.frontier_peak,
+                "path_len": rT.path_length(),
+                "total_cost": rT.total_cost,
+                "optimal": abs(rT.total_cost - rD.total_cost) <= 1e-9,
+            })
+
+        if cfg.prune:
+            t0 = time.perf_counter()
+            decomposition(g)  # liczona raz na wersję planszy; wyszukiwania biorą ją z cache
+            prep = time.perf_counter() - t0
+            pruned = pruned_cells(g, g.start, g.goal)
+            for key, rP in (("Dijkstra+prune", _call(profiler, "Dijkstra+prune", dijkstra, g, prune=True)),
+                            ("A*+prune", _call(profiler, "A*+prune", astar, g, h, prune=True))):
+                results[key].append({
+                    "found": rP.found,
+                    "time_s": rP.time_s,
+                    "expanded": rP.expanded_count,
+                    "visited": rP.visited_count,
+                    "frontier_peak": rP.frontier_peak,
+                    "path_len": rP.path_length(),
+                    "total_cost": rP.total_cost,
+                    "optimal": abs(rP.total_cost - rD.total_cost) <= 1e-9,
+                    "pruned_cells": pruned,
+                    "prep_s": prep,
+                })
+
+        if on_trial is not None:
+            on_trial(i, {algo: rows[-1] for algo, rows in results.items() if len(rows) > done[algo]})
+
+    # b* dla wszystkich prób naraz (wektorowo) zamiast osobnej bisekcji na próbę
+    for rows in results.values():
+        rows_ok = [r for r in rows if "error" not in r]
+        if rows_ok:
+            bstar = effective_branching_factor([r["expanded"] for r in rows_ok],
+                                               [r["path_len"] for r in rows_ok])
+            for r, b in zip(rows_ok, bstar.tolist()):
+                r["b_star"] = b
+
+    if progress is not None and not stopped:
+        progress(cfg.trials, cfg.trials)
+
+    if not verbose:
+        return results
+
     print(f"\n=== STATYSTYKI BENCHMARKU ===")
     print(f"Próby zakończone sukcesem: {successful_trials}/{cfg.trials}")
     print(f"Próby nieudane (graf niespójny): {failed_trials}/{cfg.trials}")
     print(f"Udane próby BFS: {len(results['BFS'])}/{successful_trials}")
     print(f"Udane próby Dijkstra: {len(results['Dijkstra'])}/{successful_trials}")
     print(f"Udane próby A*: {len(results['A*'])}/{successful_trials}")
+    for policy in cfg.tie_breaks:
+        rows = results[f"A* ({policy})"]
+        bad = sum(1 for r in rows if not r["optimal"])
+        print(f"A* ({policy}): koszt nieoptymalny w {bad}/{len(rows)} próbach")
+    if cfg.prune:
+        for key in ("Dijkstra+prune", "A*+prune"):
+            rows = results[key]
+            bad = sum(1 for r in rows if not r["optimal"])
+            print(f"{key}: koszt nieoptymalny w {bad}/{len(rows)} próbach")
 
     return results
+
+
+def run_ara_bench(cfg: TrialConfig, eps0: float = 3.0, eps_step: float = 0.5,
+                  time_limit: Optional[float] = None,
+                  grids: Optional[Series] = None) -> List[Dict[str, Any]]:
+    """Kompromis epsilon/czas dla ARA*: po jednym wierszu na każde rozwiązanie pośrednie.
+
+    Mapy generowane są tak samo jak w run_bench (to samo ziarno → te same próby);
+    `cost_ratio` to koszt rozwiązania podzielony przez koszt optymalny (A* z dopuszczalną h),
+    a `astar_time_s` – czas tego optymalnego A* jako punkt odniesienia.
+    """
+    grids = _trial_grids(cfg, grids)
+    rows: List[Dict[str, Any]] = []
+    for i in range(cfg.trials):
+        g = grids.grid(i, diag=cfg.diag)
+        base_h = octile if cfg.diag else manhattan
+        h = scaled(base_h, scale=g.min_step_cost())
+        opt = astar(g, h)
+        if not opt.found:
+            continue
+        res = ara_star(g, h, eps0=eps0, eps_step=eps_step, time_limit=time_limit)
+        for sol in res.solutions:
+            rows.append({
+                "trial": i + 1,
+                "epsilon": sol.epsilon,
+                "bound": sol.bound,
+                "cost": sol.cost,
+                "cost_ratio": sol.cost / opt.total_cost if opt.total_cost > 0 else 1.0,
+                "time_s": sol.time_s,
+                "expanded": sol.expanded,
+                "astar_time_s": opt.time_s,
+            })
+    return rows
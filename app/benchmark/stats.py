@@ -0,0 +1,113 @@
+"""Statystyki wsadowe wyników benchmarku (NumPy, wektorowo po wszystkich próbach).
+
+- `effective_branching_factor(expanded, depth)` – b* dla całych kolumn naraz
+  (Newton z zabezpieczeniem bisekcją zamiast 100 kroków bisekcji na próbę),
+- `columns(rows, keys)` – tabela kolumnowa {kolumna: ndarray} z listy słowników prób,
+- `describe(table)` – średnia, odch. std., mediana, min/max i percentyle wszystkich kolumn
+  w jednym przebiegu (jedno sortowanie macierzy próby × kolumny).
+
+NumPy importowany jest dopiero przy pierwszym użyciu, więc import runnera/plots
+pozostaje lekki (por. scripts/import_time.py).
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# percentyle liczone jak w dotychczasowych tabelach: element o indeksie int(q * (n - 1))
+PERCENTILES = (10, 25, 75, 90, 99)
+STAT_KEYS = ("mean", "median", "std", "min", "max") + tuple(f"p{q}" for q in PERCENTILES) + ("n",)
+
+
+def _np():
+    import numpy as np
+    return np
+
+
+def effective_branching_factor(expanded: Sequence[float], depth: Sequence[float],
+                               rtol: float = 1e-14, max_iter: int = 100):
+    """Wektorowe b*: rozwiązanie sum(b^i, i = 0..d) = N dla każdej pary (N, d).
+
+    Równoważnie p(b) = b^(d+1) - N*b + N - 1 = 0 (pierwiastek b > 1; p jest wypukłe,
+    więc jest on jedyny). Przedział startowy [(N/(d+1))^(1/d), N^(1/d)] zawiera pierwiastek,
+    a iteracja Newtona na F(b) = (d+1)·ln b - ln(1 + N(b-1)) wychodząca poza przedział
+    jest zastępowana krokiem bisekcji. Dla d = 0 lub N <= d + 1 wynik to 1.0
+    (jak w SearchResult.effective_branching_factor). Zwraca ndarray.
+    """
+    np = _np()
+    N = np.asarray(expanded, dtype=float)
+    d = np.asarray(depth, dtype=float)
+    N, d = np.broadcast_arrays(N, d)
+    out = np.ones(N.shape)
+    m = (d > 0) & (N > d + 1)
+    if not m.any():
+        return out
+    Nm, dm = N[m], d[m]
+    lo = np.maximum(1.0, (Nm / (dm + 1.0)) ** (1.0 / dm))
+    hi = Nm ** (1.0 / dm)
+    b = 0.5 * (lo + hi)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(max_iter):
+            f = (dm + 1.0) * np.log(b) - np.log1p(Nm * (b - 1.0))
+            neg = f < 0
+            lo = np.where(neg, b, lo)
+            hi = np.where(neg, hi, b)
+            df = (dm + 1.0) / b - Nm / (1.0 + Nm * (b - 1.0))
+            step = b - f / df
+            ok = np.isfinite(step) & (step > lo) & (step < hi)
+            nb = np.where(ok, step, 0.5 * (lo + hi))
+            done = np.all(np.abs(nb - b) <= rtol * nb)
+            b = nb
+            if done:
+                break
+    out[m] = b
+    return out
+
+
+def columns(rows: Iterable[Dict[str, Any]], keys: Sequence[str],
+            where: Optional[str] = "found") -> Dict[str, Any]:
+    """Tabela kolumnowa z listy prób. Pomija wiersze z błędem oraz – gdy `where` podano –
+    wiersze, w których ta kolumna jest fałszywa (domyślnie: nieudane wyszukiwania)."""
+    np = _np()
+    kept = [r for r in rows if "error" not in r and (where is None or r.get(where))]
+    return {k: np.fromiter((r[k] for r in kept), dtype=float, count=len(kept)) for k in keys}
+
+
+def _empty_stats() -> Dict[str, float]:
+    out = {k: float("nan") for k in STAT_KEYS}
+    out["n"] = 0
+    return out
+
+
+def describe(table: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Statystyki wszystkich kolumn tabeli (kolumny muszą mieć równą długość)."""
+    np = _np()
+    names = list(table)
+    if not names:
+        return {}
+    M = np.column_stack([np.asarray(table[k], dtype=float) for k in names])
+    n = M.shape[0]
+    if n == 0:
+        return {k: _empty_stats() for k in names}
+    S = np.sort(M, axis=0)
+    mean = M.mean(axis=0)
+    std = M.std(axis=0, ddof=1) if n > 1 else np.zeros(len(names))
+    median = 0.5 * (S[(n - 1) // 2] + S[n // 2])
+    pct = {q: S[int(q / 100 * (n - 1))] for q in PERCENTILES}
+    out: Dict[str, Dict[str, float]] = {}
+    for j, name in enumerate(names):
+        st = {
+            "mean": float(mean[j]),
+            "median": float(median[j]),
+            "std": float(std[j]),
+            "min": float(S[0, j]),
+            "max": float(S[-1, j]),
+        }
+        st.update({f"p{q}": float(pct[q][j]) for q in PERCENTILES})
+        st["n"] = n
+        out[name] = st
+    return out
+
+
+def describe_groups(groups: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    """Statystyki serii o różnych długościach (np. metryka per algorytm)."""
+    return {name: (describe({"x": vals})["x"] if len(vals) else _empty_stats())
+            for name, vals in groups.items()}
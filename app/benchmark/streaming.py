@@ -0,0 +1,215 @@
+"""Statystyki strumieniowe wyników benchmarku: aktualizacja po każdej próbie w pamięci O(1).
+
+- `RunningStats` – liczność, średnia, wariancja (Welford), min/max; `ci95` to połowa
+  szerokości 95% przedziału ufności średniej (przybliżenie normalne),
+- `P2Quantile` – kwantyl metodą P² (Jain & Chlamtac): pięć znaczników na kwantyl
+  zamiast wszystkich wartości; do 64 prób wynik dokładny (ta sama reguła co stats.describe),
+- `StreamingStats` – komplet statystyk kolumny w układzie stats.STAT_KEYS,
+- `LiveAggregator` – StreamingStats dla każdej pary (algorytm, kolumna), zasilany wierszami
+  prób z run_bench(on_trial=...); `converged()` służy do wczesnego zatrzymania serii.
+
+Bez NumPy – moduł importuje się w ułamku milisekundy (por. scripts/import_time.py).
+"""
+from __future__ import annotations
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.benchmark.stats import PERCENTILES
+
+Z95 = 1.959963984540054
+
+
+class RunningStats:
+    """Średnia i wariancja metodą Welforda (stabilna numerycznie, jeden przebieg)."""
+
+    __slots__ = ("n", "mean", "_m2", "min", "max")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self._m2 += d * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def variance(self) -> float:
+        """Wariancja z próby (ddof=1, jak w stats.describe)."""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def ci95(self) -> float:
+        return Z95 * self.std / math.sqrt(self.n) if self.n > 1 else math.inf
+
+
+class P2Quantile:
+    """Estymator kwantyla p (0..1) metodą P²: wysokości i pozycje pięciu znaczników
+    korygowane parabolicznie (lub liniowo) po każdej obserwacji.
+
+    Pierwsze `exact` obserwacji jest przechowywanych (wynik dokładny, jak stats.describe);
+    potem znaczniki startują z kwantyli tego bufora zamiast z pięciu pierwszych wartości,
+    co przy typowych seriach (dziesiątki prób) usuwa duży błąd początkowy P²."""
+
+    __slots__ = ("p", "exact", "buf", "q", "pos", "want", "dwant", "count")
+
+    def __init__(self, p: float, exact: int = 64):
+        if not 0.0 <= p <= 1.0:
+            raise ValueError("Kwantyl musi należeć do [0, 1]")
+        self.p = p
+        self.exact = max(5, exact)
+        self.buf: Optional[List[float]] = []
+        self.q: List[float] = []
+        self.pos: List[int] = []
+        self.dwant = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+        self.want: List[float] = []
+        self.count = 0
+
+    @property
+    def n(self) -> int:
+        return self.count
+
+    def _start(self) -> None:
+        b = sorted(self.buf)
+        last = len(b) - 1
+        pos = [int(round(d * last)) for d in self.dwant]
+        for i in (1, 2, 3):   # pozycje ściśle rosnące (p bliskie 0 lub 1)
+            pos[i] = max(pos[i], pos[i - 1] + 1)
+        for i in (3, 2, 1):
+            pos[i] = min(pos[i], pos[i + 1] - 1)
+        self.pos = pos
+        self.q = [b[i] for i in pos]
+        self.want = [d * last for d in self.dwant]
+        self.buf = None
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        if self.buf is not None:
+            self.buf.append(x)
+            if len(self.buf) > self.exact:
+                self._start()
+            return
+        q = self.q
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        pos, want = self.pos, self.want
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        for i in range(5):
+            want[i] += self.dwant[i]
+        for i in (1, 2, 3):
+            d = want[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                s = 1 if d > 0 else -1
+                qp = q[i] + s / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + s) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - s) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1]))
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + s * (q[i + s] - q[i]) / (pos[i + s] - pos[i])
+                q[i] = qp
+                pos[i] += s
+
+    @property
+    def value(self) -> float:
+        if self.buf is not None:
+            if not self.buf:
+                return math.nan
+            b, n = sorted(self.buf), len(self.buf)
+            if self.p == 0.5:
+                return 0.5 * (b[(n - 1) // 2] + b[n // 2])
+            return b[int(self.p * (n - 1))]
+        return self.q[2]
+
+
+class StreamingStats:
+    """Statystyki jednej kolumny (klucze jak stats.STAT_KEYS; mediana i percentyle z P²)."""
+
+    __slots__ = ("run", "quantiles")
+
+    def __init__(self, percentiles: Sequence[int] = PERCENTILES):
+        self.run = RunningStats()
+        self.quantiles = {"median": P2Quantile(0.5)}
+        self.quantiles.update({f"p{q}": P2Quantile(q / 100) for q in percentiles})
+
+    def add(self, x: float) -> None:
+        self.run.add(x)
+        for est in self.quantiles.values():
+            est.add(x)
+
+    @property
+    def n(self) -> int:
+        return self.run.n
+
+    def snapshot(self) -> Dict[str, float]:
+        r = self.run
+        if r.n == 0:
+            out = {k: math.nan for k in ("mean", "std", "min", "max", *self.quantiles)}
+        else:
+            out = {"mean": r.mean, "std": r.std, "min": r.min, "max": r.max}
+            out.update((k, est.value) for k, est in self.quantiles.items())
+        out["n"] = r.n
+        return out
+
+
+class LiveAggregator:
+    """Statystyki strumieniowe {algorytm: {kolumna: StreamingStats}} z udanych prób."""
+
+    def __init__(self, columns: Sequence[str] = ("expanded", "time_s", "total_cost")):
+        self.columns = tuple(columns)
+        self.series: Dict[str, Dict[str, StreamingStats]] = {}
+        self.trials = 0
+
+    def update(self, rows: Dict[str, Dict[str, Any]]) -> None:
+        """Wiersze jednej próby {algorytm: wiersz}; wiersze z błędem lub nieudane są pomijane."""
+        self.trials += 1
+        for algo, row in rows.items():
+            per = self.series.setdefault(algo, {c: StreamingStats() for c in self.columns})
+            if "error" in row or not row.get("found"):
+                continue
+            for c in self.columns:
+                per[c].add(float(row[c]))
+
+    def __call__(self, i: int, rows: Dict[str, Dict[str, Any]]) -> None:
+        self.update(rows)
+
+    def stats(self, algo: str, column: str) -> Dict[str, float]:
+        return self.series[algo][column].snapshot()
+
+    def rel_ci(self, algo: str, column: str) -> float:
+        """Połowa szerokości 95% CI średniej względem średniej (inf, gdy za mało prób)."""
+        r = self.series[algo][column].run
+        if r.n < 2:
+            return math.inf
+        return r.ci95 / abs(r.mean) if r.mean else (0.0 if r.ci95 == 0 else math.inf)
+
+    def converged(self, target: float, min_trials: int = 10,
+                  columns: Optional[Iterable[str]] = None) -> bool:
+        """True, gdy dla każdego algorytmu i kolumny względne 95% CI średniej <= target."""
+        if not self.series:
+            return False
+        cols = tuple(columns) if columns is not None else self.columns
+        for algo, per in self.series.items():
+            for c in cols:
+                if per[c].n < min_trials or self.rel_ci(algo, c) > target:
+                    return False
+        return True
@@ -0,0 +1,185 @@
+"""Wsadowe zapytania o ścieżki bez GUI.
+
+    python -m app.cli MAPA [--queries PLIK|-] [--algo astar] [--diag] > wyniki.jsonl
+    python -m app.cli MAPA --random-queries 200 --throughput --repeat 5
+
+MAPA: plik tekstowy ('.', '#', cyfry = wagi; także format MovingAI) albo binarny .grid.
+Zapytania: linie 'sx sy gx gy' z pliku lub stdin. Wynik: JSONL, jedna linia na zapytanie.
+Tryb --throughput rozwiązuje stały zestaw zapytań wielokrotnie i raportuje
+zapytania/s oraz percentyle opóźnienia (p50/p90/p99).
+--cache-mb N włącza pamięć podręczną LRU wyników (powtórzone zapytania bez ponownego liczenia).
+--algo tree: wiele startów do kilku wspólnych celów – drzewo Dijkstry od celu liczone leniwie raz.
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.algorithms.grid import Grid, Coord
+from app.algorithms.bfs import bfs
+from app.algorithms.dijkstra import dijkstra
+from app.algorithms.astar import astar
+from app.algorithms.cache import ResultCache
+from app.algorithms.goal_tree import GoalTreeCache
+from app.utils.heuristics import manhattan, octile, scaled
+from app.utils.mapio import load_map, parse_queries, free_cells
+from app.utils.metrics import SearchResult
+
+ALGORITHMS = ("bfs", "dijkstra", "astar", "tree")
+
+
+def make_solver(g: Grid, algo: str, weight: float = 1.0) -> Callable[[Grid], SearchResult]:
+    if algo == "bfs":
+        return bfs
+    if algo == "dijkstra":
+        return dijkstra
+    if algo == "astar":
+        h = scaled(octile if g.diag else manhattan, scale=g.min_step_cost())
+        return lambda grid: astar(grid, h, weight)
+    if algo == "tree":
+        # odwrotne drzewo Dijkstry od celu: zapytania do wspólnego celu to odczyt tablic
+        return GoalTreeCache().solve
+    raise ValueError(f"Nieznany algorytm: {algo}")
+
+
+def solve(g: Grid, solver, start: Coord, goal: Coord, with_path: bool = False,
+          cache: Optional[ResultCache] = None, tag: Tuple[Hashable, ...] = ()) -> Tuple[Dict, float]:
+    """Rozwiązuje jedno zapytanie; zwraca (rekord JSON, opóźnienie [s]).
+
+    Z `cache` wynik jest brany z pamięci podręcznej, jeśli to samo zapytanie (`tag` = algorytm
+    i jego parametry) było już liczone na tej samej wersji planszy.
+    """
+    rec: Dict = {"start": list(start), "goal": list(goal)}
+    for c in (start, goal):
+        if not g.in_bounds(c) or not g.passable(c):
+            rec["error"] = f"pole {c} poza mapą lub na ścianie"
+            return rec, 0.0
+    g.start, g.goal = start, goal
+    t0 = time.perf_counter()
+    hits = cache.hits if cache is not None else 0
+    try:
+        r = solver(g) if cache is None else cache.solve(g, solver, *tag)
+    except ValueError as e:
+        rec["error"] = str(e)
+        return rec, 0.0
+    latency = time.perf_counter() - t0
+    rec.update({
+        "found": r.found,
+        "cost": r.total_cost if r.found else None,
+        "path_len": r.path_length(),
+        "expanded": r.expanded_count,
+        "time_s": r.time_s,
+        "latency_s": latency,
+    })
+    if cache is not None:
+        rec["cached"] = cache.hits > hits
+    if with_path:
+        rec["path"] = [list(c) for c in r.path]
+    return rec, latency
+
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return float("nan")
+    k = (len(sorted_vals) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+def random_queries(g: Grid, n: int, seed: int) -> List[Tuple[Coord, Coord]]:
+    rng = random.Random(seed)
+    cells = free_cells(g)
+    if len(cells) < 2:
+        raise ValueError("Za mało wolnych pól na mapie")
+    return [tuple(rng.sample(cells, 2)) for _ in range(n)]
+
+
+def throughput(g: Grid, solver, queries, repeat: int, warmup: int,
+               cache: Optional[ResultCache] = None, tag: Tuple[Hashable, ...] = ()) -> Dict:
+    for start, goal in queries[:warmup]:
+        solve(g, solver, start, goal)
+    latencies: List[float] = []
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for start, goal in queries:
+            rec, lat = solve(g, solver, start, goal, cache=cache, tag=tag)
+            if "error" not in rec:
+                latencies.append(lat)
+    wall = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "queries": len(latencies),
+        "wall_s": wall,
+        "qps": len(latencies) / wall if wall > 0 else float("inf"),
+        "latency_ms": {
+            "mean": sum(latencies) / len(latencies) * 1000 if latencies else float("nan"),
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p90": percentile(latencies, 0.90) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else float("nan"),
+        },
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("map", type=Path, help="plik mapy (tekst lub .grid)")
+    ap.add_argument("--queries", default="-", help="plik zapytań albo '-' (stdin, domyślnie)")
+    ap.add_argument("--random-queries", type=int, metavar="N",
+                    help="zamiast pliku: N losowych zapytań między wolnymi polami")
+    ap.add_argument("--seed", type=int, default=123)
+    ap.add_argument("--algo", choices=ALGORITHMS, default="astar")
+    ap.add_argument("--weight", type=float, default=1.0, help="waga heurystyki A* (ważone A*)")
+    ap.add_argument("--diag", action="store_true", help="sąsiedztwo 8")
+    ap.add_argument("--path", action="store_true", help="dołącz ścieżkę do wyników")
+    ap.add_argument("--output", "-o", default="-", help="plik JSONL albo '-' (stdout)")
+    ap.add_argument("--throughput", action="store_true",
+                    help="tryb przepustowości: zapytania/s i percentyle opóźnienia")
+    ap.add_argument("--repeat", type=int, default=3, help="powtórzenia zestawu w trybie --throughput")
+    ap.add_argument("--warmup", type=int, default=10, help="zapytania rozgrzewkowe w trybie --throughput")
+    ap.add_argument("--cache-mb", type=float, default=0.0,
+                    help="pamięć podręczna wyników LRU o rozmiarze N MB (0 = wyłączona)")
+    args = ap.parse_args(argv)
+
+    g = load_map(args.map, diag=args.diag)
+    solver = make_solver(g, args.algo, args.weight)
+    cache = ResultCache(int(args.cache_mb * 1024 * 1024)) if args.cache_mb > 0 else None
+    tag = (args.algo, args.weight)
+    if args.random_queries:
+        queries = random_queries(g, args.random_queries, args.seed)
+    elif args.queries == "-":
+        queries = parse_queries(sys.stdin)
+    else:
+        queries = parse_queries(open(args.queries, encoding="utf-8"))
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        if args.throughput:
+            summary = throughput(g, solver, list(queries), args.repeat, args.warmup, cache, tag)
+            summary.update({"map": str(args.map), "algo": args.algo, "cols": g.cols,
+                            "rows": g.rows, "diag": g.diag})
+            if cache is not None:
+                st = cache.stats()
+                summary["cache"] = {"hits": st.hits, "misses": st.misses, "hit_rate": st.hit_rate,
+                                    "evictions": st.evictions, "entries": st.entries, "bytes": st.nbytes}
+            out.write(json.dumps(summary) + "\n")
+            return 0
+        # strumieniowo: każde zapytanie zapisywane od razu
+        for i, (start, goal) in enumerate(queries):
+            rec, _ = solve(g, solver, start, goal, with_path=args.path, cache=cache, tag=tag)
+            rec = {"id": i, **rec}
+            out.write(json.dumps(rec) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
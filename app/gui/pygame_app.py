@@ -1,32 +1,61 @@
 
 import pygame
 import sys
+import time
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict
 from app.algorithms.grid import Grid
-from app.algorithms.bfs import bfs
-from app.algorithms.dijkstra import dijkstra
-from app.algorithms.astar import astar
+from app.algorithms.terrain import MIXED, TERRAINS
+from app.algorithms.bfs import bfs_steps
+from app.algorithms.dijkstra import dijkstra_steps
+from app.algorithms.astar import astar_steps
+from app.algorithms.incremental import IncrementalSearch
+from app.algorithms.cache import ResultCache
+from app.algorithms.multigoal import dijkstra_multi_steps, astar_multi_steps, MultiGoalResult
+from app.algorithms.flow_field import flow_field
 from app.utils.heuristics import manhattan, octile, scaled, euclidean
 from app.benchmark.runner import run_bench, TrialConfig
-from app.benchmark.plots import save_all_plots
+from app.gui.renderer import GridRenderer, COLOR_EXPLORED, COLOR_PATH
+from app.gui.worker import BackgroundTask
+from app.utils.metrics import SearchResult
 
 CELL = 3
 MARGIN = 1
 PANEL_W = 400
 FONT_SIZE = 16
+VIEW_MAX = (960, 720)    # największy widok planszy; większe plansze oglądane są z przesuwaniem/zoomem
+PAN_FRACTION = 0.125     # przesunięcie strzałką: część szerokości/wysokości widoku
+
+# Animacja: prędkość w skali logarytmicznej (węzły/s = 2**poziom), poziom SPEED_MAX = bez limitu
+SPEED_MAX = 16
+FPS = 60
+FRAME_BUDGET_S = 0.010   # ile z klatki (~16 ms) wolno poświęcić na rysowanie pól
+MAX_ANIM_S = 10.0        # górne ograniczenie czasu odtwarzania jednego etapu animacji
 
 class AppState:
-    def __init__(self, config: Optional[TrialConfig] = None, cols=30, rows=22):
+    def __init__(self, config: Optional[TrialConfig] = None, cols=30, rows=22,
+                 grid: Optional[Grid] = None):
         self.config = config or TrialConfig()
 
         self.cols = self.config.cols if config else cols
         self.rows = self.config.rows if config else rows
-        self.grid = Grid(self.cols, self.rows, diag=False)
+        if grid is not None:
+            self.cols, self.rows = grid.cols, grid.rows
+        self.grid = grid if grid is not None else Grid(self.cols, self.rows, diag=False)
+        # okno widoku: cała plansza w skali CELL+MARGIN, ale nie więcej niż VIEW_MAX
+        self.view_size = (min(self.cols*(CELL+MARGIN)+MARGIN, VIEW_MAX[0]),
+                          min(self.rows*(CELL+MARGIN)+MARGIN, VIEW_MAX[1]))
         self.paused = False
         self.step_once = False
-        self.speed_ms = 10  # opóźnienie animacji (ms/step)
+        self.speed_level = 7  # prędkość animacji: 2**poziom węzłów/s
         self.last_results = None  # wyniki benchmarków
+        self.renderer: Optional[GridRenderer] = None
+        self.task: Optional[BackgroundTask] = None  # benchmark liczony w tle
+        self.cancel_anim = False
+        self.search_status = ""  # postęp wyszukiwania na żywo (panel)
+        self.cache = ResultCache(max_bytes=32 * 1024 * 1024)  # wyniki dla niezmienionej planszy
+        self.flow_on = False  # nakładka pola przepływu do celu (klawisz F)
+        self.terrain_brush = 0  # teren malowany LPM (klawisz T); 0 = ściany/wagi
 
 def draw_text(surface, font, text, x, y):
     surf = font.render(text, True, (240,240,240))
@@ -35,173 +64,316 @@ def draw_text(surface, font, text, x, y):
 def cell_rect(x, y):
     return (x*(CELL+MARGIN)+MARGIN, y*(CELL+MARGIN)+MARGIN, CELL, CELL)
 
-def draw_grid(surface, state: AppState, font):
-    grid = state.grid
-    for x in range(grid.cols):
-        for y in range(grid.rows):
-            rect = pygame.Rect(*cell_rect(x, y))
-            color = (30,30,30)
-            if (x,y) in grid.walls:
-                color = (100,100,100)
-            elif (x,y) in grid.weighted:
-                color = (60,60,120)
-            pygame.draw.rect(surface, color, rect)
-    # start/goal
-    if grid.start:
-        pygame.draw.rect(surface, (40,140,40), pygame.Rect(*cell_rect(*grid.start)))
-    if grid.goal:
-        pygame.draw.rect(surface, (160,50,50), pygame.Rect(*cell_rect(*grid.goal)))
-
 def draw_overlay(surface, font, state: AppState):
-    x0 = state.cols*(CELL+MARGIN)+MARGIN + 10
+    x0 = state.view_size[0] + 10
     y = 10
     draw_text(surface, font, "Skróty:", x0, y); y+=22
     for s in [
         "LPM: przeszkody",
         "PPM: START/CEL",
+        "Shift+PPM: dodatkowy cel",
         "1: BFS   2: Dijkstra   3: A*",
+        "F: pole przepływu do celu",
+        "Kółko: zoom   ŚPM/strzałki: przesuń",
+        "0: cała plansza w oknie",
         f"H: sąsiedztwo {4 if not state.grid.diag else 8}",
         "W: losowy labirynt",
         "G: tryb wag (maluj)",
+        "T: teren do malowania (kolejny)",
         "R: reset planszy",
         "Spacja: pauza/wznów",
         "S: krok (gdy pauza)",
         "+/-: szybciej/wolniej",
         "B: benchmarky",
         "M: pokaż wykresy",
-        "ESC: wyjście",
+        "ESC: anuluj zadanie / wyjście",
     ]:
         draw_text(surface, font, s, x0, y); y+=18
 
     y+=10
-    draw_text(surface, font, f"Szybkość animacji: {state.speed_ms} ms/step", x0, y); y+=18
+    draw_text(surface, font, f"Szybkość animacji: {speed_label(state)}", x0, y); y+=18
     draw_text(surface, font, f"Pauza: {'TAK' if state.paused else 'nie'}", x0, y); y+=18
     draw_text(surface, font, f"Sąsiedztwo: {'8' if state.grid.diag else '4'}", x0, y); y+=18
+    if state.renderer:
+        draw_text(surface, font, f"Plansza {state.cols}x{state.rows}, skala: {zoom_label(state)}", x0, y); y+=18
     draw_text(surface, font, f"Wagi aktywne: {'TAK' if state.grid.weighted else 'nie'}", x0, y); y+=18
+    if state.terrain_brush:
+        t = TERRAINS[state.terrain_brush]
+        draw_text(surface, font, f"Pędzel terenu: {t.name} (x{t.factor:g})", x0, y); y+=18
+    draw_text(surface, font, f"Min. koszt kroku: {state.grid.min_step_cost():g}", x0, y); y+=18
+    if state.flow_on:
+        ff = state.renderer.flow if state.renderer else None
+        draw_text(surface, font, "Pole przepływu: " + ("ustaw CEL" if ff is None else f"do {ff.goal}"), x0, y); y+=18
     if state.last_results:
         draw_text(surface, font, "Ostatni benchmark: wyniki zapisano.", x0, y); y+=18
-
-def animate_path(surface, state: AppState, font, explored: List[Tuple[int,int]], path: List[Tuple[int,int]]):
+    if state.search_status:
+        draw_text(surface, font, f"Wyszukiwanie: {state.search_status}", x0, y); y+=18
+        draw_text(surface, font, "ESC: przerwij", x0, y); y+=18
+    if state.task is not None:
+        draw_progress(surface, font, state.task, x0, y + 6)
+
+def draw_progress(surface, font, task: BackgroundTask, x0, y):
+    """Pasek postępu zadania w tle; przy nieznanej liczbie kroków – przesuwający się blok."""
+    frac = task.fraction
+    label = task.message or task.name
+    if frac is not None:
+        label += f"  {task.done}/{task.total}"
+    draw_text(surface, font, label, x0, y)
+    bar = pygame.Rect(x0, y + 20, PANEL_W - 40, 10)
+    pygame.draw.rect(surface, (70,70,80), bar, 1)
+    if frac is not None:
+        pygame.draw.rect(surface, (80,160,80), pygame.Rect(bar.x, bar.y, int(bar.w * frac), bar.h))
+    else:
+        block = bar.w // 5
+        pos = int((task.elapsed * 0.8 % 1.0) * (bar.w - block))
+        pygame.draw.rect(surface, (80,160,80), pygame.Rect(bar.x + pos, bar.y, block, bar.h))
+    draw_text(surface, font, f"ESC: anuluj ({task.elapsed:.1f} s)", x0, y + 36)
+
+def panel_rect(state: AppState) -> pygame.Rect:
+    return pygame.Rect(state.view_size[0], 0, PANEL_W, state.view_size[1])
+
+def zoom_label(state: AppState) -> str:
+    s = state.renderer.view.scale
+    return f"{int(s)} px/pole" if s >= 1 else f"1 px = {round(1 / s)}x{round(1 / s)} pól"
+
+def handle_view_event(event, state: AppState) -> bool:
+    """Zoom kółkiem (wokół kursora), przesuwanie środkowym przyciskiem i strzałkami,
+    klawisz 0 – cała plansza. Zwraca True, gdy zmienił się widok."""
+    renderer = state.renderer
+    w, h = state.view_size
+    if event.type == pygame.MOUSEWHEEL:
+        pos = pygame.mouse.get_pos()
+        return renderer.zoom(event.y, pos if pos[0] < w and pos[1] < h else None)
+    if event.type == pygame.MOUSEMOTION and event.buttons[1]:
+        return renderer.pan(-event.rel[0], -event.rel[1])
+    if event.type == pygame.KEYDOWN:
+        step_x, step_y = int(w * PAN_FRACTION), int(h * PAN_FRACTION)
+        moves = {pygame.K_LEFT: (-step_x, 0), pygame.K_RIGHT: (step_x, 0),
+                 pygame.K_UP: (0, -step_y), pygame.K_DOWN: (0, step_y)}
+        if event.key in moves:
+            return renderer.pan(*moves[event.key])
+        if event.key == pygame.K_0:
+            renderer.fit()
+            return True
+    return False
+
+def draw_panel(surface, font, state: AppState) -> pygame.Rect:
+    """Rysuje panel boczny od nowa i zwraca jego prostokąt (do display.update)."""
+    rect = panel_rect(state)
+    pygame.draw.rect(surface, (25,25,30), rect)
+    draw_overlay(surface, font, state)
+    return rect
+
+def anim_rate(state: AppState) -> float:
+    """Liczba węzłów animowanych na sekundę (nieskończoność = tyle, ile zmieści budżet klatki)."""
+    if state.speed_level >= SPEED_MAX:
+        return float("inf")
+    return float(2 ** state.speed_level)
+
+def speed_label(state: AppState) -> str:
+    rate = anim_rate(state)
+    return "max" if rate == float("inf") else f"{int(rate)} węzłów/s"
+
+def change_speed(state: AppState, delta: int):
+    state.speed_level = max(0, min(SPEED_MAX, state.speed_level + delta))
+
+def handle_anim_event(event, state: AppState) -> bool:
+    """Obsługa klawiszy w trakcie animacji. Zwraca True, gdy zmienił się stan panelu."""
+    if event.type == pygame.QUIT:
+        pygame.quit(); sys.exit(0)
+    if handle_view_event(event, state):
+        return True
+    if event.type != pygame.KEYDOWN:
+        return False
+    if event.key == pygame.K_ESCAPE:
+        state.cancel_anim = True
+    elif event.key == pygame.K_SPACE:
+        state.paused = not state.paused
+    elif event.key == pygame.K_s and state.paused:
+        state.step_once = True
+    elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:
+        change_speed(state, +1)
+    elif event.key == pygame.K_MINUS:
+        change_speed(state, -1)
+    else:
+        return False
+    return True
+
+def animate_cells(surface, state: AppState, font, cells: List[Tuple[int,int]], color,
+                  search: Optional[IncrementalSearch] = None) -> bool:
+    """Odtwarza listę pól partiami: w każdej klatce rysuje tyle pól, ile wynika z prędkości,
+    ale nie dłużej niż FRAME_BUDGET_S, i wysyła na ekran tylko zmienione prostokąty.
+    Prędkość jest podnoszona tak, by cały etap trwał co najwyżej MAX_ANIM_S.
+
+    Gdy podano `search`, pola są produkowane na żywo: brakujące węzły rozwijane są
+    krokami wyszukiwania w ramach tego samego budżetu klatki (bez odtwarzania po fakcie).
+    Liczba pól nie jest wtedy znana z góry, więc po MAX_ANIM_S/2 s prędkość podwaja się
+    co sekundę – czas animacji rośnie tylko logarytmicznie z liczbą rozwinięć.
+    Zwraca False, gdy animację przerwano klawiszem ESC."""
+    renderer = state.renderer
     clock = pygame.time.Clock()
-    grid = state.grid
-    # animacja odwiedzeń
-    for u in explored:
-        # reaguj na pauzę/krok
-        waiting = True
-        while state.paused and waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit(0)
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:  # wznów/pauza
-                        state.paused = not state.paused
-                        waiting = not waiting
-                    elif event.key == pygame.K_s:  # krok
-                        state.step_once = True
-                        waiting = False
-            pygame.time.delay(10)
-        if state.step_once:
-            state.step_once = False
-            # wykona jeden krok i wraca do pauzy
-            pass
-
-        rect = pygame.Rect(*cell_rect(*u))
-        pygame.draw.rect(surface, (80,80,160), rect)
-        if grid.start:
-            pygame.draw.rect(surface, (40,140,40), pygame.Rect(*cell_rect(*grid.start)))
-        if grid.goal:
-            pygame.draw.rect(surface, (160,50,50), pygame.Rect(*cell_rect(*grid.goal)))
-        pygame.display.flip()
-        if state.speed_ms > 0:
-            pygame.time.delay(state.speed_ms)
+    i = 0
+    drawn = 0
+    credit = 0.0
+    frame = 0
+    active = 0.0
+    last = time.perf_counter()
+    state.cancel_anim = False
+    while i < len(cells) or (search is not None and not search.done):
+        panel_changed = False
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit(0)
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    state.paused = not state.paused
-                elif event.key == pygame.K_s and state.paused:
-                    state.step_once = True
-
-    # animacja ścieżki
-    for u in path:
-        waiting = True
-        while state.paused and waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit(0)
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        state.paused = not state.paused
-                        waiting = not waiting
-                    elif event.key == pygame.K_s:
-                        state.step_once = True
-                        waiting = False
-            pygame.time.delay(10)
-        if state.step_once:
+            panel_changed |= handle_anim_event(event, state)
+        if state.cancel_anim:
+            if search is not None:
+                search.cancel()
+            return False
+
+        now = time.perf_counter()
+        dt, last = now - last, now
+        if search is None:
+            rate = max(anim_rate(state), len(cells) / MAX_ANIM_S)
+        else:
+            rate = anim_rate(state) * 2 ** max(0.0, active - MAX_ANIM_S / 2)
+        if state.paused:
+            quota = 1 if state.step_once else 0
             state.step_once = False
+            credit = 0.0
+        elif rate == float("inf"):
+            quota = float("inf")
+        else:
+            active += dt
+            # nie kumuluj zaległości dłuższych niż kilka klatek
+            credit = min(credit + dt * rate, rate * 4 / FPS + 1)
+            quota = int(credit)
+            credit -= quota
+
+        deadline = now + FRAME_BUDGET_S
+        need = i + quota - len(cells)
+        if search is not None and not search.done and need > 0:
+            cells.extend(search.run(deadline=deadline,
+                                    max_expansions=None if need == float("inf") else int(need)))
+        end = min(len(cells), i + quota)
+        while i < end:
+            j = min(end, i + 256)
+            renderer.mark(cells[i:j], color)
+            i = j
+            if time.perf_counter() > deadline:
+                break
+
+        if search is not None:
+            # bufor tylko na pola jeszcze nie narysowane
+            drawn += i
+            del cells[:i]
+            i = 0
+            frame += 1
+            if frame % 10 == 0 or search.done:
+                state.search_status = f"rozwinięto {search.expanded}"
+                panel_changed = True
+        extra = [draw_panel(surface, font, state)] if panel_changed else []
+        renderer.present(surface, extra)
+        clock.tick(FPS)
+    return True
+
+def start_search(g: Grid, algo_name: str) -> IncrementalSearch:
+    """Tworzy wznawialne wyszukiwanie wybranym algorytmem (ValueError, gdy niedozwolone).
+    Przy dodatkowych celach Dijkstra i A* szukają najbliższego z nich w jednym przebiegu."""
+    multi = bool(g.extra_goals)
+    if algo_name == "BFS":
+        if multi:
+            raise ValueError("BFS obsługuje tylko jeden cel")
+        return IncrementalSearch(bfs_steps(g))
+    if algo_name == "Dijkstra":
+        return IncrementalSearch(dijkstra_multi_steps(g) if multi else dijkstra_steps(g))
+    if algo_name == "A*":
+        base_h = octile if g.diag else manhattan
+        h = scaled(base_h, scale=g.min_step_cost())
+        return IncrementalSearch(astar_multi_steps(g, h) if multi else astar_steps(g, h))
+    raise ValueError(f"Nieznany algorytm: {algo_name}")
 
-        rect = pygame.Rect(*cell_rect(*u))
-        pygame.draw.rect(surface, (200,200,60), rect)
-        pygame.display.flip()
-        pygame.time.delay(max(5, state.speed_ms//2))
 def perform_search(surface, state: AppState, font, algo_name: str):
+    """Wyszukiwanie krokowe animowane na żywo; ESC przerywa, wynik pokazywany na końcu.
+    Gdy plansza i zapytanie się nie zmieniły, wynik pochodzi z pamięci podręcznej
+    i animacja tylko odtwarza zapamiętaną kolejność rozwinięć."""
     g = state.grid
-    if not g.start or not g.goal:
+    if not g.start or not g.goal or state.task is not None:
         return
-    # kopia tła
-    base = surface.copy()
-    # uruchom wybrany algorytm
-    try:
-        if algo_name == "BFS":
-            result = bfs(g)
-        elif algo_name == "Dijkstra":
-            result = dijkstra(g)
-        elif algo_name == "A*":
-            base_h = octile if g.diag else manhattan
-            h = scaled(base_h, scale=g.min_step_cost())
-            result = astar(g, h)
-        else:
+    key = state.cache.key(g, algo_name, tuple(g.extra_goals))  # przed kopią: wersja tej planszy
+    result = state.cache.get(key)
+    search = None
+    if result is None:
+        try:
+            search = start_search(g.copy(), algo_name)
+        except ValueError as e:
+            show_message(surface, font, state, f"Nie można uruchomić: {e}")
             return
-    except Exception as e:
-        # komunikat
-        x0 = g.cols*(CELL+MARGIN)+MARGIN + 10
-        draw_text(surface, font, f"Nie można uruchomić: {e}", x0, 420)
-        pygame.display.flip()
-        pygame.time.delay(1200)
-        return
-
-    # odtwórz tło i animuj
-    surface.blit(base, (0,0))
-    pygame.display.flip()
-    animate_path(surface, state, font, result.explored_order, result.path)
-
-    # NOWE: Zatrzymaj się i pokaż wynik
-    # Najpierw narysuj cały interfejs od nowa (żeby panel był widoczny)
-    surface.fill((15, 15, 20))
-    draw_grid(surface, state, font)
-    pygame.draw.rect(surface, (25, 25, 30),
-                     pygame.Rect(state.cols * (CELL + MARGIN) + MARGIN, 0, PANEL_W, g.rows * (CELL + MARGIN) + MARGIN))
-    draw_overlay(surface, font, state)
-
-    # Dorysuj animację (odwiedzone pola)
-    for u in result.explored_order:
-        rect = pygame.Rect(*cell_rect(*u))
-        pygame.draw.rect(surface, (80, 80, 160), rect)
 
-    # Dorysuj ścieżkę
-    for u in result.path:
-        rect = pygame.Rect(*cell_rect(*u))
-        pygame.draw.rect(surface, (200, 200, 60), rect)
+    renderer = state.renderer
+    renderer.clear_overlays()
+    renderer.present(surface)
+    if search is not None:
+        state.search_status = f"{algo_name}: start"
+        ok = animate_cells(surface, state, font, [], COLOR_EXPLORED, search=search)
+        if ok:
+            result = search.result
+            state.cache.put(key, result)
+    else:
+        state.search_status = f"{algo_name}: z pamięci podręcznej"
+        ok = animate_cells(surface, state, font, list(result.explored_order), COLOR_EXPLORED)
+    if ok:
+        ok = animate_cells(surface, state, font, list(result.path), COLOR_PATH)
+    state.search_status = ""
+    if not ok:
+        renderer.clear_overlays()
+        return
+    show_search_result(surface, state, font, algo_name, result)
 
-    # Dorysuj start/goal na wierzchu
-    if g.start:
-        pygame.draw.rect(surface, (40, 140, 40), pygame.Rect(*cell_rect(*g.start)))
-    if g.goal:
-        pygame.draw.rect(surface, (160, 50, 50), pygame.Rect(*cell_rect(*g.goal)))
+def start_benchmark(state: AppState):
+    """Uruchamia benchmark (próby + wykresy) w tle z raportem postępu po każdej próbie."""
+    if state.task is not None:
+        return
+    cfg = TrialConfig(
+        diag=state.grid.diag,
+        weight_density=0.10 if state.grid.weighted else 0.0,
+        terrain_mix=MIXED if state.grid.terrain else (),
+    )
+    out_dir = str(Path.cwd() / "benchmark_plots")
+
+    def job(progress, should_stop):
+        results = run_bench(cfg, progress=lambda i, n: progress(i, n, "Benchmark"),
+                            should_stop=should_stop)
+        if should_stop():
+            return None
+        progress(0, 0, "Benchmark: wykresy")
+        from app.benchmark.plots import save_all_plots  # matplotlib dopiero przy wykresach
+        return save_all_plots(results, out_dir)
+
+    state.task = BackgroundTask("Benchmark", job).start()
+
+def update_flow(state: AppState):
+    """Przelicza nakładkę pola przepływu po zmianie planszy/celu (gdy jest włączona)."""
+    g = state.grid
+    ff = None
+    if state.flow_on and g.goal is not None and g.goal not in g.walls:
+        ff = state.renderer.flow
+        if ff is None or ff.stale(g) or ff.goal != g.goal:
+            ff = flow_field(g)
+    state.renderer.set_flow(ff)
+
+def show_message(surface, font, state: AppState, text: str):
+    x0 = state.view_size[0] + 10
+    draw_text(surface, font, text, x0, 420)
+    pygame.display.update(panel_rect(state))
+    pygame.time.delay(1200)
+
+def show_search_result(surface, state: AppState, font, algo_name: str, result: SearchResult):
+    g = state.grid
+    renderer = state.renderer
+    # Zatrzymaj się i pokaż wynik: pełne nakładki (szybka ścieżka) + panel od nowa
+    renderer.set_overlays(result.explored_order, result.path)
+    draw_panel(surface, font, state)
 
     # Wyświetl statystyki
-    x0 = g.cols * (CELL + MARGIN) + MARGIN + 10
+    x0 = state.view_size[0] + 10
     y_start = 350
     draw_text(surface, font, f"--- {algo_name} ZAKOŃCZONY ---", x0, y_start)
     draw_text(surface, font, f"Długość ścieżki: {result.path_length()}", x0, y_start + 25)
@@ -209,9 +381,12 @@ def perform_search(surface, state: AppState, font, algo_name: str):
     draw_text(surface, font, f"Odwiedzone: {result.visited_count}", x0, y_start + 65)
     draw_text(surface, font, f"Rozwinięcia: {result.expanded_count}", x0, y_start + 85)
     draw_text(surface, font, f"Czas: {result.time_s * 1000:.2f} ms", x0, y_start + 105)
-    draw_text(surface, font, "", x0, y_start + 130)
-    draw_text(surface, font, "Naciśnij klawisz aby kontynuować", x0, y_start + 150)
-    pygame.display.flip()
+    st = state.cache.stats()
+    draw_text(surface, font, f"Cache: trafienia {st.hits} / chybienia {st.misses}", x0, y_start + 125)
+    if isinstance(result, MultiGoalResult) and result.nearest is not None:
+        draw_text(surface, font, f"Najbliższy z {len(g.all_goals())} celów: {result.nearest}", x0, y_start + 145)
+    draw_text(surface, font, "Naciśnij klawisz aby kontynuować", x0, y_start + 170)
+    renderer.present(surface, [panel_rect(state)])
 
     # Czekaj na naciśnięcie klawisza
     waiting = True
@@ -223,6 +398,7 @@ def perform_search(surface, state: AppState, font, algo_name: str):
             elif event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
                 waiting = False
         pygame.time.delay(10)
+    renderer.clear_overlays()
 
 def show_plots(paths: dict):
     # Pokaż zapisane obrazy w prostym oknie pygame (sekwencyjnie)
@@ -268,95 +444,158 @@ def show_plots(paths: dict):
     pygame.display.set_caption(old_caption)
     return screen
 
-def main():
+def main(cols: Optional[int] = None, rows: Optional[int] = None, map_path: Optional[str] = None):
+    """Okno aplikacji; `map_path` wczytuje mapę (mapio), `cols`/`rows` – pusta plansza
+    innego rozmiaru niż domyślny TrialConfig."""
     pygame.init()
     cfg = TrialConfig()
-    state = AppState(config=cfg)
-    W = state.cols*(CELL+MARGIN)+MARGIN + PANEL_W
-    H = state.rows*(CELL+MARGIN)+MARGIN
+    if cols or rows:
+        cfg = TrialConfig(cols=cols or cfg.cols, rows=rows or cfg.rows)
+    grid = None
+    if map_path:
+        from app.utils.mapio import load_map
+        grid = load_map(Path(map_path))
+    state = AppState(config=cfg, grid=grid)
+    W = state.view_size[0] + PANEL_W
+    H = state.view_size[1]
     screen = pygame.display.set_mode((W, H))
     pygame.display.set_caption("Porównanie BFS / Dijkstra / A* (pygame)")
     font = pygame.font.SysFont("consolas", FONT_SIZE)
 
     clock = pygame.time.Clock()
     painting_weights = False
+    state.renderer = GridRenderer(state.grid, CELL, MARGIN, view_size=state.view_size)
+    full_redraw = True
+    panel_dirty = True
 
     while True:
-        screen.fill((15,15,20))
-        draw_grid(screen, state, font)
-        pygame.draw.rect(screen, (25,25,30), pygame.Rect(state.cols*(CELL+MARGIN)+MARGIN, 0, PANEL_W, H))
-        draw_overlay(screen, font, state)
-        pygame.display.flip()
-
-
+        # rysuj tylko to, co się zmieniło (brudne prostokąty), a nie całą planszę co klatkę
+        if full_redraw:
+            screen.fill((15,15,20))
+            state.renderer.invalidate()
+            panel_dirty = True
+            full_redraw = False
+        extra = [draw_panel(screen, font, state)] if panel_dirty else []
+        panel_dirty = state.task is not None  # pasek postępu odświeżany co klatkę
+        state.renderer.present(screen, extra)
+
+        # zdarzenia od zadania w tle
+        task = state.task
+        for ev in (task.poll() if task is not None else []):
+            if ev.kind == "progress":
+                continue
+            state.task = None
+            panel_dirty = True
+            if ev.kind == "error":
+                show_message(screen, font, state, f"Nie można uruchomić: {ev.message}")
+            elif ev.kind == "done":
+                state.last_results = ev.payload
+                screen = show_plots(ev.payload)
+                full_redraw = True
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
+            elif handle_view_event(event, state):
+                panel_dirty = True
             elif event.type == pygame.KEYDOWN:
+                panel_dirty = True
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit(); sys.exit(0)
+                    if state.task is not None:
+                        # anuluj zadanie; wątek kończy się sam, jego wynik jest ignorowany
+                        state.task.cancel()
+                        state.task = None
+                    else:
+                        pygame.quit(); sys.exit(0)
                 elif event.key == pygame.K_h:
                     state.grid.diag = not state.grid.diag
+                    if state.flow_on:
+                        update_flow(state)
                 elif event.key == pygame.K_r:
                     state.grid.walls.clear()
                     state.grid.clear_weights()
+                    state.grid.clear_terrain()
+                    state.renderer.rebuild()
+                    if state.flow_on:
+                        update_flow(state)
                 elif event.key == pygame.K_w:
                     state.grid.randomize_walls(state.config.wall_density)
+                    state.renderer.rebuild()
+                    if state.flow_on:
+                        update_flow(state)
+                elif event.key == pygame.K_f:
+                    state.flow_on = not state.flow_on
+                    update_flow(state)
                 elif event.key == pygame.K_g:
                     painting_weights = not painting_weights
+                    state.terrain_brush = 0
+                elif event.key == pygame.K_t:
+                    # kolejny teren do malowania; po ostatnim powrót do ścian/wag
+                    state.terrain_brush = (state.terrain_brush + 1) % len(TERRAINS)
+                    painting_weights = False
                 elif event.key == pygame.K_1:
                     perform_search(screen, state, font, "BFS")
+                    full_redraw = True
                 elif event.key == pygame.K_2:
                     perform_search(screen, state, font, "Dijkstra")
+                    full_redraw = True
                 elif event.key == pygame.K_3:
                     perform_search(screen, state, font, "A*")
+                    full_redraw = True
                 elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:
-                    state.speed_ms = max(0, state.speed_ms - 5)
+                    change_speed(state, +1)
                 elif event.key == pygame.K_MINUS:
-                    state.speed_ms = min(200, state.speed_ms + 5)
+                    change_speed(state, -1)
                 elif event.key == pygame.K_SPACE:
                     state.paused = not state.paused
                 elif event.key == pygame.K_s:
                     if state.paused:
                         state.step_once = True
                 elif event.key == pygame.K_b:
-                    # uruchom benchmarki
-                    cfg = TrialConfig(
-                        diag=state.grid.diag,
-                        weight_density=0.10 if state.grid.weighted else 0.0
-                    )
-                    results = run_bench(cfg)
-                    out_dir = str(Path.cwd() / "benchmark_plots")
-                    paths = save_all_plots(results, out_dir)
-                    state.last_results = paths
-                    screen = show_plots(paths)
+                    # uruchom benchmarki w tle
+                    start_benchmark(state)
                 elif event.key == pygame.K_m:
                     if state.last_results:
                         screen = show_plots(state.last_results)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                x, y = event.pos
-                cx = x // (CELL+MARGIN)
-                cy = y // (CELL+MARGIN)
-                if 0 <= cx < state.cols and 0 <= cy < state.rows:
-                    c = (cx, cy)
+                        full_redraw = True
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+                c = state.renderer.cell_at(event.pos)
+                if c is not None:
+                    touched = [c, state.grid.start]
                     if event.button == 1:  # LPM
-                        if painting_weights:
+                        if state.terrain_brush:
+                            # maluj/wymazuj teren (ściany i punkty start/cel bez zmian)
+                            g = state.grid
+                            if g.terrain.get(c) == state.terrain_brush:
+                                g.terrain.pop(c, None)
+                            elif c != g.start and c not in g.all_goals() and c not in g.walls:
+                                g.terrain[c] = state.terrain_brush
+                        elif painting_weights:
                             # maluj/wymazuj wagi
                             if c in state.grid.weighted:
                                 state.grid.weighted.pop(c, None)
                             else:
-                                if c != state.grid.start and c != state.grid.goal and c not in state.grid.walls:
+                                if c != state.grid.start and c not in state.grid.all_goals() and c not in state.grid.walls:
                                     state.grid.weighted[c] = 5
                         else:
                             # maluj ściany
-                            if c == state.grid.start or c == state.grid.goal:
+                            if c == state.grid.start or c in state.grid.all_goals():
                                 pass
                             elif c in state.grid.walls:
                                 state.grid.walls.remove(c)
                             else:
                                 if c not in state.grid.weighted:
                                     state.grid.walls.add(c)
+                                    state.grid.terrain.pop(c, None)
+                    elif event.button == 3 and pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                        # Shift+PPM: dodaj/usuń dodatkowy cel (wyszukiwanie najbliższego celu)
+                        g = state.grid
+                        if c in g.extra_goals:
+                            g.extra_goals.remove(c)
+                        elif g.goal is not None and c not in (g.start, g.goal):
+                            g.extra_goals.append(c)
+                            g.walls.discard(c)
+                            g.weighted.pop(c, None)
                     elif event.button == 3:  # PPM
                         if state.grid.start is None:
                             state.grid.start = c
@@ -371,6 +610,12 @@ def main():
                             state.grid.start = c
                             state.grid.walls.discard(c)
                             state.grid.weighted.pop(c, None)
+                    for t in touched:
+                        if t is not None:
+                            state.renderer.refresh_cell(t)
+                    if state.flow_on:
+                        update_flow(state)
+                    panel_dirty = True
 
         clock.tick(60)
 
@@ -0,0 +1,400 @@
+
+from __future__ import annotations
+import pygame
+from typing import Iterable, List, Optional, Set, Tuple
+from app.algorithms.grid import Grid, Coord
+from app.algorithms.flow_field import FlowField
+from app.algorithms.terrain import ROAD, FOREST, SAND, SWAMP
+from app.gui.viewport import Viewport
+
+try:
+    import numpy as np
+    import pygame.surfarray  # wymaga numpy
+    _HAS_SURFARRAY = True
+except ImportError:  # pragma: no cover - bez numpy zostaje ścieżka draw.rect
+    np = None
+    _HAS_SURFARRAY = False
+
+COLOR_BG = (15, 15, 20)
+COLOR_EMPTY = (30, 30, 30)
+COLOR_WALL = (100, 100, 100)
+COLOR_WEIGHT = (60, 60, 120)
+COLOR_TERRAIN = {ROAD: (90, 75, 55), FOREST: (30, 75, 40), SAND: (120, 110, 60), SWAMP: (45, 70, 70)}
+COLOR_EXPLORED = (80, 80, 160)
+COLOR_PATH = (200, 200, 60)
+COLOR_START = (40, 140, 40)
+COLOR_GOAL = (160, 50, 50)
+COLOR_FLOW = (230, 140, 40)
+FLOW_ARROW_PX = 14  # minimalny odstęp strzałek pola przepływu (co k-te pole przy małych polach)
+MIP_TILE = 64       # bok kafelka (w polach), z jaką dokładnością śledzone są zmiany dla mipmap
+MARKER_PX = 3       # minimalny rozmiar znacznika startu/celu przy małej skali
+
+
+def _down(a):
+    """Poziom mipmapy: średnia bloków 2x2 (przy nieparzystym boku powielana jest krawędź)."""
+    if a.shape[0] % 2:
+        a = np.concatenate([a, a[-1:]], axis=0)
+    if a.shape[1] % 2:
+        a = np.concatenate([a, a[:, -1:]], axis=1)
+    s = a[0::2, 0::2].astype(np.uint16)
+    s += a[1::2, 0::2]
+    s += a[0::2, 1::2]
+    s += a[1::2, 1::2]
+    return ((s + 2) >> 2).astype(np.uint8)
+
+
+class GridRenderer:
+    """Renderer w trybie zachowanym (retained mode) dla planszy oglądanej przez `Viewport`.
+
+    Stan pól trzymany jest w tablicach kolorów cols x rows (`_base` – pola, ściany, wagi,
+    tereny, start/cel; `_colors` – to samo z nakładkami odwiedzonych i ścieżki), a `scene`
+    ma rozmiar okna widoku i zawiera tylko widoczny fragment planszy (+ strzałki pola
+    przepływu). Przy skali >= 1 piksel/pole zmiany pojedynczych pól rysowane są od razu na
+    scenie jako brudne prostokąty, które `present()` wysyła na ekran przez
+    `display.update(rects)`. Przy mniejszej skali jeden piksel to blok 2^k x 2^k pól:
+    scena jest kopią wycinka poziomu k piramidy mipmap (średnie bloków 2x2), budowanej
+    leniwie i aktualizowanej tylko w kafelkach MIP_TILE x MIP_TILE, w których coś się
+    zmieniło – przeglądanie map 4000 x 4000 wraz ze śladem wyszukiwania nie przelicza
+    całej planszy co klatkę. Ścieżka i start/cel są wtedy dorysowywane wektorowo.
+    """
+
+    def __init__(self, grid: Grid, cell: int, margin: int, use_surfarray: bool = True,
+                 view_size: Optional[Tuple[int, int]] = None):
+        self.grid = grid
+        self.cell = cell
+        self.margin = margin
+        self.use_surfarray = use_surfarray and _HAS_SURFARRAY
+        step = cell + margin
+        natural = (grid.cols * step + margin, grid.rows * step + margin)
+        w, h = view_size or natural
+        self.view = Viewport(grid.cols, grid.rows, w, h, margin, scale=step)
+        if natural[0] > w or natural[1] > h:
+            self.view.fit(step)
+        self.explored: Set[Coord] = set()
+        self.path: List[Coord] = []
+        self.flow: Optional[FlowField] = None
+        self._dirty: List[pygame.Rect] = []
+        self._full = True
+        self._stale = True   # scena wymaga ponownego złożenia (widok lub wiele pól się zmieniło)
+        self._index_cache: Optional[Tuple] = None
+        self._base = None
+        self._colors = None
+        self._mips: List = []
+        self._mip_dirty: Set[Tuple[int, int]] = set()
+        self.scene = pygame.Surface(self.size)
+        self.rebuild()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self.view.width, self.view.height)
+
+    def cell_rect(self, c: Coord) -> pygame.Rect:
+        return pygame.Rect(self.view.cell_rect(c))
+
+    def cell_at(self, pos: Tuple[int, int]) -> Optional[Coord]:
+        """Pole pod pikselem okna widoku (None poza planszą)."""
+        return self.view.cell_at(*pos)
+
+    def base_color(self, c: Coord) -> Tuple[int, int, int]:
+        g = self.grid
+        if c == g.start:
+            return COLOR_START
+        if c == g.goal or c in g.extra_goals:
+            return COLOR_GOAL
+        if c in g.walls:
+            return COLOR_WALL
+        if c in g.weighted:
+            return COLOR_WEIGHT
+        t = g.terrain.get(c)
+        if t:
+            return COLOR_TERRAIN.get(t, COLOR_EMPTY)
+        return COLOR_EMPTY
+
+    def cell_color(self, c: Coord) -> Tuple[int, int, int]:
+        """Kolor pola z nakładkami (ścieżka przed odwiedzonymi; start/cel zawsze widoczne)."""
+        color = self.base_color(c)
+        if c != self.grid.start and c not in self.grid.all_goals():
+            if c in self.path:
+                color = COLOR_PATH
+            elif c in self.explored:
+                color = COLOR_EXPLORED
+        return color
+
+    # --- widok ---
+
+    def zoom(self, steps: int, pos: Optional[Tuple[int, int]] = None) -> bool:
+        """Przybliża (steps > 0) lub oddala widok wokół piksela `pos` (domyślnie środek)."""
+        changed = self.view.zoom(steps, *(pos or (None, None)))
+        self._stale |= changed
+        return changed
+
+    def pan(self, dx: int, dy: int) -> bool:
+        changed = self.view.pan(dx, dy)
+        self._stale |= changed
+        return changed
+
+    def fit(self) -> None:
+        """Cała plansza w oknie (skala nie większa niż domyślna)."""
+        self.view.fit(self.cell + self.margin)
+        self._stale = True
+
+    # --- pełne przebudowanie warstw ---
+
+    def rebuild(self) -> None:
+        """Przelicza kolory wszystkich pól od zera (po zmianach całej planszy: reset, labirynt)."""
+        v = self.view
+        if (v.cols, v.rows) != (self.grid.cols, self.grid.rows):
+            v.cols, v.rows = self.grid.cols, self.grid.rows
+            v.clamp()
+        if self.use_surfarray:
+            self._base = self._base_colors()
+            self._apply_overlays()
+        self._stale = True
+        self.invalidate()
+
+    def _fill(self, colors, cells: Iterable[Coord], color) -> None:
+        arr = np.fromiter((v for c in cells for v in c), dtype=np.intp)
+        if arr.size:
+            arr = arr.reshape(-1, 2)
+            colors[arr[:, 0], arr[:, 1]] = color
+
+    def _base_colors(self):
+        g = self.grid
+        colors = np.empty((g.cols, g.rows, 3), dtype=np.uint8)
+        colors[:] = COLOR_EMPTY
+        for t, color in COLOR_TERRAIN.items():
+            self._fill(colors, (c for c, tc in g.terrain.items() if tc == t), color)
+        self._fill(colors, g.weighted.keys(), COLOR_WEIGHT)
+        self._fill(colors, g.walls, COLOR_WALL)
+        if g.start:
+            colors[g.start] = COLOR_START
+        for t in g.all_goals():
+            colors[t] = COLOR_GOAL
+        return colors
+
+    def _apply_overlays(self) -> None:
+        """`_colors` = `_base` + odwiedzone + ścieżka (bez zasłaniania startu/celów);
+        piramida mipmap budowana jest od nowa przy najbliższym oddaleniu."""
+        colors = self._base.copy()
+        self._fill(colors, self.explored, COLOR_EXPLORED)
+        self._fill(colors, self.path, COLOR_PATH)
+        g = self.grid
+        for c in ([g.start] if g.start else []) + g.all_goals():
+            colors[c] = self._base[c]
+        self._colors = colors
+        self._mips = [colors]
+        self._mip_dirty.clear()
+
+    # --- mipmapy ---
+
+    def _touch(self, cells: Iterable[Coord]) -> None:
+        """Zaznacza kafelki mipmap do przeliczenia (tylko gdy piramida już istnieje)."""
+        if len(self._mips) > 1:
+            self._mip_dirty.update((x // MIP_TILE, y // MIP_TILE) for x, y in cells)
+
+    def _mip(self, level: int):
+        """Poziom `level` piramidy (0 = `_colors`): zaległe kafelki przeliczane są w górę
+        piramidy, brakujące poziomy budowane z poprzednich."""
+        mips, dirty = self._mips, self._mip_dirty
+        if dirty and len(mips) > 1:
+            g = self.grid
+            tiles = -(-g.cols // MIP_TILE) * -(-g.rows // MIP_TILE)
+            if 4 * len(dirty) > tiles:
+                del mips[1:]   # zmiany w dużej części planszy – taniej zbudować od nowa
+            else:
+                T = MIP_TILE
+                for lvl in range(1, len(mips)):
+                    src, dst = mips[lvl - 1], mips[lvl]
+                    regions = {((tx * T) >> lvl, min(dst.shape[0], (((tx + 1) * T - 1) >> lvl) + 1),
+                                (ty * T) >> lvl, min(dst.shape[1], (((ty + 1) * T - 1) >> lvl) + 1))
+                               for tx, ty in dirty}
+                    for x0, x1, y0, y1 in regions:
+                        dst[x0:x1, y0:y1] = _down(src[2 * x0:2 * x1, 2 * y0:2 * y1])
+        dirty.clear()
+        while len(mips) <= level:
+            mips.append(_down(mips[-1]))
+        return mips[level]
+
+    # --- składanie sceny ---
+
+    def _pixel_index(self):
+        """Dla każdej kolumny/wiersza pikseli widoku: indeks pola oraz maska 'piksel w polu'."""
+        v = self.view
+        key = (v.key(), self.grid.cols, self.grid.rows)
+        if self._index_cache is None or self._index_cache[0] != key:
+            s, gap = int(v.scale), v.gap
+            qx = np.arange(v.width) + v.ox - gap
+            qy = np.arange(v.height) + v.oy - gap
+            in_x = (qx >= 0) & (qx % s < s - gap) & (qx // s < self.grid.cols)
+            in_y = (qy >= 0) & (qy % s < s - gap) & (qy // s < self.grid.rows)
+            cx = np.clip(qx // s, 0, self.grid.cols - 1)
+            cy = np.clip(qy // s, 0, self.grid.rows - 1)
+            self._index_cache = (key, cx, cy, in_x[:, None] & in_y[None, :])
+        return self._index_cache[1:]
+
+    def _pixels(self):
+        """Szybka ścieżka: widoczny fragment liczony wektorowo z tablicy kolorów pól
+        (skala >= 1) albo skopiowany z poziomu mipmapy (skala < 1)."""
+        v = self.view
+        if v.scale >= 1:
+            cx, cy, inside = self._pixel_index()
+            px = self._colors[cx[:, None], cy[None, :]]
+            px[~inside] = COLOR_BG
+            return px
+        sub = self._mip(v.level)[v.ox:v.ox + v.width, v.oy:v.oy + v.height]
+        px = np.empty((v.width, v.height, 3), dtype=np.uint8)
+        px[:] = COLOR_BG
+        px[:sub.shape[0], :sub.shape[1]] = sub
+        return px
+
+    def _compose(self) -> None:
+        v = self.view
+        if self.use_surfarray:
+            pygame.surfarray.blit_array(self.scene, self._pixels())
+        else:
+            # bez NumPy: prostokąt na widoczne pole (przy skali < 1 – pole co 2^k, próbkowanie)
+            self.scene.fill(COLOR_BG)
+            x0, y0, x1, y1 = v.visible()
+            step = 1 << v.level
+            for x in range(x0 - x0 % step, x1, step):
+                for y in range(y0 - y0 % step, y1, step):
+                    pygame.draw.rect(self.scene, self.cell_color((x, y)), self.cell_rect((x, y)))
+        self._draw_markers(self.scene)
+        self._draw_flow(self.scene)
+        self._stale = False
+        self.invalidate()
+
+    def _draw_markers(self, surface: pygame.Surface) -> None:
+        """Przy małej skali: ścieżka jako łamana i start/cele jako znaczniki MARKER_PX –
+        w uśrednionych mipmapach byłyby niewidoczne."""
+        v = self.view
+        if v.scale >= MARKER_PX:
+            return
+        if v.level > 0 and len(self.path) > 1:
+            pygame.draw.lines(surface, COLOR_PATH, False, [v.cell_center(c) for c in self.path])
+        ends = ([(self.grid.start, COLOR_START)] if self.grid.start else [])
+        ends += [(t, COLOR_GOAL) for t in self.grid.all_goals()]
+        for c, color in ends:
+            x, y = v.cell_center(c)
+            r = pygame.Rect(0, 0, MARKER_PX, MARKER_PX)
+            r.center = (int(x), int(y))
+            pygame.draw.rect(surface, color, r)
+
+    def _draw_flow(self, surface: pygame.Surface) -> None:
+        """Strzałki kierunku pola przepływu w widocznym fragmencie; przy małych polach co k-te
+        pole w każdej osi (siatka strzałek zakotwiczona w planszy, nie w oknie)."""
+        ff = self.flow
+        if ff is None:
+            return
+        v = self.view
+        step = v.scale
+        k = max(1, int(-(-FLOW_ARROW_PX // step)))
+        half = k * step * 0.4
+        x0, y0, x1, y1 = v.visible()
+        fx = x0 + (k // 2 - x0) % k
+        fy = y0 + (k // 2 - y0) % k
+        for y in range(fy, min(y1, ff.rows), k):
+            for x in range(fx, min(x1, ff.cols), k):
+                d = ff.direction((x, y))
+                if d is None:
+                    continue
+                dx, dy = d
+                n = (dx * dx + dy * dy) ** 0.5
+                ux, uy = dx / n * half, dy / n * half
+                cx, cy = v.cell_center((x, y))
+                tail = (cx - ux, cy - uy)
+                tip = (cx + ux, cy + uy)
+                pygame.draw.line(surface, COLOR_FLOW, tail, tip)
+                # grot: dwa krótkie odcinki odchylone od kierunku
+                hx, hy = ux * 0.5, uy * 0.5
+                pygame.draw.line(surface, COLOR_FLOW, tip, (tip[0] - hx - hy, tip[1] - hy + hx))
+                pygame.draw.line(surface, COLOR_FLOW, tip, (tip[0] - hx + hy, tip[1] - hy - hx))
+
+    def set_flow(self, ff: Optional[FlowField]) -> None:
+        """Włącza/wyłącza nakładkę pola przepływu (None = brak)."""
+        self.flow = ff
+        self._stale = True
+
+    # --- zmiany przyrostowe ---
+
+    def _draw_cell(self, c: Coord, color) -> None:
+        """Rysuje pole na scenie (skala >= 1) albo zleca ponowne złożenie sceny."""
+        if self._stale:
+            return
+        if self.view.scale < 1:
+            self._stale = True
+            return
+        rect = self.cell_rect(c).clip(self.scene.get_rect())
+        if rect.w and rect.h:
+            pygame.draw.rect(self.scene, color, rect)
+            self._dirty.append(rect)
+
+    def refresh_cell(self, c: Coord) -> None:
+        """Odświeża pole po edycji planszy (ściana/waga/teren/start/cel)."""
+        color = self.cell_color(c)
+        if self.use_surfarray:
+            self._base[c] = self.base_color(c)
+            self._colors[c] = color
+            self._touch((c,))
+        self._draw_cell(c, color)
+        if self.view.scale < MARKER_PX:
+            self._stale = True   # znaczniki startu/celu
+
+    def mark(self, cells: Iterable[Coord], color) -> None:
+        """Rysuje nakładkę (odwiedzone/ścieżka) na wybranych polach sceny."""
+        overlay = self.path if color == COLOR_PATH else self.explored
+        ends = {self.grid.start, *self.grid.all_goals()}
+        drawn = []
+        for c in cells:
+            if color == COLOR_PATH:
+                overlay.append(c)
+            else:
+                overlay.add(c)
+            if c not in ends:
+                drawn.append(c)
+        if self.use_surfarray:
+            self._fill(self._colors, drawn, color)
+            self._touch(drawn)
+        for c in drawn:
+            self._draw_cell(c, color)
+
+    def set_overlays(self, explored: Iterable[Coord], path: Iterable[Coord]) -> None:
+        """Ustawia całe nakładki naraz (np. wynik zakończonego wyszukiwania)."""
+        self.explored = set(explored)
+        self.path = list(path)
+        if self.use_surfarray:
+            self._apply_overlays()
+        self._stale = True
+
+    def clear_overlays(self) -> None:
+        if self.explored or self.path:
+            self.explored.clear()
+            self.path = []
+            if self.use_surfarray:
+                self._apply_overlays()
+            self._stale = True
+
+    def invalidate(self) -> None:
+        """Wymusza wysłanie całej sceny przy najbliższym present()."""
+        self._full = True
+        self._dirty.clear()
+
+    # --- prezentacja ---
+
+    def present(self, screen: pygame.Surface, extra: Optional[List[pygame.Rect]] = None) -> None:
+        """Składa scenę, jeśli widok lub wiele pól się zmieniło, i wysyła na ekran tylko
+        brudne fragmenty."""
+        if self._stale:
+            self._compose()
+        rects = list(extra or [])
+        if self._full:
+            screen.blit(self.scene, (0, 0))
+            rects.append(self.scene.get_rect())
+            self._full = False
+        elif self._dirty:
+            for r in self._dirty:
+                screen.blit(self.scene, r, r)
+            rects.extend(self._dirty)
+        self._dirty = []
+        if rects:
+            pygame.display.update(rects)
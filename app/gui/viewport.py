@@ -0,0 +1,150 @@
+"""Widok planszy: przesuwanie i skalowanie bez rysowania całej planszy.
+
+`Viewport` przelicza współrzędne ekranu na pola i z powrotem dla okna `width` x `height`
+pikseli. Skala (piksele na pole) przyjmuje wartości z `ZOOMS`:
+
+- >= 1 – pole to kwadrat `scale` pikseli (od GRID_PX w górę z przerwą `margin` między
+  polami, jak dotąd CELL + MARGIN),
+- < 1 – potęgi 1/2: jeden piksel to blok 2^level x 2^level pól, czyli jeden teksel
+  poziomu `level` piramidy mipmap renderera (GridRenderer._mip).
+
+Przesunięcie (`ox`, `oy`) to lewy górny róg okna w pikselach „świata” przy bieżącej skali,
+zawsze całkowite – pola nie drgają przy przesuwaniu. Moduł nie importuje pygame.
+"""
+from __future__ import annotations
+from typing import Optional, Tuple
+
+from app.algorithms.grid import Coord
+
+ZOOMS = (1 / 64, 1 / 32, 1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+GRID_PX = 4   # od tej skali między polami rysowana jest przerwa (siatka)
+
+
+class Viewport:
+    def __init__(self, cols: int, rows: int, width: int, height: int, margin: int = 1,
+                 scale: float = 4):
+        self.cols = cols
+        self.rows = rows
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.zi = min(range(len(ZOOMS)), key=lambda i: abs(ZOOMS[i] - scale))
+        self.ox = 0
+        self.oy = 0
+
+    # --- skala ---
+
+    @property
+    def scale(self) -> float:
+        return ZOOMS[self.zi]
+
+    @property
+    def level(self) -> int:
+        """Poziom mipmapy: 0 przy skali >= 1, inaczej log2(pola na piksel)."""
+        s = self.scale
+        return 0 if s >= 1 else (round(1 / s)).bit_length() - 1
+
+    @property
+    def gap(self) -> int:
+        return self.margin if self.scale >= GRID_PX else 0
+
+    @property
+    def world_size(self) -> Tuple[int, int]:
+        """Rozmiar całej planszy w pikselach przy bieżącej skali."""
+        if self.scale >= 1:
+            s, g = int(self.scale), self.gap
+            return self.cols * s + g, self.rows * s + g
+        L = self.level
+        return -(-self.cols >> L), -(-self.rows >> L)
+
+    def key(self) -> Tuple[int, int, int, int, int]:
+        return (self.zi, self.ox, self.oy, self.width, self.height)
+
+    # --- przeliczenia ---
+
+    def cell_at(self, px: int, py: int) -> Optional[Coord]:
+        """Pole pod pikselem okna (None poza planszą)."""
+        if not (0 <= px < self.width and 0 <= py < self.height):
+            return None
+        if self.scale >= 1:
+            s, g = int(self.scale), self.gap
+            qx, qy = px + self.ox - g, py + self.oy - g
+            if qx < 0 or qy < 0:
+                return None
+            c = (qx // s, qy // s)
+        else:
+            L = self.level
+            c = ((px + self.ox) << L, (py + self.oy) << L)
+        return c if c[0] < self.cols and c[1] < self.rows else None
+
+    def cell_rect(self, c: Coord) -> Tuple[int, int, int, int]:
+        """Prostokąt pola w oknie (x, y, w, h); przy skali < 1 – piksel jego bloku."""
+        x, y = c
+        if self.scale >= 1:
+            s, g = int(self.scale), self.gap
+            return (x * s + g - self.ox, y * s + g - self.oy, s - g, s - g)
+        L = self.level
+        return ((x >> L) - self.ox, (y >> L) - self.oy, 1, 1)
+
+    def cell_center(self, c: Coord) -> Tuple[float, float]:
+        x, y = c
+        if self.scale >= 1:
+            s, g = int(self.scale), self.gap
+            return (x * s + g + (s - g) / 2 - self.ox, y * s + g + (s - g) / 2 - self.oy)
+        s = self.scale
+        return ((x + 0.5) * s - self.ox, (y + 0.5) * s - self.oy)
+
+    def visible(self) -> Tuple[int, int, int, int]:
+        """Zakres widocznych pól (x0, y0, x1, y1), końce wyłączne."""
+        s = self.scale
+        x0 = max(0, int(self.ox / s))
+        y0 = max(0, int(self.oy / s))
+        x1 = min(self.cols, int((self.ox + self.width) / s) + 1)
+        y1 = min(self.rows, int((self.oy + self.height) / s) + 1)
+        return x0, y0, x1, y1
+
+    # --- zmiany widoku ---
+
+    def clamp(self) -> None:
+        """Plansza mniejsza niż okno leży w lewym górnym rogu; większa – nie odjeżdża poza okno."""
+        ww, wh = self.world_size
+        self.ox = max(0, min(self.ox, ww - self.width))
+        self.oy = max(0, min(self.oy, wh - self.height))
+
+    def pan(self, dx: int, dy: int) -> bool:
+        before = (self.ox, self.oy)
+        self.ox += int(dx)
+        self.oy += int(dy)
+        self.clamp()
+        return (self.ox, self.oy) != before
+
+    def zoom(self, steps: int, px: Optional[int] = None, py: Optional[int] = None) -> bool:
+        """Zmienia skalę o `steps` pozycji ZOOMS, utrzymując pod pikselem (px, py)
+        (domyślnie środek okna) ten sam punkt planszy."""
+        zi = max(0, min(len(ZOOMS) - 1, self.zi + steps))
+        if zi == self.zi:
+            return False
+        px = self.width // 2 if px is None else px
+        py = self.height // 2 if py is None else py
+        old = self.scale
+        # punkt planszy (w polach) pod kursorem, bez przerwy siatki – różnica < 1 piksela
+        ux, uy = (px + self.ox) / old, (py + self.oy) / old
+        self.zi = zi
+        self.ox = round(ux * self.scale - px)
+        self.oy = round(uy * self.scale - py)
+        self.clamp()
+        return True
+
+    def fit(self, max_scale: float = GRID_PX) -> None:
+        """Największa skala (<= max_scale), przy której cała plansza mieści się w oknie."""
+        self.zi = 0
+        for i, s in enumerate(ZOOMS):
+            if s > max_scale:
+                break
+            self.zi = i
+            ww, wh = self.world_size
+            if ww > self.width or wh > self.height:
+                self.zi = max(0, i - 1)
+                break
+        self.ox = self.oy = 0
+        self.clamp()
@@ -0,0 +1,96 @@
+
+from __future__ import annotations
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+# Funkcja zadania: fn(progress, should_stop) -> wynik
+#   progress(done, total, message) – raport postępu (total=0 → postęp nieokreślony)
+#   should_stop() – True, gdy użytkownik anulował zadanie
+ProgressFn = Callable[[int, int, str], None]
+TaskFn = Callable[[ProgressFn, Callable[[], bool]], Any]
+
+
+@dataclass
+class WorkerEvent:
+    kind: str            # "progress" | "done" | "error" | "cancelled"
+    done: int = 0
+    total: int = 0
+    message: str = ""
+    payload: Any = None
+
+
+class BackgroundTask:
+    """Zadanie (wyszukiwanie/benchmark) wykonywane w wątku roboczym poza pętlą zdarzeń pygame.
+
+    Wątek przesyła zdarzenia przez kolejkę; UI odbiera je w każdej klatce przez `poll()`.
+    Anulowanie jest kooperacyjne: `cancel()` ustawia flagę sprawdzaną przez funkcję zadania.
+    """
+
+    def __init__(self, name: str, fn: TaskFn):
+        self.name = name
+        self._fn = fn
+        self._events: "queue.Queue[WorkerEvent]" = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"worker-{name}", daemon=True)
+        self.done = 0
+        self.total = 0
+        self.message = ""
+        self.started_at = 0.0
+        self.finished = False
+
+    def start(self) -> "BackgroundTask":
+        self.started_at = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def running(self) -> bool:
+        return not self.finished
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Postęp 0..1 albo None, gdy zadanie nie zna całkowitej liczby kroków."""
+        return self.done / self.total if self.total > 0 else None
+
+    def _progress(self, done: int, total: int, message: str = "") -> None:
+        self._events.put(WorkerEvent("progress", done, total, message))
+
+    def _run(self) -> None:
+        try:
+            payload = self._fn(self._progress, self._cancel.is_set)
+        except Exception as e:
+            traceback.print_exc()
+            self._events.put(WorkerEvent("error", message=str(e)))
+            return
+        kind = "cancelled" if self._cancel.is_set() else "done"
+        self._events.put(WorkerEvent(kind, payload=payload))
+
+    def poll(self) -> List[WorkerEvent]:
+        """Zwraca zdarzenia, które nadeszły od ostatniego wywołania (bez blokowania)."""
+        out: List[WorkerEvent] = []
+        while True:
+            try:
+                ev = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if ev.kind == "progress":
+                self.done, self.total, self.message = ev.done, ev.total, ev.message
+            else:
+                self.finished = True
+            out.append(ev)
+        return out
@@ -0,0 +1,304 @@
+"""Lokalna usługa zapytań o ścieżki (HTTP na localhost).
+
+    python -m app.service --map labirynt=mapa.grid --port 8765 --workers 4
+
+Endpointy (JSON):
+    GET  /maps                      – załadowane mapy
+    POST /maps     {"id", "path", "diag"?}            – rejestracja mapy z pliku
+    POST /query    {"map", "start": [x,y], "goal": [x,y], "algo"?, "weight"?, "path"?}
+    GET  /metrics                   – liczniki, głębokość kolejki, trafienia cache, opóźnienia p50/p99
+
+Równoległe zapytania zbierane są w krótkim oknie (--batch-ms) i grupowane po
+(mapa, algorytm); każda grupa trafia jako jedno zadanie do puli procesów. Procesy
+robocze trzymają sparsowane mapy w pamięci (klucz: id mapy + czas modyfikacji pliku),
+więc mapa jest wczytywana raz na proces, a nie przy każdym zapytaniu.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.algorithms.grid import Grid
+
+# --- strona procesu roboczego ---
+
+_GRIDS: Dict[Tuple[str, float, bool], Grid] = {}
+_CACHE = None  # ResultCache procesu roboczego (tworzona przy pierwszym zapytaniu)
+# solvery (np. drzewa celów 'tree') żyją między paczkami; klucz: klucz mapy z _GRIDS + (algo, waga),
+# bo heurystyka A* zależy od sąsiedztwa i kosztów konkretnej wczytanej planszy
+_SOLVERS: Dict[Tuple[Tuple[str, float, bool], str, float], Any] = {}
+
+
+def _worker_grid(map_id: str, path: str, diag: bool) -> Tuple[Tuple[str, float, bool], Grid]:
+    from app.utils.mapio import load_map
+    key = (map_id, os.path.getmtime(path), diag)
+    g = _GRIDS.get(key)
+    if g is None:
+        # stara wersja tej samej mapy (i zbudowane dla niej solvery) nie jest już potrzebna
+        for k in [k for k in _GRIDS if k[0] == map_id]:
+            del _GRIDS[k]
+        for k in [k for k in _SOLVERS if k[0][0] == map_id]:
+            del _SOLVERS[k]
+        g = load_map(Path(path), diag=diag)
+        _GRIDS[key] = g
+    return key, g
+
+
+def solve_batch(map_id: str, path: str, diag: bool, algo: str, weight: float,
+                queries: List[Tuple[List[int], List[int], bool]]) -> List[Dict[str, Any]]:
+    """Rozwiązuje grupę zapytań na jednej mapie (wykonywane w procesie roboczym).
+
+    Powtórzone zapytania obsługuje pamięć podręczna wyników procesu (klucz zawiera
+    wersję planszy, więc ponowne wczytanie zmienionej mapy nie zwróci starych ścieżek).
+    """
+    global _CACHE
+    from app.algorithms.cache import ResultCache
+    from app.cli import make_solver, solve
+    if _CACHE is None:
+        _CACHE = ResultCache()
+    key, g = _worker_grid(map_id, path, diag)
+    solver = _SOLVERS.get((key, algo, weight))
+    if solver is None:
+        solver = _SOLVERS[(key, algo, weight)] = make_solver(g, algo, weight)
+    out = []
+    for start, goal, with_path in queries:
+        try:
+            rec, _ = solve(g, solver, tuple(start), tuple(goal), with_path=with_path,
+                           cache=_CACHE, tag=(algo, weight))
+        except Exception as e:  # błędne zapytanie nie może unieważnić reszty paczki
+            rec = {"start": start, "goal": goal, "error": str(e)}
+        out.append(rec)
+    return out
+
+
+def _coord(name: str, v: Any) -> List[int]:
+    if (not isinstance(v, (list, tuple)) or len(v) != 2
+            or any(isinstance(a, bool) or not isinstance(a, int) for a in v)):
+        raise ValueError(f"{name}: oczekiwano [x, y] z liczbami całkowitymi, jest {v!r}")
+    return list(v)
+
+
+# --- strona serwera ---
+
+@dataclass
+class _Request:
+    map_id: str
+    algo: str
+    weight: float
+    start: List[int]
+    goal: List[int]
+    with_path: bool
+    future: Future = field(default_factory=Future)
+    t_enqueued: float = field(default_factory=time.perf_counter)
+
+
+class PathService:
+    """Rejestr map, kolejka zapytań z grupowaniem i pula procesów."""
+
+    def __init__(self, workers: Optional[int] = None, batch_ms: float = 2.0, max_batch: int = 64,
+                 timeout_s: float = 30.0):
+        self.timeout_s = timeout_s  # maksymalny czas oczekiwania handlera HTTP na wynik
+        self.maps: Dict[str, Dict[str, Any]] = {}
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self.batch_s = batch_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.errors = 0
+        self.batches = 0
+        self.cache_hits = 0
+        self._latencies: Deque[float] = deque(maxlen=10_000)
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._dispatcher.start()
+
+    # mapy
+    def add_map(self, map_id: str, path: str, diag: bool = False) -> Dict[str, Any]:
+        from app.utils.mapio import load_map
+        g = load_map(Path(path), diag=diag)  # walidacja i wymiary; procesy wczytają ją same
+        info = {"id": map_id, "path": str(Path(path).resolve()), "diag": g.diag,
+                "cols": g.cols, "rows": g.rows, "walls": len(g.walls)}
+        self.maps[map_id] = info
+        return info
+
+    # zapytania
+    def submit(self, map_id: str, start, goal, algo: str = "astar",
+               weight: float = 1.0, with_path: bool = False) -> Future:
+        from app.cli import ALGORITHMS
+        if map_id not in self.maps:
+            raise LookupError(f"Nieznana mapa: {map_id}")
+        if algo not in ALGORITHMS:
+            raise ValueError(f"Nieznany algorytm: {algo} (dostępne: {', '.join(ALGORITHMS)})")
+        req = _Request(map_id, algo, weight, _coord("start", start), _coord("goal", goal), with_path)
+        self._queue.put(req)
+        return req.future
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            pending = [first]
+            deadline = time.perf_counter() + self.batch_s
+            while len(pending) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            groups: Dict[Tuple[str, str, float], List[_Request]] = {}
+            for req in pending:
+                groups.setdefault((req.map_id, req.algo, req.weight), []).append(req)
+            for (map_id, algo, weight), reqs in groups.items():
+                with self._lock:
+                    self.in_flight += len(reqs)
+                    self.batches += 1
+                try:
+                    info = self.maps[map_id]
+                    fut = self.pool.submit(solve_batch, map_id, info["path"], info["diag"], algo, weight,
+                                           [(r.start, r.goal, r.with_path) for r in reqs])
+                except Exception as e:  # np. pula zamknięta lub uszkodzona – wątek musi przeżyć
+                    fut = Future()
+                    fut.set_exception(e)
+                fut.add_done_callback(lambda f, reqs=reqs: self._complete(f, reqs))
+
+    def _complete(self, fut: Future, reqs: List[_Request]) -> None:
+        now = time.perf_counter()
+        try:
+            results = fut.result()
+        except Exception as e:
+            results = [{"error": str(e)}] * len(reqs)
+        with self._lock:
+            self.in_flight -= len(reqs)
+            for req, rec in zip(reqs, results):
+                self._latencies.append(now - req.t_enqueued)
+                self.completed += 1
+                if "error" in rec:
+                    self.errors += 1
+                elif rec.get("cached"):
+                    self.cache_hits += 1
+        for req, rec in zip(reqs, results):
+            req.future.set_result(rec)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lat = sorted(self._latencies)
+            in_flight = self.in_flight
+            completed, errors, batches = self.completed, self.errors, self.batches
+            cache_hits = self.cache_hits
+
+        def pct(q: float) -> Optional[float]:
+            return lat[min(len(lat) - 1, int(q * len(lat)))] * 1000 if lat else None
+
+        return {
+            "queue_depth": self._queue.qsize(),
+            "in_flight": in_flight,
+            "completed": completed,
+            "errors": errors,
+            "batches": batches,
+            "mean_batch": completed / batches if batches else None,
+            "cache_hits": cache_hits,
+            "cache_hit_rate": cache_hits / completed if completed else None,
+            "latency_ms": {"p50": pct(0.50), "p90": pct(0.90), "p99": pct(0.99)},
+        }
+
+    def shutdown(self) -> None:
+        self.pool.shutdown(cancel_futures=True)
+
+
+def make_handler(service: PathService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):  # bez logu każdego zapytania
+            pass
+
+        def _send(self, code: int, payload: Any) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self) -> Dict[str, Any]:
+            n = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(n) or b"{}")
+
+        def do_GET(self):
+            if self.path == "/maps":
+                self._send(200, list(service.maps.values()))
+            elif self.path == "/metrics":
+                self._send(200, service.metrics())
+            else:
+                self._send(404, {"error": "nieznany endpoint"})
+
+        def do_POST(self):
+            try:
+                data = self._body()
+                if self.path == "/maps":
+                    self._send(200, service.add_map(data["id"], data["path"], bool(data.get("diag", False))))
+                elif self.path == "/query":
+                    fut = service.submit(data["map"], data["start"], data["goal"],
+                                         algo=data.get("algo", "astar"),
+                                         weight=float(data.get("weight", 1.0)),
+                                         with_path=bool(data.get("path", False)))
+                    self._send(200, fut.result(timeout=service.timeout_s))
+                else:
+                    self._send(404, {"error": "nieznany endpoint"})
+            except (FutureTimeout, TimeoutError):  # przed 3.11 to różne klasy
+                self._send(504, {"error": f"brak wyniku w ciągu {service.timeout_s:g} s"})
+            except KeyError as e:
+                self._send(400, {"error": f"brak pola {e.args[0]!r}"})
+            except LookupError as e:
+                self._send(404, {"error": e.args[0] if e.args else str(e)})
+            except (ValueError, OSError, TypeError) as e:
+                self._send(400, {"error": str(e)})
+
+    return Handler
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.service", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--map", action="append", default=[], metavar="ID=PLIK",
+                    help="mapa ładowana przy starcie (można podać wielokrotnie)")
+    ap.add_argument("--diag", action="store_true", help="sąsiedztwo 8 dla map z --map")
+    ap.add_argument("--workers", type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    ap.add_argument("--batch-ms", type=float, default=2.0, help="okno grupowania zapytań [ms]")
+    ap.add_argument("--timeout", type=float, default=30.0,
+                    help="maksymalny czas oczekiwania na wynik zapytania [s] (potem 504)")
+    args = ap.parse_args(argv)
+
+    service = PathService(workers=args.workers, batch_ms=args.batch_ms, timeout_s=args.timeout)
+    for spec in args.map:
+        map_id, _, path = spec.partition("=")
+        info = service.add_map(map_id, path, diag=args.diag)
+        print(f"Mapa {map_id}: {info['cols']}x{info['rows']} ({path})")
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Nasłuch na http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
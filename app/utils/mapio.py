@@ -0,0 +1,133 @@
+
+from __future__ import annotations
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+from app.algorithms.grid import Grid, Coord
+from app.algorithms.terrain import SYMBOLS, TERRAINS
+
+# Format tekstowy: jeden wiersz planszy na linię.
+#   '.'  – pole wolne,  '#'/'@'/'O'/'T'/'W' – ściana,  '1'..'9' – pole ważone (koszt wejścia),
+#   '=' / 'f' / 's' / '~' – teren: droga, las, piasek, bagno (terrain.TERRAINS; bez wagi)
+# Opcjonalny nagłówek MovingAI (type/height/width/map) jest pomijany.
+WALL_CHARS = set("#@OTW")
+
+# Format binarny (.grid): b"GRID", wersja (u8), diag (u8), cols (u32), rows (u32),
+# potem cols*rows bajtów wierszami: 0 – wolne, 255 – ściana, 1..254 – waga pola.
+# Wersja 2 (tylko plansze z terenami) ma po nich drugą warstwę cols*rows bajtów: teren pola.
+MAGIC = b"GRID"
+_HEADER = struct.Struct("<4sBBII")
+WALL_BYTE = 255
+
+
+def load_text_map(path: Path, diag: bool = False) -> Grid:
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    if lines and lines[0].startswith("type"):
+        # nagłówek MovingAI: wszystko do linii "map" włącznie
+        lines = lines[[ln.strip() for ln in lines].index("map") + 1:]
+    rows = [ln.rstrip("\n\r") for ln in lines if ln.strip()]
+    if not rows:
+        raise ValueError(f"Pusta mapa: {path}")
+    cols = max(len(r) for r in rows)
+    g = Grid(cols, len(rows), diag=diag)
+    for y, row in enumerate(rows):
+        for x, ch in enumerate(row):
+            if ch in WALL_CHARS:
+                g.walls.add((x, y))
+            elif ch.isdigit() and ch != "0":
+                g.weighted[(x, y)] = int(ch)
+            elif ch in SYMBOLS:
+                g.terrain[(x, y)] = SYMBOLS[ch]
+    return g
+
+
+def save_text_map(g: Grid, path: Path) -> None:
+    out = []
+    for y in range(g.rows):
+        row = []
+        for x in range(g.cols):
+            c = (x, y)
+            if c in g.walls:
+                row.append("#")
+            elif c in g.weighted:
+                row.append(str(min(9, g.weighted[c])))
+            elif g.terrain.get(c):
+                row.append(TERRAINS[g.terrain[c]].symbol)
+            else:
+                row.append(".")
+        out.append("".join(row))
+    Path(path).write_text("\n".join(out) + "\n", encoding="utf-8")
+
+
+def load_binary_map(path: Path) -> Grid:
+    data = Path(path).read_bytes()
+    magic, version, diag, cols, rows = _HEADER.unpack_from(data)
+    if magic != MAGIC or version not in (1, 2):
+        raise ValueError(f"Nieobsługiwany plik mapy: {path}")
+    n = cols * rows
+    body = data[_HEADER.size:_HEADER.size + n]
+    terrain = data[_HEADER.size + n:_HEADER.size + 2 * n] if version == 2 else b""
+    if len(body) != n or len(terrain) != (n if version == 2 else 0):
+        raise ValueError(f"Uszkodzony plik mapy: {path}")
+    g = Grid(cols, rows, diag=bool(diag))
+    for i, b in enumerate(body):
+        if b:
+            c = (i % cols, i // cols)
+            if b == WALL_BYTE:
+                g.walls.add(c)
+            else:
+                g.weighted[c] = b
+    if terrain:
+        g.terrain = {(i % cols, i // cols): t for i, t in enumerate(terrain) if t}
+    return g
+
+
+def save_binary_map(g: Grid, path: Path) -> None:
+    body = bytearray(g.cols * g.rows)
+    for (x, y), w in g.weighted.items():
+        body[y * g.cols + x] = min(254, w)
+    for (x, y) in g.walls:
+        body[y * g.cols + x] = WALL_BYTE
+    version = 1
+    if g.terrain:
+        version = 2
+        layer = bytearray(g.cols * g.rows)
+        for (x, y), t in g.terrain.items():
+            layer[y * g.cols + x] = t
+        body += layer
+    Path(path).write_bytes(_HEADER.pack(MAGIC, version, int(g.diag), g.cols, g.rows) + bytes(body))
+
+
+def load_map(path: Path, diag: bool = False) -> Grid:
+    """Wczytuje mapę: binarną (.grid) albo tekstową (pozostałe rozszerzenia)."""
+    path = Path(path)
+    if path.suffix == ".grid":
+        g = load_binary_map(path)
+        g.diag = g.diag or diag
+        return g
+    return load_text_map(path, diag=diag)
+
+
+def save_map(g: Grid, path: Path) -> None:
+    path = Path(path)
+    if path.suffix == ".grid":
+        save_binary_map(g, path)
+    else:
+        save_text_map(g, path)
+
+
+def parse_queries(lines: Iterable[str]) -> Iterator[Tuple[Coord, Coord]]:
+    """Zapytania 'sx sy gx gy' (spacje lub przecinki); puste linie i '#' pomijane."""
+    for ln in lines:
+        ln = ln.strip()
+        if not ln or ln.startswith("#"):
+            continue
+        parts = ln.replace(",", " ").split()
+        if len(parts) != 4:
+            raise ValueError(f"Niepoprawne zapytanie: {ln!r}")
+        sx, sy, gx, gy = (int(p) for p in parts)
+        yield (sx, sy), (gx, gy)
+
+
+def free_cells(g: Grid) -> List[Coord]:
+    return [(x, y) for y in range(g.rows) for x in range(g.cols) if (x, y) not in g.walls]
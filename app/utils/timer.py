@@ -1,17 +1,30 @@
-
 import time
 
 class Timer:
-    """Prosty miernik czasu ściennego (monotonicznego)."""
+    """Prosty miernik czasu ściennego (monotonicznego).
+
+    `pause()`/`resume()` pozwalają wyłączyć z pomiaru okresy, w których obliczenia
+    są wstrzymane (np. wyszukiwanie przyrostowe oddające sterowanie wywołującemu).
+    """
     def __init__(self):
         self._start = None
+        self._acc = 0.0
         self.elapsed = 0.0
 
     def __enter__(self):
+        self._acc = 0.0
         self._start = time.perf_counter()
         return self
 
-    def __exit__(self, exc_type, exc, tb):
+    def pause(self):
         if self._start is not None:
-            self.elapsed = time.perf_counter() - self._start
+            self._acc += time.perf_counter() - self._start
             self._start = None
+
+    def resume(self):
+        if self._start is None:
+            self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.pause()
+        self.elapsed = self._acc
@@ -1,4 +1,46 @@
-from app.gui.pygame_app import main
+"""Punkt wejścia aplikacji.
+
+    python run.py              – okno pygame
+    python run.py --map M      – okno pygame z mapą M (.grid/tekstowa; duże mapy: zoom/przesuwanie)
+    python run.py --headless   – benchmark bez GUI (bez importu pygame i matplotlib,
+                                 chyba że podano --plots)
+"""
+import argparse
+
+
+def headless(args) -> None:
+    from app.benchmark.runner import TrialConfig, run_bench
+
+    cfg = TrialConfig(diag=args.diag, wall_density=args.wall_density,
+                      weight_density=args.weight_density, trials=args.trials, seed=args.seed)
+    results = run_bench(cfg)
+    if args.plots:
+        from app.benchmark.plots import save_all_plots
+        save_all_plots(results, args.plots)
+        print(f"Wykresy zapisane do {args.plots}/")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--headless", action="store_true", help="benchmark bez okna pygame")
+    ap.add_argument("--diag", action="store_true", help="sąsiedztwo 8")
+    ap.add_argument("--wall-density", type=float, default=0.25)
+    ap.add_argument("--weight-density", type=float, default=0.0)
+    ap.add_argument("--trials", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=123)
+    ap.add_argument("--plots", metavar="KATALOG", help="zapisz wykresy (ładuje matplotlib)")
+    ap.add_argument("--map", help="GUI: wczytaj mapę (app/utils/mapio.py)")
+    ap.add_argument("--cols", type=int, default=None, help="GUI: szerokość pustej planszy")
+    ap.add_argument("--rows", type=int, default=None, help="GUI: wysokość pustej planszy")
+    args = ap.parse_args()
+
+    if args.headless:
+        headless(args)
+        return
+    # pygame importowany dopiero tutaj – tryb headless go nie ładuje
+    from app.gui.pygame_app import main as gui_main
+    gui_main(cols=args.cols, rows=args.rows, map_path=args.map)
+
 
 if __name__ == "__main__":
     main()
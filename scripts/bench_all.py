@@ -1,14 +1,23 @@
 #!/usr/bin/env python3
-"""Uruchamia benchmark dla 4 scenariuszy i zapisuje wykresy + CSV."""
+"""Uruchamia benchmark dla 6 scenariuszy (S5/S6: mieszanka terenów) i zapisuje wykresy + CSV."""
 
+import argparse
 import csv
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from app.benchmark.runner import TrialConfig, run_bench
-from app.benchmark.plots import save_all_plots
+from dataclasses import replace
+
+from app.algorithms.astar import TIE_BREAKS
+from app.algorithms.terrain import MIXED
+from app.benchmark.corpus import CORPUS_DIR, CorpusKey, GridCorpus
+from app.benchmark.dashboard import LiveDashboard
+from app.benchmark.profiling import MODES, AlgoProfiler
+from app.benchmark.runner import TrialConfig, run_bench, run_ara_bench
+from app.benchmark.plots import (save_all_plots, save_epsilon_tradeoff, save_tie_break_report,
+                                 tie_break_summary)
 
 SCENARIOS = {
     "S1": TrialConfig(
@@ -27,6 +36,16 @@ SCENARIOS = {
         cols=100, rows=100, trials=30, seed=123,
         diag=True, wall_density=0.25, weight_density=0.10, weight_value=5,
     ),
+    # droga, las, piasek i bagno (terrain.MIXED): koszty ruchu od 0,5 do 5 – heurystyka
+    # skalowana przez min_step_cost() = 0,5, więc A* traci część przewagi nad Dijkstrą
+    "S5": TrialConfig(
+        cols=100, rows=100, trials=30, seed=123,
+        diag=False, wall_density=0.25, weight_density=0.0, terrain_mix=MIXED,
+    ),
+    "S6": TrialConfig(
+        cols=100, rows=100, trials=30, seed=123,
+        diag=True, wall_density=0.25, weight_density=0.0, terrain_mix=MIXED,
+    ),
 }
 
 CSV_COLUMNS = [
@@ -61,22 +80,80 @@ def save_csv(scenario_name: str, results: dict, out_dir: Path) -> None:
 
 
 def main() -> None:
-    base_dir = Path(__file__).resolve().parent.parent
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--out-dir", type=Path, default=Path(__file__).resolve().parent.parent,
+                    help="katalog na bench_S*/ (domyślnie katalog repozytorium)")
+    ap.add_argument("--plots", choices=["separate", "summary", "both"], default="separate",
+                    help="osobne PNG, jeden rysunek zbiorczy albo oba (domyślnie separate)")
+    ap.add_argument("--summary-format", choices=["png", "svg", "pdf"], default="svg",
+                    help="format rysunku zbiorczego (domyślnie svg)")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="liczba procesów renderujących wykresy (domyślnie liczba rdzeni)")
+    ap.add_argument("--ara", action="store_true",
+                    help="dodatkowo wykres kompromisu epsilon/czas dla ARA*")
+    ap.add_argument("--ara-eps0", type=float, default=3.0, help="początkowy epsilon ARA* (domyślnie 3.0)")
+    ap.add_argument("--ara-step", type=float, default=0.5, help="krok zmniejszania epsilon (domyślnie 0.5)")
+    ap.add_argument("--tie-breaks", nargs="*", choices=TIE_BREAKS[1:], metavar="REGUŁA",
+                    help="porównaj warianty A* z regułami remisów "
+                         f"({', '.join(TIE_BREAKS[1:])}; bez wartości = wszystkie)")
+    ap.add_argument("--corpus-dir", type=Path, default=CORPUS_DIR,
+                    help="katalog korpusu plansz prób (domyślnie .corpus/)")
+    ap.add_argument("--no-corpus", action="store_true", help="nie zapisuj/nie czytaj korpusu z dysku")
+    ap.add_argument("--live", action="store_true",
+                    help="tabela statystyk aktualizowana po każdej próbie (statystyki strumieniowe)")
+    ap.add_argument("--stop-ci", type=float, default=None, metavar="REL",
+                    help="zakończ scenariusz, gdy 95%% CI średniej rozwinięć każdego algorytmu "
+                         "jest węższe niż ±REL średniej (np. 0.05; włącza --live)")
+    ap.add_argument("--min-trials", type=int, default=10,
+                    help="minimalna liczba prób przed wczesnym zatrzymaniem (domyślnie 10)")
+    ap.add_argument("--profile", nargs="?", const="cprofile", choices=MODES, default=None,
+                    help="profiluj każdy algorytm osobno: cprofile (domyślnie) albo sample "
+                         "(próbkowanie SIGPROF); pliki .prof/.collapsed w bench_S*/profile/")
+    ap.add_argument("--profile-interval", type=float, default=0.001,
+                    help="okres próbkowania w trybie sample [s] (domyślnie 0.001)")
+    args = ap.parse_args()
+    base_dir = args.out_dir
+    # scenariusze różniące się tylko sąsiedztwem (S1/S2, S3/S4, S5/S6) dzielą plansze z korpusu
+    corpus = GridCorpus(None if args.no_corpus else args.corpus_dir)
     summary: dict[str, dict[str, dict[str, int]]] = {}
+    tie_breaks = tuple(TIE_BREAKS[1:] if args.tie_breaks == [] else args.tie_breaks or ())
+    tie_rows: list[tuple[str, str, dict]] = []
 
     for name, cfg in SCENARIOS.items():
         print(f"\n{'='*60}")
         print(f"  Scenariusz {name}: diag={cfg.diag}, "
-              f"wall={cfg.wall_density}, weight={cfg.weight_density}")
+              f"wall={cfg.wall_density}, weight={cfg.weight_density}"
+              + (f", terrain={cfg.terrain_mix}" if cfg.terrain_mix else ""))
         print(f"{'='*60}")
 
-        results = run_bench(cfg)
+        grids = corpus.series(CorpusKey.from_config(cfg), cfg.trials)
+        profiler = AlgoProfiler(args.profile, args.profile_interval) if args.profile else None
+        if args.live or args.stop_ci is not None:
+            dash = LiveDashboard(cfg.trials, stop_rel_ci=args.stop_ci, min_trials=args.min_trials,
+                                 title=name)
+            results = run_bench(replace(cfg, tie_breaks=tie_breaks), grids=grids,
+                                on_trial=dash.on_trial, should_stop=dash.should_stop,
+                                profiler=profiler)
+            dash.close()
+        else:
+            results = run_bench(replace(cfg, tie_breaks=tie_breaks), grids=grids, profiler=profiler)
 
         out_dir = base_dir / f"bench_{name}"
-        out_dir.mkdir(exist_ok=True)
-
-        save_all_plots(results, str(out_dir))
+        out_dir.mkdir(parents=True, exist_ok=True)
+        if profiler is not None:
+            print(profiler.report())
+            profiler.save(out_dir / "profile")
+            print(f"  Profile zapisane do {out_dir / 'profile'}/ (czasy w CSV zawyżone przez profiler)")
+
+        save_all_plots(results, str(out_dir), mode=args.plots,
+                       summary_format=args.summary_format, workers=args.jobs)
         save_csv(name, results, out_dir)
+        if args.ara:
+            ara_rows = run_ara_bench(cfg, eps0=args.ara_eps0, eps_step=args.ara_step, grids=grids)
+            save_epsilon_tradeoff(ara_rows, str(out_dir))
+        if tie_breaks:
+            save_tie_break_report(results, str(out_dir), title=f"– {name}")
+            tie_rows.extend((name, p, st) for p, st in tie_break_summary(results).items())
         print(f"  Wyniki zapisane do {out_dir}/")
 
         summary[name] = {}
@@ -85,6 +162,7 @@ def main() -> None:
             fail = len(trials) - ok
             summary[name][algo] = {"ok": ok, "fail": fail}
 
+    print(f"\nKorpus plansz: {corpus.stats}")
     print(f"\n{'='*60}")
     print("  PODSUMOWANIE")
     print(f"{'='*60}")
@@ -95,6 +173,13 @@ def main() -> None:
         for algo, counts in algos.items():
             print(f"    {algo:10s}: udane={counts['ok']}, nieudane={counts['fail']}")
 
+    if tie_rows:
+        print("\n  Reguły remisów A* (redukcja względem domyślnego A*, dodatnie = lepiej)")
+        print(f"  {'scen.':6s} {'reguła':8s} {'rozwinięcia':>12s} {'czas':>8s} {'nieoptymalne':>13s}")
+        for name, policy, st in tie_rows:
+            print(f"  {name:6s} {policy:8s} {st['expanded_reduction_pct']:+11.1f}% "
+                  f"{st['time_reduction_pct']:+7.1f}% {st['non_optimal']:13d}")
+
 
 if __name__ == "__main__":
     main()
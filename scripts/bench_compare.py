@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Bramka regresji wydajności – porównuje nowy przebieg benchmarku z bazowym.
+
+Przykład:
+    python scripts/bench_all.py --out-dir /tmp/nowy
+    python scripts/bench_compare.py . /tmp/nowy
+
+Argumentami mogą być pliki results.csv albo katalogi zawierające bench_*/results.csv.
+Kod wyjścia 1 oznacza wykrytą regresję.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.benchmark.compare import (
+    Tolerances, compare_results, find_result_files, format_report, load_results,
+)
+
+
+def _load_all(root: Path) -> dict:
+    merged: dict = {}
+    for _, path in find_result_files(root).items():
+        for scenario, algos in load_results(path).items():
+            merged.setdefault(scenario, {}).update(algos)
+    return merged
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("baseline", type=Path, help="bazowe wyniki (CSV lub katalog)")
+    ap.add_argument("current", type=Path, help="nowe wyniki (CSV lub katalog)")
+    ap.add_argument("--time-tol", type=float, default=0.10,
+                    help="dopuszczalny względny wzrost mediany czasu (domyślnie 0.10)")
+    ap.add_argument("--alpha", type=float, default=0.05,
+                    help="poziom istotności testu Manna–Whitneya (domyślnie 0.05)")
+    ap.add_argument("--count-tol", type=float, default=0.0,
+                    help="dopuszczalny względny wzrost liczby rozwinięć/odwiedzin (domyślnie 0)")
+    ap.add_argument("--cost-tol", type=float, default=1e-9,
+                    help="dopuszczalna różnica kosztu ścieżki w próbie (domyślnie 1e-9)")
+    args = ap.parse_args()
+
+    baseline = _load_all(args.baseline)
+    current = _load_all(args.current)
+    if not baseline:
+        print(f"Brak wyników bazowych w {args.baseline}")
+        return 2
+    if not current:
+        print(f"Brak nowych wyników w {args.current}")
+        return 2
+
+    tol = Tolerances(time_rel=args.time_tol, alpha=args.alpha,
+                     count_rel=args.count_tol, cost_abs=args.cost_tol)
+    report = compare_results(baseline, current, tol)
+    print(format_report(report))
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
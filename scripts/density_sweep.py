@@ -3,20 +3,42 @@
 
 Bada jak gęstość przeszkód wpływa na stosunek rozwinięć A*/Dijkstra
 oraz na effective branching factor b* algorytmu A*.
+
+Plansze prób pochodzą z korpusu (.corpus/), więc kolejne uruchomienia ich nie generują.
+Kolumny *_pruned to średnie rozwinięcia z przycinaniem ślepych zaułków (deadends:
+pomijanie bloków poza korytarzem start–cel w drzewie bloków), a mean_pruned_cells – średnia
+liczba wolnych pól wykluczonych z wyszukiwania; koszty ścieżek pozostają optymalne.
+Czas time_s wierszy +prune w wynikach run_bench nie obejmuje budowy dekompozycji planszy –
+ten jednorazowy koszt jest w osobnej kolumnie prep_s.
+
+Z --jobs N gęstości liczone są równolegle; procesy robocze podłączają się do plansz
+w pamięci współdzielonej zamiast je kopiować lub generować. Z --live (tylko sekwencyjnie)
+statystyki każdej gęstości widać na bieżąco, a --stop-ci REL kończy gęstość po zbieżności
+średnich rozwinięć.
+
+--adaptive zastępuje stałą siatkę 7 gęstości x 30 prób przeglądem adaptacyjnym o tym samym
+budżecie (app/benchmark/adaptive.py): próby trafiają do punktów, których CI ilorazu i b*
+jest za szerokie, a nowe gęstości – tam, gdzie krzywa zmienia się najszybciej (okolice progu
+perkolacji). Wyniki: adaptive.csv i adaptive_vs_density.png; --compare liczy dla porównania
+także stałą siatkę z tymi samymi miarami niepewności.
 """
 
+import argparse
 import csv
 import statistics
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-
+from app.benchmark.adaptive import AdaptiveSweep, DensityPoint
+from app.benchmark.corpus import CORPUS_DIR, CorpusKey, GridCorpus, SharedSeries
+from app.benchmark.dashboard import LiveDashboard
+from app.benchmark.profiling import MODES, AlgoProfiler
 from app.benchmark.runner import TrialConfig, run_bench
+from app.benchmark.stats import columns, describe
 
 DENSITIES = [0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40]
 OUT_DIR = Path(__file__).resolve().parent.parent / "density_sweep"
@@ -24,6 +46,12 @@ OUT_DIR = Path(__file__).resolve().parent.parent / "density_sweep"
 CSV_COLUMNS = [
     "wall_density", "mean_expanded_dijkstra", "mean_expanded_astar",
     "ratio", "mean_bstar_astar", "n_successful",
+    "mean_expanded_dijkstra_pruned", "mean_expanded_astar_pruned", "mean_pruned_cells",
+]
+
+ADAPTIVE_COLUMNS = [
+    "wall_density", "trials", "n_successful", "success_rate", "mean_expanded_dijkstra",
+    "mean_expanded_astar", "ratio", "ratio_ci_rel", "mean_bstar_astar", "bstar_ci",
 ]
 
 
@@ -31,19 +59,201 @@ def valid_trials(trials: list[dict]) -> list[dict]:
     return [r for r in trials if "error" not in r and r.get("found")]
 
 
+def _run_shared(cfg: TrialConfig, handle: SharedSeries) -> dict:
+    """Zadanie procesu roboczego: plansze z pamięci współdzielonej, bez kopiowania."""
+    return run_bench(cfg, grids=handle.attach())
+
+
+def _batch_runner(corpus: GridCorpus, profiler: Optional[AlgoProfiler] = None):
+    """run_batch dla AdaptiveSweep: próby first..first+count-1 serii danej gęstości z korpusu
+    (seria rośnie co najmniej dwukrotnie, więc nie jest generowana przy każdej partii)."""
+    def run_batch(wd: float, first: int, count: int) -> dict:
+        cfg = TrialConfig(cols=100, rows=100, diag=False, wall_density=wd, weight_density=0.0,
+                          trials=count, seed=123)
+        s = corpus.series(CorpusKey.from_config(cfg), max(first + count, 2 * first))
+        grids = s.slice(first, first + count)
+        return run_bench(cfg, grids=grids, verbose=False, profiler=profiler)
+    return run_batch
+
+
+def _adaptive_row(p: DensityPoint) -> dict:
+    n = p.n_ok
+    return {
+        "wall_density": p.density, "trials": p.trials, "n_successful": n,
+        "success_rate": p.success_rate,
+        "mean_expanded_dijkstra": sum(p.dijkstra) / n if n else float("nan"),
+        "mean_expanded_astar": sum(p.astar) / n if n else float("nan"),
+        "ratio": p.ratio, "ratio_ci_rel": p.ratio_ci, "mean_bstar_astar": p.bstar_mean,
+        "bstar_ci": p.bstar_ci,
+    }
+
+
+def _print_points(title: str, points: list[DensityPoint]) -> None:
+    print(f"\n{title}")
+    print(f"{'wall_density':>13s} {'próby':>6s} {'n_ok':>5s} {'ratio':>8s} {'±CI %':>7s} "
+          f"{'b*_A*':>8s} {'±CI':>7s}")
+    for p in points:
+        print(f"{p.density:13.4f} {p.trials:6d} {p.n_ok:5d} {p.ratio:8.4f} {100 * p.ratio_ci:7.1f} "
+              f"{p.bstar_mean:8.4f} {p.bstar_ci:7.4f}")
+    cis = [p.ratio_ci for p in points if p.n_ok > 1]
+    if cis:
+        print(f"punkty: {len(points)}, próby: {sum(p.trials for p in points)}, "
+              f"mediana ±CI ilorazu: {100 * statistics.median(cis):.1f}%, "
+              f"najgorsze: {100 * max(cis):.1f}%")
+
+
+def _save_profile(profiler: Optional[AlgoProfiler]) -> None:
+    if profiler is None:
+        return
+    print(profiler.report())
+    profiler.save(OUT_DIR / "profile")
+    print(f"Profile zapisane do {OUT_DIR / 'profile'}/ (wszystkie gęstości razem)")
+
+
+def run_adaptive(args: argparse.Namespace, profiler: Optional[AlgoProfiler] = None) -> None:
+    with GridCorpus(None if args.no_corpus else args.corpus_dir) as corpus:
+        run_batch = _batch_runner(corpus, profiler)
+        sweep = AdaptiveSweep(run_batch, lo=args.range[0], hi=args.range[1], initial=args.initial,
+                              budget=args.budget, batch=args.batch, ratio_target=args.ci_ratio,
+                              bstar_target=args.ci_bstar, min_trials=args.min_trials,
+                              max_trials=args.max_trials, explore=args.explore)
+        sweep.run(lambda sw: print(f"\r  próby {sw.used}/{sw.budget}, punkty {len(sw.points)}",
+                                   end="", flush=True))
+        print()
+        for line in sweep.log:
+            print(f"  {line}")
+        fixed = []
+        if args.compare:
+            per = args.budget // len(DENSITIES)
+            for wd in DENSITIES:
+                p = DensityPoint(wd)
+                p.add(run_batch(wd, 0, per), per)
+                fixed.append(p)
+        print(f"\nKorpus plansz: {corpus.stats}")
+    _save_profile(profiler)
+
+    points = [p for p in sweep.points if p.trials]
+    _print_points(f"Przegląd adaptacyjny (budżet {args.budget} prób)", points)
+    if fixed:
+        _print_points(f"Stała siatka ({len(DENSITIES)} x {args.budget // len(DENSITIES)} prób)", fixed)
+    th = sweep.threshold()
+    if th is not None:
+        print(f"Próg perkolacji (ścieżka w 50% prób): wall_density ≈ {th:.3f}")
+
+    csv_path = OUT_DIR / "adaptive.csv"
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=ADAPTIVE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(_adaptive_row(p) for p in points)
+    print(f"\nCSV zapisany do {csv_path}")
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    ok = [p for p in points if p.n_ok > 1]
+    fig, (ax, ax_b) = plt.subplots(2, 1, figsize=(8, 8), sharex=True)
+    ax.errorbar([p.density for p in ok], [p.ratio for p in ok],
+                yerr=[p.ratio * p.ratio_ci for p in ok], marker="o", capsize=3, color="#2563eb",
+                label="adaptacyjnie (95% CI)")
+    if fixed:
+        fx = [p for p in fixed if p.n_ok > 1]
+        ax.errorbar([p.density for p in fx], [p.ratio for p in fx],
+                    yerr=[p.ratio * p.ratio_ci for p in fx], marker="s", capsize=3, color="gray",
+                    alpha=0.6, linestyle="--", label="stała siatka (95% CI)")
+    ax.set_ylabel("R = expanded A* / expanded Dijkstra")
+    ax.set_title("Przegląd adaptacyjny gęstości przeszkód")
+    ax.grid(True, alpha=0.3)
+    sr = ax.twinx()
+    sr.plot([p.density for p in points], [p.success_rate for p in points], color="#16a34a",
+            alpha=0.6, marker=".", label="odsetek prób ze ścieżką")
+    sr.set_ylabel("odsetek prób ze ścieżką")
+    sr.set_ylim(0, 1.05)
+    if th is not None:
+        ax.axvline(th, linestyle=":", color="#16a34a", label=f"próg 50% ≈ {th:.3f}")
+    handles = ax.get_legend_handles_labels()
+    extra = sr.get_legend_handles_labels()
+    ax.legend(handles[0] + extra[0], handles[1] + extra[1], loc="upper left")
+    ax_b.errorbar([p.density for p in ok], [p.bstar_mean for p in ok], yerr=[p.bstar_ci for p in ok],
+                  marker="s", capsize=3, color="#dc2626")
+    ax_b.set_xlabel("Gęstość przeszkód (wall_density)")
+    ax_b.set_ylabel("Effective branching factor b* (A*)")
+    ax_b.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(OUT_DIR / "adaptive_vs_density.png", dpi=180)
+    plt.close(fig)
+    print(f"Wykres zapisany do {OUT_DIR / 'adaptive_vs_density.png'}")
+
+
 def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", type=int, default=1, help="liczba procesów (domyślnie 1 – sekwencyjnie)")
+    ap.add_argument("--corpus-dir", type=Path, default=CORPUS_DIR,
+                    help="katalog korpusu plansz (domyślnie .corpus/)")
+    ap.add_argument("--no-corpus", action="store_true", help="nie zapisuj/nie czytaj korpusu z dysku")
+    ap.add_argument("--live", action="store_true", help="tabela statystyk na żywo (tylko z --jobs 1)")
+    ap.add_argument("--stop-ci", type=float, default=None, metavar="REL",
+                    help="zakończ gęstość, gdy 95%% CI średnich rozwinięć < ±REL średniej (włącza --live)")
+    ad = ap.add_argument_group("przegląd adaptacyjny")
+    ad.add_argument("--adaptive", action="store_true", help="adaptacyjny dobór gęstości i liczby prób")
+    ad.add_argument("--budget", type=int, default=7 * 30, help="łączna liczba prób (domyślnie 210)")
+    ad.add_argument("--range", type=float, nargs=2, default=[0.10, 0.45], metavar=("OD", "DO"),
+                    help="zakres gęstości (domyślnie 0.10 0.45)")
+    ad.add_argument("--initial", type=int, default=5, help="liczba punktów startowych (domyślnie 5)")
+    ad.add_argument("--batch", type=int, default=10, help="próby dokładane naraz (domyślnie 10)")
+    ad.add_argument("--ci-ratio", type=float, default=0.25,
+                    help="cel: względna połowa 95%% CI ilorazu A*/Dijkstra (domyślnie 0.25)")
+    ad.add_argument("--ci-bstar", type=float, default=0.005,
+                    help="cel: połowa 95%% CI średniego b* (domyślnie 0.005)")
+    ad.add_argument("--min-trials", type=int, default=15, help="próby w nowym punkcie (domyślnie 15)")
+    ad.add_argument("--max-trials", type=int, default=60, help="limit prób na punkt (domyślnie 60)")
+    ad.add_argument("--explore", type=float, default=0.4,
+                    help="udział budżetu na nowe punkty (domyślnie 0.4)")
+    ad.add_argument("--compare", action="store_true",
+                    help="dla porównania przelicz stałą siatkę o tym samym budżecie")
+    ap.add_argument("--profile", nargs="?", const="cprofile", choices=MODES, default=None,
+                    help="profiluj każdy algorytm osobno (cprofile albo sample); wyniki w profile/")
+    ap.add_argument("--profile-interval", type=float, default=0.001,
+                    help="okres próbkowania w trybie sample [s] (domyślnie 0.001)")
+    args = ap.parse_args()
+    if args.profile and args.jobs > 1:
+        ap.error("--profile wymaga --jobs 1")
     OUT_DIR.mkdir(exist_ok=True)
+    profiler = AlgoProfiler(args.profile, args.profile_interval) if args.profile else None
+    if args.adaptive:
+        run_adaptive(args, profiler)
+        return
 
     rows: list[dict] = []
+    configs = [TrialConfig(
+        cols=100, rows=100, diag=False,
+        wall_density=wd, weight_density=0.0,
+        trials=30, seed=123, prune=True,
+    ) for wd in DENSITIES]
+
+    with GridCorpus(None if args.no_corpus else args.corpus_dir) as corpus:
+        if args.jobs > 1:
+            handles = [corpus.share(CorpusKey.from_config(cfg), cfg.trials) for cfg in configs]
+            with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+                all_results = list(ex.map(_run_shared, configs, handles))
+        else:
+            all_results = []
+            for cfg in configs:
+                grids = corpus.series(CorpusKey.from_config(cfg), cfg.trials)
+                if args.live or args.stop_ci is not None:
+                    dash = LiveDashboard(cfg.trials, stop_rel_ci=args.stop_ci,
+                                         title=f"wall_density={cfg.wall_density:.2f}")
+                    all_results.append(run_bench(cfg, grids=grids, on_trial=dash.on_trial,
+                                                 should_stop=dash.should_stop, profiler=profiler))
+                    dash.close()
+                else:
+                    all_results.append(run_bench(cfg, grids=grids, profiler=profiler))
+        print(f"\nKorpus plansz: {corpus.stats}")
+    _save_profile(profiler)
 
-    for wd in DENSITIES:
+    for cfg, results in zip(configs, all_results):
+        wd = cfg.wall_density
         print(f"\n--- wall_density = {wd:.2f} ---")
-        cfg = TrialConfig(
-            cols=100, rows=100, diag=False,
-            wall_density=wd, weight_density=0.0,
-            trials=30, seed=123,
-        )
-        results = run_bench(cfg)
 
         dij = valid_trials(results["Dijkstra"])
         ast = valid_trials(results["A*"])
@@ -53,10 +263,14 @@ def main() -> None:
             print(f"  Brak udanych prób – pomijam.")
             continue
 
-        mean_exp_d = statistics.mean(r["expanded"] for r in dij)
-        mean_exp_a = statistics.mean(r["expanded"] for r in ast)
+        st_d = describe(columns(dij, ["expanded"]))
+        st_a = describe(columns(ast, ["expanded", "b_star"]))
+        mean_exp_d = st_d["expanded"]["mean"]
+        mean_exp_a = st_a["expanded"]["mean"]
         ratio = mean_exp_a / mean_exp_d if mean_exp_d > 0 else float("inf")
-        mean_bstar = statistics.mean(r["b_star"] for r in ast)
+        mean_bstar = st_a["b_star"]["mean"]
+        st_dp = describe(columns(valid_trials(results["Dijkstra+prune"]), ["expanded"]))
+        st_ap = describe(columns(valid_trials(results["A*+prune"]), ["expanded", "pruned_cells"]))
 
         rows.append({
             "wall_density": wd,
@@ -65,6 +279,9 @@ def main() -> None:
             "ratio": ratio,
             "mean_bstar_astar": mean_bstar,
             "n_successful": n_ok,
+            "mean_expanded_dijkstra_pruned": st_dp["expanded"]["mean"],
+            "mean_expanded_astar_pruned": st_ap["expanded"]["mean"],
+            "mean_pruned_cells": st_ap["pruned_cells"]["mean"],
         })
 
     # --- CSV ---
@@ -77,17 +294,24 @@ def main() -> None:
     print(f"\nCSV zapisany do {csv_path}")
 
     # --- Tabelka stdout ---
-    print(f"\n{'='*80}")
+    print(f"\n{'='*110}")
     print(f"{'wall_density':>13s} {'exp_Dijkstra':>13s} {'exp_A*':>13s} "
-          f"{'ratio':>8s} {'b*_A*':>8s} {'n_ok':>5s}")
-    print(f"{'-'*80}")
+          f"{'ratio':>8s} {'b*_A*':>8s} {'n_ok':>5s} {'exp_D_prune':>12s} {'exp_A*_prune':>13s} "
+          f"{'pruned':>8s}")
+    print(f"{'-'*110}")
     for r in rows:
         print(f"{r['wall_density']:13.2f} {r['mean_expanded_dijkstra']:13.1f} "
               f"{r['mean_expanded_astar']:13.1f} {r['ratio']:8.4f} "
-              f"{r['mean_bstar_astar']:8.4f} {r['n_successful']:5d}")
-    print(f"{'='*80}")
+              f"{r['mean_bstar_astar']:8.4f} {r['n_successful']:5d} "
+              f"{r['mean_expanded_dijkstra_pruned']:12.1f} {r['mean_expanded_astar_pruned']:13.1f} "
+              f"{r['mean_pruned_cells']:8.1f}")
+    print(f"{'='*110}")
 
     # --- Wykres 1: ratio vs density ---
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     densities = [r["wall_density"] for r in rows]
     ratios = [r["ratio"] for r in rows]
 
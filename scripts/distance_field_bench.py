@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Pełne pole kosztu dojścia do celu: NumPy (distance_field) vs Dijkstra w czystym Pythonie.
+
+Dla każdego rozmiaru planszy (scenariusze jak S3/S4: ściany 25%, pola ważone 10% o koszcie 5)
+liczone jest pole kosztu dojścia do losowego celu dwiema metodami: pełnym drzewem
+GoalTree (odwrotna Dijkstra aż do wyczerpania kopca) oraz distance_field(reverse=True).
+Wyniki muszą być identyczne (porównanie dokładne, bez tolerancji).
+
+    python scripts/distance_field_bench.py --sizes 100 250 500 1000 [--diag] [--delta 1 4 16]
+"""
+
+import argparse
+import csv
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.algorithms.distance_field import distance_field, field_extent
+from app.algorithms.goal_tree import GoalTree
+from app.algorithms.grid import Grid
+
+OUT_DIR = Path(__file__).resolve().parent.parent / "distance_field"
+
+
+def mismatches(tree: GoalTree, dist) -> int:
+    bad = 0
+    for y in range(tree.grid.rows):
+        for x in range(tree.grid.cols):
+            ref = tree.dist[(x, y)] if (x, y) in tree.settled else math.inf
+            bad += ref != dist[y, x]
+    return bad
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 250, 500, 1000])
+    ap.add_argument("--wall-density", type=float, default=0.25)
+    ap.add_argument("--weight-density", type=float, default=0.10)
+    ap.add_argument("--weight-value", type=int, default=5)
+    ap.add_argument("--diag", action="store_true")
+    ap.add_argument("--delta", type=float, nargs="+", default=[4.0],
+                    help="szerokości kubełka do porównania (1 = min. koszt kroku)")
+    ap.add_argument("--seed", type=int, default=123)
+    ap.add_argument("--out-dir", type=Path, default=OUT_DIR)
+    args = ap.parse_args()
+
+    distance_field(Grid(2, 2), (0, 0))  # rozgrzewka: import NumPy poza pomiarem
+    rows = []
+    total_bad = 0
+    print(f"{'rozmiar':>8s} {'pola':>9s} {'Dijkstra [s]':>13s} {'delta':>6s} {'NumPy [s]':>10s} "
+          f"{'przyspieszenie':>15s} {'niezgodne':>10s}")
+    for size in args.sizes:
+        g = Grid(size, size, diag=args.diag)
+        g.randomize_walls(args.wall_density, seed=args.seed)
+        g.randomize_weights(args.weight_density, weight_value=args.weight_value, seed=args.seed + 1)
+        rng = random.Random(args.seed)
+        goal = rng.choice([(x, y) for y in range(size) for x in range(size) if (x, y) not in g.walls])
+
+        t0 = time.perf_counter()
+        tree = GoalTree(g, goal)
+        tree.settle_until(None)
+        t_ref = time.perf_counter() - t0
+        for delta in args.delta:
+            t0 = time.perf_counter()
+            dist = distance_field(g, goal, reverse=True, delta=delta)
+            t_np = time.perf_counter() - t0
+            bad = mismatches(tree, dist)
+            total_bad += bad
+            reached, max_cost = field_extent(dist)
+            print(f"{size:8d} {reached:9d} {t_ref:13.3f} {delta:6.1f} {t_np:10.3f} "
+                  f"{t_ref / t_np:14.1f}x {bad:10d}")
+            rows.append({"size": size, "diag": args.diag, "reached": reached, "max_cost": round(max_cost, 3),
+                         "delta": delta, "dijkstra_s": round(t_ref, 4), "numpy_s": round(t_np, 4),
+                         "speedup": round(t_ref / t_np, 2), "mismatches": bad})
+    print(f"Niezgodne pola: {total_bad}")
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    out = args.out_dir / f"distance_field{'_diag' if args.diag else ''}.csv"
+    with open(out, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]))
+        w.writeheader()
+        w.writerows(rows)
+    print(f"Wyniki: {out}")
+    return 1 if total_bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Wielu agentów do wspólnego celu: pole przepływu vs A* dla każdego agenta.
+
+Dla każdej liczby agentów losowane są pozycje startowe, a czas łączny mierzony jest dla:
+  - A* per agent (jedno wyszukiwanie na agenta),
+  - pola przepływu: budowa pola raz + ruch wszystkich agentów krok po kroku aż do celu
+    (FlowField.advance – jeden odczyt tablicy na agenta i krok).
+Koszty ścieżek z pola są porównywane z kosztami A* (muszą być równe).
+
+    python scripts/flow_field_bench.py --size 150 --agents 1 10 100 500 [--diag]
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from app.algorithms.astar import astar
+from app.algorithms.flow_field import flow_field
+from app.algorithms.grid import Grid
+from app.utils.heuristics import manhattan, octile, scaled
+from app.utils.mapio import free_cells
+
+OUT_DIR = Path(__file__).resolve().parent.parent / "flow_field"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--size", type=int, default=150)
+    ap.add_argument("--wall-density", type=float, default=0.25)
+    ap.add_argument("--weight-density", type=float, default=0.10)
+    ap.add_argument("--diag", action="store_true")
+    ap.add_argument("--agents", type=int, nargs="+", default=[1, 10, 100, 500])
+    ap.add_argument("--seed", type=int, default=123)
+    ap.add_argument("--out-dir", type=Path, default=OUT_DIR)
+    args = ap.parse_args()
+
+    g = Grid(args.size, args.size, diag=args.diag)
+    g.randomize_walls(args.wall_density, seed=args.seed)
+    g.randomize_weights(args.weight_density, seed=args.seed + 1)
+    h = scaled(octile if g.diag else manhattan, scale=g.min_step_cost())
+    rng = random.Random(args.seed)
+    cells = free_cells(g)
+    g.goal = rng.choice(cells)
+    flow_field(Grid(2, 2), (0, 0))  # rozgrzewka: import NumPy poza pomiarem
+
+    rows = []
+    mismatches = 0
+    print(f"{'agenci':>7s} {'A* [s]':>9s} {'pole: budowa [s]':>17s} {'ruch [s]':>9s} {'kroki':>6s} "
+          f"{'pole razem [s]':>15s} {'przyspieszenie':>15s}")
+    for n in args.agents:
+        starts = [rng.choice(cells) for _ in range(n)]
+
+        t0 = time.perf_counter()
+        costs = []
+        for s in starts:
+            g.start = s
+            costs.append(astar(g, h).total_cost)
+        t_astar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        ff = flow_field(g)
+        t_build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        pos = np.array([y * g.cols + x for x, y in starts])
+        target = g.goal[1] * g.cols + g.goal[0]
+        ticks = 0
+        while True:
+            new = ff.advance(pos)
+            if np.array_equal(new, pos):
+                break
+            pos = new
+            ticks += 1
+        t_move = time.perf_counter() - t0
+
+        for s, c in zip(starts, costs):
+            ref = float(ff.cost[s[1], s[0]])
+            if not (ref == c or abs(ref - c) <= 1e-9):
+                mismatches += 1
+        arrived = int(np.sum(pos == target))
+        t_flow = t_build + t_move
+        print(f"{n:7d} {t_astar:9.3f} {t_build:17.3f} {t_move:9.4f} {ticks:6d} {t_flow:15.3f} "
+              f"{t_astar / t_flow:14.1f}x")
+        rows.append({"agents": n, "astar_s": round(t_astar, 4), "flow_build_s": round(t_build, 4),
+                     "flow_move_s": round(t_move, 5), "ticks": ticks, "arrived": arrived,
+                     "flow_total_s": round(t_flow, 4), "speedup": round(t_astar / t_flow, 2)})
+    print(f"Niezgodne koszty: {mismatches}")
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    out = args.out_dir / f"flow_field{'_diag' if args.diag else ''}.csv"
+    with open(out, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]))
+        w.writeheader()
+        w.writerows(rows)
+    print(f"Wyniki: {out}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Opóźnienie zapytania: drzewo Dijkstry od celu (GoalTreeCache) vs powtarzane A*.
+
+Scenariusz „wiele startów, kilka wspólnych celów” (np. magazyny): dla każdego z --goals
+celów losowanych jest --queries startów. A* liczy każde zapytanie od zera; drzewo celu
+jest rozbudowywane leniwie, a kolejne zapytania to odczyt tablic. Koszty obu metod
+są porównywane (muszą być równe), wyniki trafiają na konsolę i do CSV.
+
+    python scripts/goal_tree_bench.py --size 200 --goals 4 --queries 250 [--diag]
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.algorithms.astar import astar
+from app.algorithms.goal_tree import GoalTreeCache
+from app.algorithms.grid import Grid
+from app.cli import percentile
+from app.utils.heuristics import manhattan, octile, scaled
+from app.utils.mapio import free_cells
+
+OUT_DIR = Path(__file__).resolve().parent.parent / "goal_tree"
+
+
+def summarize(latencies: list[float]) -> dict:
+    lat = sorted(latencies)
+    return {
+        "mean_ms": sum(lat) / len(lat) * 1000,
+        "p50_ms": percentile(lat, 0.50) * 1000,
+        "p99_ms": percentile(lat, 0.99) * 1000,
+        "total_s": sum(lat),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--size", type=int, default=200, help="bok planszy (pola)")
+    ap.add_argument("--wall-density", type=float, default=0.25)
+    ap.add_argument("--weight-density", type=float, default=0.10)
+    ap.add_argument("--diag", action="store_true")
+    ap.add_argument("--goals", type=int, default=4, help="liczba wspólnych celów")
+    ap.add_argument("--queries", type=int, default=250, help="zapytania na cel")
+    ap.add_argument("--max-trees", type=int, default=8, help="limit drzew w pamięci (LRU)")
+    ap.add_argument("--seed", type=int, default=123)
+    ap.add_argument("--out-dir", type=Path, default=OUT_DIR)
+    args = ap.parse_args()
+
+    g = Grid(args.size, args.size, diag=args.diag)
+    g.randomize_walls(args.wall_density, seed=args.seed)
+    g.randomize_weights(args.weight_density, seed=args.seed + 1)
+    rng = random.Random(args.seed)
+    cells = free_cells(g)
+    goals = rng.sample(cells, args.goals)
+    # zapytania przeplatane między celami – jak w kolejce zleceń
+    queries = [(rng.choice(cells), goals[i % args.goals]) for i in range(args.goals * args.queries)]
+    h = scaled(octile if g.diag else manhattan, scale=g.min_step_cost())
+    trees = GoalTreeCache(max_trees=args.max_trees)
+
+    lat_astar, lat_tree, first_tree = [], [], []
+    seen_goals: set = set()
+    mismatches = 0
+    for start, goal in queries:
+        g.start, g.goal = start, goal
+        t0 = time.perf_counter()
+        ra = astar(g, h)
+        lat_astar.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        rt = trees.solve(g)
+        dt = time.perf_counter() - t0
+        (lat_tree if goal in seen_goals else first_tree).append(dt)
+        seen_goals.add(goal)
+        if ra.found != rt.found or (ra.found and abs(ra.total_cost - rt.total_cost) > 1e-9):
+            mismatches += 1
+
+    sa = summarize(lat_astar)
+    st = summarize(lat_tree + first_tree)
+    sw = summarize(lat_tree)
+    print(f"Plansza {args.size}x{args.size}, diag={args.diag}, cele: {args.goals}, "
+          f"zapytania: {len(queries)}")
+    print(f"{'metoda':22s} {'średnio [ms]':>13s} {'p50 [ms]':>10s} {'p99 [ms]':>10s} {'łącznie [s]':>12s}")
+    for name, s in (("A* (każde od zera)", sa), ("drzewo celu", st), ("drzewo – bez 1. zapyt.", sw)):
+        print(f"{name:22s} {s['mean_ms']:13.3f} {s['p50_ms']:10.3f} {s['p99_ms']:10.3f} {s['total_s']:12.3f}")
+    print(f"Pierwsze zapytanie do celu (budowa): średnio {sum(first_tree) / len(first_tree) * 1000:.2f} ms")
+    print(f"Przyspieszenie łączne: {sa['total_s'] / st['total_s']:.1f}x, "
+          f"drzewa: {trees.stats}, pamięć ~{trees.nbytes() / 1e6:.1f} MB")
+    print(f"Niezgodne koszty: {mismatches}")
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    out = args.out_dir / "goal_tree_latency.csv"
+    with open(out, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=["method", "mean_ms", "p50_ms", "p99_ms", "total_s"])
+        w.writeheader()
+        for name, s in (("astar", sa), ("goal_tree", st), ("goal_tree_warm", sw)):
+            w.writerow({"method": name, **{k: round(v, 6) for k, v in s.items()}})
+    print(f"Wyniki: {out}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Pomiar czasu zimnego startu (import) modułów aplikacji na podstawie `python -X importtime`.
+
+Każdy moduł importowany jest w świeżym procesie (kilka powtórzeń, liczy się minimum).
+Dla modułów bezgłowych (algorytmy, runner, plots przed rysowaniem) sprawdzane jest też,
+czy nie ładują pygame/matplotlib/numpy – wtedy kod wyjścia 1.
+
+    python scripts/import_time.py [--repeat 5] [--csv import_time.csv]
+"""
+
+import argparse
+import csv
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# moduł -> czy ma być wolny od zależności GUI/wykresów
+TARGETS = {
+    "app.algorithms.astar": True,
+    "app.algorithms.dijkstra": True,
+    "app.benchmark.runner": True,
+    "app.benchmark.plots": True,
+    "app.benchmark.compare": True,
+    "app.gui.pygame_app": False,
+}
+HEAVY = ("pygame", "matplotlib", "numpy")
+
+
+def measure(module: str) -> tuple[float, dict[str, float]]:
+    """Zwraca (łączny czas importu modułu [ms], {pakiet najwyższego poziomu: ms}).
+
+    Czas pakietu to czas 'cumulative' jego modułu głównego (np. `matplotlib`),
+    niezależnie od tego, na jakiej głębokości drzewa importów został załadowany.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} nie powiódł się:\n{proc.stderr[-2000:]}")
+    total = 0.0
+    top: dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:   self [us] |  cumulative | imported package"
+        _, cum_us, name = line.split(":", 1)[1].split("|")
+        name = name.strip()
+        cum_ms = int(cum_us) / 1000.0
+        if "." not in name and name != "app":
+            top[name] = top.get(name, 0.0) + cum_ms
+        if name == module:
+            total = cum_ms
+    return total, top
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=5, help="liczba powtórzeń na moduł (domyślnie 5)")
+    ap.add_argument("--csv", type=Path, help="dopisz wyniki do pliku CSV (śledzenie w czasie)")
+    args = ap.parse_args()
+
+    rows = []
+    failed = False
+    print(f"{'moduł':28s} {'min [ms]':>9s} {'med [ms]':>9s}  ciężkie zależności / największe składniki")
+    print("-" * 96)
+    for module, headless in TARGETS.items():
+        runs = [measure(module) for _ in range(args.repeat)]
+        totals = sorted(t for t, _ in runs)
+        best_top = min(runs, key=lambda r: r[0])[1]
+        heavy = [m for m in HEAVY if m in best_top]
+        bad = headless and bool(heavy)
+        failed |= bad
+        biggest = sorted(best_top.items(), key=lambda kv: -kv[1])[:3]
+        info = ", ".join(f"{k} {v:.1f}" for k, v in biggest)
+        flag = f"  BŁĄD: ładuje {', '.join(heavy)}" if bad else ""
+        print(f"{module:28s} {totals[0]:9.1f} {totals[len(totals) // 2]:9.1f}  {info}{flag}")
+        rows.append({
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "module": module,
+            "min_ms": round(totals[0], 2),
+            "median_ms": round(totals[len(totals) // 2], 2),
+            "heavy_deps": " ".join(heavy),
+        })
+
+    if args.csv:
+        new = not args.csv.exists()
+        with open(args.csv, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            if new:
+                writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nWyniki dopisane do {args.csv}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
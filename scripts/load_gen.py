@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Generator obciążenia dla lokalnej usługi zapytań (app.service).
+
+Uruchamia N wątków klienckich, każdy wysyła zapytania /query jedno po drugim
+(zamknięta pętla), i raportuje przepustowość oraz percentyle opóźnienia po stronie klienta
+(p50/p90/p99), a na końcu metryki serwera z /metrics.
+
+    python -m app.service --map m=mapa.txt &
+    python scripts/load_gen.py --map-id m --map-file mapa.txt --clients 16 --duration 10
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.cli import ALGORITHMS, percentile, random_queries
+from app.utils.mapio import load_map
+
+
+def post(url: str, payload: dict) -> dict:
+    req = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req) as resp:
+        return json.loads(resp.read())
+
+
+def get(url: str) -> dict:
+    with urllib.request.urlopen(url) as resp:
+        return json.loads(resp.read())
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://127.0.0.1:8765")
+    ap.add_argument("--map-id", required=True, help="id mapy zarejestrowanej w usłudze")
+    ap.add_argument("--map-file", type=Path, required=True,
+                    help="ten sam plik mapy (do losowania zapytań między wolnymi polami)")
+    ap.add_argument("--register", action="store_true", help="najpierw zarejestruj mapę przez POST /maps")
+    ap.add_argument("--diag", action="store_true")
+    ap.add_argument("--algo", default="astar", choices=ALGORITHMS)
+    ap.add_argument("--clients", type=int, default=8, help="liczba równoległych klientów")
+    ap.add_argument("--duration", type=float, default=10.0, help="czas trwania testu [s]")
+    ap.add_argument("--queries", type=int, default=500, help="rozmiar puli losowych zapytań")
+    ap.add_argument("--seed", type=int, default=123)
+    ap.add_argument("--json", action="store_true", help="wypisz podsumowanie jako JSON")
+    args = ap.parse_args()
+
+    if args.register:
+        post(f"{args.url}/maps", {"id": args.map_id, "path": str(args.map_file), "diag": args.diag})
+    g = load_map(args.map_file, diag=args.diag)
+    pool = random_queries(g, args.queries, args.seed)
+
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + args.duration
+
+    def client(idx: int) -> None:
+        nonlocal errors
+        local: list[float] = []
+        bad = 0
+        i = idx
+        while time.perf_counter() < stop_at:
+            start, goal = pool[i % len(pool)]
+            i += args.clients
+            t0 = time.perf_counter()
+            try:
+                rec = post(f"{args.url}/query", {"map": args.map_id, "start": start,
+                                                 "goal": goal, "algo": args.algo})
+                bad += "error" in rec
+            except OSError:
+                bad += 1
+                continue
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+            errors += bad
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    wall = time.perf_counter() - t0
+
+    latencies.sort()
+    summary = {
+        "clients": args.clients,
+        "requests": len(latencies),
+        "errors": errors,
+        "wall_s": wall,
+        "rps": len(latencies) / wall if wall > 0 else float("inf"),
+        "latency_ms": {q: percentile(latencies, p) * 1000
+                       for q, p in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99))},
+        "server": get(f"{args.url}/metrics"),
+    }
+    if args.json:
+        print(json.dumps(summary))
+        return 0
+    lat = summary["latency_ms"]
+    print(f"Klienci: {args.clients}, zapytania: {len(latencies)} w {wall:.1f} s, błędy: {errors}")
+    print(f"Przepustowość: {summary['rps']:.1f} zapytań/s")
+    print(f"Opóźnienie klienta [ms]: p50 {lat['p50']:.2f}  p90 {lat['p90']:.2f}  p99 {lat['p99']:.2f}")
+    srv = summary["server"]
+    print(f"Serwer: paczek {srv['batches']}, średnia paczka {srv['mean_batch'] or 0:.1f}, "
+          f"kolejka {srv['queue_depth']}, w toku {srv['in_flight']}, "
+          f"p99 serwera {srv['latency_ms']['p99'] or 0:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Najbliższy z K celów: jeden przebieg wielocelowy vs K niezależnych wyszukiwań A*.
+
+Dla każdego K i każdej próby losowane są start i K celów. Porównywane są:
+  - K × A* (cel po celu, wybór minimum),
+  - Dijkstra wielocelowa (zatrzymanie na pierwszym ustalonym celu),
+  - A* wielocelowe z dokładnym min po celach (max_terms = K),
+  - A* wielocelowe z przybliżeniem prostokątami grup celów (max_terms = --max-terms).
+Raportowane są średni czas i liczba rozwinięć; koszty muszą być równe kosztowi K × A*.
+
+    python scripts/multigoal_bench.py --size 150 --k-values 1 4 16 64 256 --trials 10
+"""
+
+import argparse
+import csv
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.algorithms.astar import astar
+from app.algorithms.grid import Grid
+from app.algorithms.multigoal import astar_multi, dijkstra_multi
+from app.utils.heuristics import manhattan, octile, scaled
+from app.utils.mapio import free_cells
+
+OUT_DIR = Path(__file__).resolve().parent.parent / "multigoal"
+
+
+def independent(g: Grid, h, goals):
+    """K osobnych A*: (koszt najbliższego celu, łączne rozwinięcia)."""
+    best, expanded = float("inf"), 0
+    saved = g.goal
+    for t in goals:
+        g.goal = t
+        r = astar(g, h)
+        expanded += r.expanded_count
+        if r.found:
+            best = min(best, r.total_cost)
+    g.goal = saved
+    return best, expanded
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--size", type=int, default=150)
+    ap.add_argument("--wall-density", type=float, default=0.25)
+    ap.add_argument("--weight-density", type=float, default=0.10)
+    ap.add_argument("--diag", action="store_true")
+    ap.add_argument("--k-values", type=int, nargs="+", default=[1, 4, 16, 64, 256])
+    ap.add_argument("--max-terms", type=int, default=16, help="liczba grup celów w przybliżeniu")
+    ap.add_argument("--trials", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=123)
+    ap.add_argument("--out-dir", type=Path, default=OUT_DIR)
+    args = ap.parse_args()
+
+    g = Grid(args.size, args.size, diag=args.diag)
+    g.randomize_walls(args.wall_density, seed=args.seed)
+    g.randomize_weights(args.weight_density, seed=args.seed + 1)
+    h = scaled(octile if g.diag else manhattan, scale=g.min_step_cost())
+    cells = free_cells(g)
+    rng = random.Random(args.seed)
+
+    methods = {
+        "K x A*": lambda goals: independent(g, h, goals),
+        "Dijkstra multi": lambda goals: dijkstra_multi(g, goals),
+        "A* multi (min)": lambda goals: astar_multi(g, h, goals, max_terms=len(goals)),
+        f"A* multi (grupy {args.max_terms})": lambda goals: astar_multi(g, h, goals, max_terms=args.max_terms),
+    }
+    rows = []
+    mismatches = 0
+    print(f"{'K':>5s} {'metoda':24s} {'czas [ms]':>10s} {'rozwinięcia':>12s} {'przyspieszenie':>15s}")
+    for K in args.k_values:
+        times = {m: [] for m in methods}
+        expanded = {m: [] for m in methods}
+        for _ in range(args.trials):
+            start, *goals = rng.sample(cells, K + 1)
+            g.start, g.goal = start, goals[0]
+            ref_cost = None
+            for name, fn in methods.items():
+                out, dt = timed(lambda: fn(goals))
+                if name == "K x A*":
+                    ref_cost, exp = out
+                else:
+                    exp = out.expanded_count
+                    if out.total_cost != ref_cost and abs(out.total_cost - ref_cost) > 1e-9:
+                        mismatches += 1
+                times[name].append(dt)
+                expanded[name].append(exp)
+        base = statistics.mean(times["K x A*"])
+        for name in methods:
+            t = statistics.mean(times[name])
+            e = statistics.mean(expanded[name])
+            print(f"{K:5d} {name:24s} {t * 1000:10.2f} {e:12.0f} {base / t:14.1f}x")
+            rows.append({"k": K, "method": name, "mean_time_s": round(t, 6),
+                         "mean_expanded": round(e, 1), "speedup": round(base / t, 3)})
+    print(f"Niezgodne koszty: {mismatches}")
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    out = args.out_dir / "multigoal.csv"
+    with open(out, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]))
+        w.writeheader()
+        w.writerows(rows)
+    print(f"Wyniki: {out}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Plansza kafelkowa poza pamięcią (TiledGrid): pamięć rezydentna i czas zapytań.
+
+Generuje (raz) syntetyczną mapę --size x --size w pliku .tiles – kafelki losowane
+niezależnie, więc generacja nie wymaga całej mapy w RAM – a następnie dla każdego limitu
+kafelków w LRU (--max-tiles) wykonuje te same zapytania A* o ograniczonym zasięgu
+(start i cel w odległości do --radius pól). Raportowane są czas zapytania (średnia, p50,
+p99), liczba faultów kafelków na zapytanie oraz RSS procesu (psutil).
+
+Mapa 100k x 100k zajmuje ~10 GB na dysku (1 B na pole); domyślne 20k x 20k – 400 MB.
+
+    python scripts/tiled_bench.py --size 20000 --tile 256 --max-tiles 16 64 256 1024
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+from pathlib import Path
+
+import psutil
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.algorithms.astar import astar
+from app.algorithms.tiled import TiledGrid, create_tiled, search, WALL_BYTE
+from app.cli import percentile
+from app.utils.heuristics import manhattan, octile, scaled
+
+OUT_DIR = Path(__file__).resolve().parent.parent / "tiled"
+
+
+def synthetic_fill(wall_density: float, weight_density: float, seed: int):
+    """Generator kafelków: niezależne ziarno na kafelek (deterministyczne, bez całej mapy w RAM)."""
+    import numpy as np
+
+    def fill(tx: int, ty: int, t: int) -> bytes:
+        r = np.random.default_rng((seed, tx, ty)).random((t, t))
+        cells = np.zeros((t, t), dtype=np.uint8)
+        cells[r < wall_density + weight_density] = 5
+        cells[r < wall_density] = WALL_BYTE
+        return cells.tobytes()
+    return fill
+
+
+def make_queries(tg: TiledGrid, n: int, radius: int, seed: int):
+    rng = random.Random(seed)
+    out = []
+    while len(out) < n:
+        sx, sy = rng.randrange(tg.cols), rng.randrange(tg.rows)
+        gx = min(tg.cols - 1, max(0, sx + rng.randint(-radius, radius)))
+        gy = min(tg.rows - 1, max(0, sy + rng.randint(-radius, radius)))
+        if (sx, sy) != (gx, gy) and tg.cell(sx, sy) != WALL_BYTE and tg.cell(gx, gy) != WALL_BYTE:
+            out.append(((sx, sy), (gx, gy)))
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--size", type=int, default=20000, help="bok planszy (pola)")
+    ap.add_argument("--tile", type=int, default=256, help="bok kafelka (pola)")
+    ap.add_argument("--wall-density", type=float, default=0.25)
+    ap.add_argument("--weight-density", type=float, default=0.10)
+    ap.add_argument("--diag", action="store_true")
+    ap.add_argument("--max-tiles", type=int, nargs="+", default=[16, 64, 256, 1024],
+                    help="limity kafelków rezydentnych (LRU) do porównania")
+    ap.add_argument("--queries", type=int, default=50)
+    ap.add_argument("--radius", type=int, default=300, help="maks. odległość start–cel w każdej osi")
+    ap.add_argument("--seed", type=int, default=123)
+    ap.add_argument("--map-file", type=Path, help="plik .tiles (domyślnie w --out-dir)")
+    ap.add_argument("--regen", action="store_true", help="wygeneruj mapę od nowa, nawet jeśli istnieje")
+    ap.add_argument("--out-dir", type=Path, default=OUT_DIR)
+    args = ap.parse_args()
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    map_file = args.map_file or args.out_dir / (
+        f"synthetic_{args.size}_t{args.tile}_w{args.wall_density}_m{args.weight_density}_s{args.seed}.tiles")
+    proc = psutil.Process()
+    if args.regen or not map_file.exists():
+        t0 = time.perf_counter()
+        create_tiled(map_file, args.size, args.size, args.tile, args.diag,
+                     synthetic_fill(args.wall_density, args.weight_density, args.seed))
+        print(f"Wygenerowano {map_file} ({map_file.stat().st_size / 1e6:.0f} MB) "
+              f"w {time.perf_counter() - t0:.1f} s")
+
+    with TiledGrid(map_file, max_tiles=64, diag=args.diag) as tg:
+        queries = make_queries(tg, args.queries, args.radius, args.seed)
+    h = scaled(octile if args.diag else manhattan, scale=1.0)
+    rss_base = proc.memory_info().rss
+
+    rows = []
+    print(f"Plansza {args.size}x{args.size}, kafelek {args.tile}x{args.tile}, "
+          f"zapytania: {len(queries)} (zasięg {args.radius}), RSS bazowy {rss_base / 1e6:.0f} MB")
+    print(f"{'max_tiles':>9s} {'LRU [MB]':>9s} {'RSS +[MB]':>10s} {'średnio [ms]':>13s} {'p50 [ms]':>9s} "
+          f"{'p99 [ms]':>9s} {'faulty/zapyt.':>14s} {'rozwinięcia':>12s}")
+    for max_tiles in args.max_tiles:
+        with TiledGrid(map_file, max_tiles=max_tiles, diag=args.diag) as tg:
+            lat, faults, expanded, found = [], 0, 0, 0
+            rss_peak = 0
+            for start, goal in queries:
+                tg.start, tg.goal = start, goal
+                t0 = time.perf_counter()
+                res, st = search(tg, astar, h)
+                lat.append(time.perf_counter() - t0)
+                faults += st.faults
+                expanded += res.expanded_count
+                found += res.found
+                rss_peak = max(rss_peak, proc.memory_info().rss)
+            lat.sort()
+            row = {
+                "max_tiles": max_tiles,
+                "lru_mb": round(tg.stats.resident_bytes / 1e6, 2),
+                "rss_delta_mb": round((rss_peak - rss_base) / 1e6, 2),
+                "mean_ms": round(sum(lat) / len(lat) * 1000, 3),
+                "p50_ms": round(percentile(lat, 0.50) * 1000, 3),
+                "p99_ms": round(percentile(lat, 0.99) * 1000, 3),
+                "faults_per_query": round(faults / len(queries), 2),
+                "mean_expanded": round(expanded / len(queries), 1),
+                "found": found,
+            }
+        rows.append(row)
+        print(f"{max_tiles:9d} {row['lru_mb']:9.1f} {row['rss_delta_mb']:10.1f} {row['mean_ms']:13.2f} "
+              f"{row['p50_ms']:9.2f} {row['p99_ms']:9.2f} {row['faults_per_query']:14.1f} "
+              f"{row['mean_expanded']:12.0f}")
+
+    out = args.out_dir / "tiled_bench.csv"
+    with open(out, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]))
+        w.writeheader()
+        w.writerows(rows)
+    print(f"Wyniki: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())